@@ -1,7 +1,9 @@
 import json
+from asgiref.sync import sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from .models import Articles
+from .services.progress_log import TaskProgressLog, task_group
 import logging
 
 logger = logging.getLogger(__name__)
@@ -133,4 +135,58 @@ class NewsConsumer(AsyncWebsocketConsumer):
                 "sentiment": article.sentiment
             }
             for article in queryset
-        ]
\ No newline at end of file
+        ]
+
+class TaskProgressConsumer(AsyncWebsocketConsumer):
+    """
+    Pushes the progress of a search or ingestion task: batches of stored articles and status changes.
+    On connect the client first receives everything already in the task's progress log (from ?offset=N,
+    default 0), then live events. Every batch carries the offset it starts at, so clients can skip articles
+    they already have. The poll-task-articles endpoint remains the fallback.
+    """
+
+    async def connect(self):
+        self.task_id = self.scope['url_route']['kwargs']['task_id']
+        self.group_name = task_group(self.task_id)
+
+        query_string = self.scope.get('query_string', b'').decode()
+        query_params = dict(param.split('=', 1) for param in query_string.split('&') if '=' in param)
+        try:
+            offset = max(int(query_params.get('offset', 0)), 0)
+        except ValueError:
+            offset = 0
+
+        # Subscribe before reading the log, so no batch falls between the catch-up and the live events
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        progress = await sync_to_async(TaskProgressLog(self.task_id).read)(offset)
+        if progress is None:
+            return
+        if progress['articles']:
+            await self.send(text_data=json.dumps({
+                'type': 'task_progress',
+                'articles': progress['articles'],
+                'offset': offset,
+                'stored': progress['stored'],
+            }))
+        if progress['status'] != 'pending':
+            await self.send(text_data=json.dumps({'type': 'task_status', 'status': progress['status']}))
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    # Receive progress events from the task group
+    async def task_progress(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'task_progress',
+            'articles': event['articles'],
+            'offset': event['offset'],
+            'stored': event['stored'],
+        }))
+
+    async def task_status(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'task_status',
+            'status': event['status'],
+        }))
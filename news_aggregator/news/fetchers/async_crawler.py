@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+import feedparser
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from news.services.extraction_service import is_permanent_failure
+from news.utils.url_canonicalizer import downloaded_canonical_url
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0'
+MAX_CONCURRENCY = getattr(settings, 'FEED_CRAWL_CONCURRENCY', 64)
+MAX_PER_HOST = getattr(settings, 'FEED_CRAWL_PER_HOST', 4)
+FEED_TIMEOUT = getattr(settings, 'FEED_CRAWL_FEED_TIMEOUT', 15)
+PAGE_TIMEOUT = getattr(settings, 'FEED_CRAWL_PAGE_TIMEOUT', 10)
+CONNECT_TIMEOUT = 5
+MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+
+class AsyncFeedCrawler:
+    """
+    Crawls many feeds concurrently with aiohttp.
+    Feed documents and article pages are downloaded under a global concurrency limit and a per-host limit,
+    so a few thousand feeds finish in minutes without hammering any single site. Downloaded bytes are parsed
+    in worker threads (feedparser and BeautifulSoup are CPU bound) and stored through the FeedParser's
+    synchronous ORM methods.
+    """
+
+    def __init__(self, feed_parser, max_concurrency=MAX_CONCURRENCY, max_per_host=MAX_PER_HOST,
+                 feed_timeout=FEED_TIMEOUT, page_timeout=PAGE_TIMEOUT):
+        self.feed_parser = feed_parser
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self.feed_timeout = aiohttp.ClientTimeout(total=feed_timeout, connect=CONNECT_TIMEOUT)
+        self.page_timeout = aiohttp.ClientTimeout(total=page_timeout, connect=CONNECT_TIMEOUT)
+        self._global_limit = None
+        self._host_limits = {}
+
+    def run(self, feeds):
+        """Blocking entry point. Returns the ids of all newly stored articles."""
+        return asyncio.run(self.crawl(feeds))
+
+    async def crawl(self, feeds):
+        """Crawl all feeds concurrently. Returns the ids of all newly stored articles."""
+        self._global_limit = asyncio.Semaphore(self.max_concurrency)
+        self._host_limits = {}
+        started = time.perf_counter()
+
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.max_per_host, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector, headers={'User-Agent': USER_AGENT}) as session:
+            results = await asyncio.gather(
+                *(self.crawl_feed(session, feed) for feed in feeds),
+                return_exceptions=True,
+            )
+
+        new_ids = []
+        for feed, result in zip(feeds, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to process feed {feed.url}: {result}")
+            else:
+                new_ids.extend(result)
+
+        logger.info(f"Crawled {len(feeds)} feeds in {time.perf_counter() - started:.1f}s, stored {len(new_ids)} new articles")
+        return new_ids
+
+    async def crawl_feed(self, session, feed):
+        """Download and parse one feed, then fetch and store its new entries"""
+        response = await self.request(session, feed.url, self.feed_timeout, self.feed_parser.conditional_headers(feed))
+        if response is None:
+            return []
+
+        status, headers, body, _ = response
+        changed = await sync_to_async(self.feed_parser.feed_changed)(feed, status, headers, body)
+        if not changed:
+            logger.info(f"Skipping {feed.url} - not modified since last fetch")
+            return []
+
+        parsed_feed = await asyncio.to_thread(feedparser.parse, body)
+        if not self.feed_parser.has_feed_updated(feed, parsed_feed):
+            logger.info(f"Skipping {feed.url} - no updates since last fetch")
+            await sync_to_async(self.feed_parser.update_feed_metadata)(feed, parsed_feed)
+            return []
+
+        entries = await sync_to_async(self.feed_parser.unseen_entries)(feed, parsed_feed.entries)
+        pages = await asyncio.gather(*(self.fetch(session, entry.link, self.page_timeout) for entry in entries))
+
+        new_ids = []
+        fetched = []
+        for entry, (status, page, final_url) in zip(entries, pages):
+            if page is None:
+                # Pages that are gone (404, 410, ...) are marked as seen so they are not requested on every poll;
+                # transient failures are not, so they are retried on the next poll
+                if status is not None and is_permanent_failure(status):
+                    fetched.append(entry)
+                continue
+            fetched.append(entry)
+            result = await asyncio.to_thread(self.feed_parser.extractor.extract_from_html, page, entry.get('title', ''))
+            # The download already followed any redirect wrapper, so its final URL gives the canonical URL
+            article = await sync_to_async(self.store_entry)(entry, feed, result, final_url)
+            if article:
+                new_ids.append(article.id)
+
+        await sync_to_async(self.feed_parser.mark_entries_seen)(feed, fetched)
+        await sync_to_async(self.feed_parser.update_feed_metadata)(feed, parsed_feed, pending=len(fetched) < len(entries))
+        return new_ids
+
+    def store_entry(self, entry, feed, result, final_url):
+        """Store an extracted entry under the canonical URL of the page its download ended at"""
+        return self.feed_parser.store_entry(entry, feed, result, downloaded_canonical_url(entry.link, final_url))
+
+    async def fetch(self, session, url, timeout):
+        """
+        Download a URL.
+        :return: Tuple of (HTTP status or None on network errors, body bytes of a 200 response or None,
+                 URL after redirects or None).
+        """
+        response = await self.request(session, url, timeout)
+        if response is None:
+            return None, None, None
+        status, _, body, final_url = response
+        if status != 200:
+            logger.warning(f"Fetching {url} returned HTTP {status}")
+            return status, None, final_url
+        return status, body, final_url
+
+    async def request(self, session, url, timeout, headers=None):
+        """
+        GET a URL under the global and per-host limits.
+        :return: Tuple of (status, headers, body bytes, URL after redirects), or None on network errors and
+                 oversized responses.
+        """
+        async with self._global_limit, self._host_limit(url):
+            try:
+                async with session.get(url, headers=headers, timeout=timeout, allow_redirects=True) as response:
+                    if response.status != 200:
+                        return response.status, response.headers, b"", str(response.url)
+                    if (response.content_length or 0) > MAX_RESPONSE_BYTES:
+                        logger.warning(f"Skipping {url}: response larger than {MAX_RESPONSE_BYTES} bytes")
+                        return None
+                    # Also enforced while reading, since chunked responses carry no Content-Length
+                    body = await response.content.read(MAX_RESPONSE_BYTES + 1)
+                    while len(body) <= MAX_RESPONSE_BYTES and not response.content.at_eof():
+                        chunk = await response.content.read(MAX_RESPONSE_BYTES + 1 - len(body))
+                        if not chunk:
+                            break
+                        body += chunk
+                    if len(body) > MAX_RESPONSE_BYTES:
+                        logger.warning(f"Skipping {url}: response larger than {MAX_RESPONSE_BYTES} bytes")
+                        return None
+                    return response.status, response.headers, body, str(response.url)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Error fetching {url}: {e!r}")
+                return None
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_limits[host]
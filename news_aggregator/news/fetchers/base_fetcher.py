@@ -1,14 +1,64 @@
+import json
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import quote
 import logging
 
+from .rate_limiter import ProviderRateLimiter, RateLimitExceeded
+
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# (connect, read) timeout in seconds for provider API calls
+REQUEST_TIMEOUT = (3.05, 10)
+MAX_RESPONSE_BYTES = 10 * 1024 * 1024
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+POOL_SIZE = 10
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(provider):
+    """
+    Shared keep-alive session for a provider, with retries and exponential backoff on connection errors
+    and 5xx responses. Sessions are process-wide so every fetcher instance reuses the same connections.
+    """
+    with _sessions_lock:
+        session = _sessions.get(provider)
+        if session is None:
+            retry = Retry(
+                total=MAX_RETRIES,
+                backoff_factor=RETRY_BACKOFF,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset(['GET']),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(max_retries=retry, pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[provider] = session
+        return session
+
+def _redact(params):
+    return {key: ('***' if 'key' in key.lower() else value) for key, value in (params or {}).items()}
+
 class BaseFetcher:
-    def __init__(self):
+    provider = 'default'
+
+    def __init__(self, timeout=REQUEST_TIMEOUT, max_response_bytes=MAX_RESPONSE_BYTES):
         self.logger = logger
-        
+        self.timeout = timeout
+        self.max_response_bytes = max_response_bytes
+        self.session = get_session(self.provider)
+        self.rate_limiter = ProviderRateLimiter(self.provider)
+
     def _validate_and_format_query(self, query):
         """Validate the search query but don't format it - leave that to specific API fetchers."""
         if not query or not isinstance(query, str):
@@ -18,13 +68,71 @@ class BaseFetcher:
         return query.strip()  # Just return the trimmed query without URL encoding
 
     def _send_request(self, url, params, headers=None):
-        """Send an HTTP GET request and return the response."""
-        logger.debug(f"Sending request to {url} with params: {params} and headers: {headers}")
-        response = requests.get(url, params=params, headers=headers)
-        logger.debug(f"Received response: {response.status_code}, {response.text}")
+        """
+        Send an HTTP GET request through the provider session and return the decoded JSON body.
+        :raises RateLimitExceeded: If the provider's shared request budget stays exhausted for the rate limiter's max wait.
+        """
+        if not self.rate_limiter.acquire():
+            raise RateLimitExceeded(f"{self.provider} request budget exhausted")
+
+        logger.debug(f"Sending request to {url} with params: {_redact(params)}")
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout, stream=True)
+        try:
+            body = self._read_body(response)
+        finally:
+            response.close()
+        logger.debug(f"Received response: {response.status_code}, {len(body)} bytes")
+
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            data = None
 
         if response.status_code != 200:
-            logger.error(f"Error {response.status_code}: {response.json()}")
-            raise Exception(f"Error {response.status_code}: {response.json()}")
+            detail = data if data is not None else body[:200]
+            logger.error(f"Error {response.status_code}: {detail}")
+            raise Exception(f"Error {response.status_code}: {detail}")
+
+        return data
+
+    def _read_body(self, response):
+        """Read the response body, refusing anything larger than max_response_bytes"""
+        content_length = response.headers.get('Content-Length')
+        if content_length and int(content_length) > self.max_response_bytes:
+            raise Exception(f"Response of {content_length} bytes exceeds the {self.max_response_bytes} byte limit")
+
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=65536):
+            size += len(chunk)
+            if size > self.max_response_bytes:
+                raise Exception(f"Response exceeds the {self.max_response_bytes} byte limit")
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def _iter_pages(self, url, params, page_size, max_pages, page_param='page', total_key='totalResults', items_key='articles'):
+        """
+        Yield articles page by page. The first page tells how many results exist; the remaining pages
+        (up to max_pages) are then requested concurrently and yielded in the order they arrive.
+        A failing page is logged and skipped, so callers still get the pages that succeeded.
+        """
+        first = self._send_request(url, {**params, page_param: 1}) or {}
+        yield from first.get(items_key, [])
+
+        total = first.get(total_key) or 0
+        pages = min(max_pages, math.ceil(total / page_size)) if page_size else 1
+        if pages <= 1:
+            return
 
-        return response.json()
\ No newline at end of file
+        with ThreadPoolExecutor(max_workers=pages - 1) as executor:
+            futures = {
+                executor.submit(self._send_request, url, {**params, page_param: page}): page
+                for page in range(2, pages + 1)
+            }
+            for future in as_completed(futures):
+                try:
+                    data = future.result() or {}
+                except Exception as e:
+                    logger.warning(f"Failed to fetch page {futures[future]} from {url}: {e}")
+                    continue
+                yield from data.get(items_key, [])
@@ -1,29 +1,42 @@
+import hashlib
 import logging
 import os
 from datetime import datetime
 
 import feedparser
-from sentence_transformers import SentenceTransformer
+import requests
 
 import django
-from django.db import transaction
 from django.utils.timezone import get_default_timezone, is_naive, make_aware
 
-from news.models import Articles, Feed
-from news.services.nlp_service import NLPPredictionService
+from news.fetchers.async_crawler import AsyncFeedCrawler
+from news.models import Articles, Feed, FeedEntry
+from news.services.extraction_service import ContentExtractionService
+from news.tasks import enqueue_enrichment
 from news.utils.content_extractor import ContentExtractor
+from news.utils.url_canonicalizer import canonical_url, canonical_urls
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'news_aggregator.settings')
 django.setup()
 
 logger = logging.getLogger(__name__)
 DEFAULT_IMAGE_URL = 'https://raw.githubusercontent.com/mMelnic/news-fake-detection/refs/heads/users/news_aggregator/newspaper_beige.jpg'
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+FEED_TIMEOUT = 15
+
+class FeedFetchError(Exception):
+    pass
+
+def feed_body_hash(body):
+    return hashlib.sha256(body).hexdigest()
+
+def entry_guid(entry):
+    """Stable identifier of a feed entry: its guid/id, falling back to the link"""
+    return entry.get('id') or entry.get('link')
 
 class FeedParser:
-    def __init__(self):
+    def __init__(self, extraction_service=None):
         self.extractor = ContentExtractor()
-        self.nlp_service = NLPPredictionService()
+        self.extraction = extraction_service or ContentExtractionService(extractor=self.extractor)
 
     def fetch_new_articles(self):
         """Main method to fetch new articles from all active feeds"""
@@ -35,22 +48,103 @@ class FeedParser:
             except Exception as e:
                 logger.error(f"Failed to process feed {feed.url}: {e}")
 
+    def crawl_active_feeds(self, **crawler_options):
+        """Fetch all active feeds and their article pages concurrently (see AsyncFeedCrawler)"""
+        active_feeds = list(Feed.objects.filter(is_active=True).select_related('source'))
+        new_ids = AsyncFeedCrawler(self, **crawler_options).run(active_feeds)
+
+        # Embeddings and predictions are computed by the enrich stage, outside of any transaction
+        enqueue_enrichment(new_ids)
+        return new_ids
+
     def process_feed(self, feed):
-        """Process a single RSS feed"""
-        parsed_feed = feedparser.parse(feed.url)
+        """
+        Process a single RSS feed.
+        :return: Number of new entries found.
+        :raises FeedFetchError: If the feed URL returned an error status.
+        """
+        response = requests.get(
+            feed.url,
+            headers={'User-Agent': 'Mozilla/5.0', **self.conditional_headers(feed)},
+            timeout=FEED_TIMEOUT,
+        )
+        if not self.feed_changed(feed, response.status_code, response.headers, response.content):
+            logger.info(f"Skipping {feed.url} - not modified since last fetch")
+            return 0
+
+        parsed_feed = feedparser.parse(response.content)
 
         if not self.has_feed_updated(feed, parsed_feed):
             logger.info(f"Skipping {feed.url} - no updates since last fetch")
-            return
-
-        for entry in parsed_feed.entries:
-            self.process_article_entry(entry, feed)
-
-        # Update feed metadata
+            self.update_feed_metadata(feed, parsed_feed)
+            return 0
+
+        entries = self.unseen_entries(feed, parsed_feed.entries)
+        results = self.extraction.extract_many((entry.link, entry.get('title', '')) for entry in entries)
+        links = [entry.link for entry in entries if results.get(entry.link)]
+        keys = dict(zip(links, canonical_urls(links)))
+        new_ids = []
+        done = []
+        for entry in entries:
+            result = results.get(entry.link)
+            article = self.store_entry(entry, feed, result, keys.get(entry.link))
+            if article:
+                new_ids.append(article.id)
+            # Failed downloads are not marked as seen, so a transient failure is retried on the next poll
+            if result is not None or self.extraction.rejected(entry.link):
+                done.append(entry)
+        self.mark_entries_seen(feed, done)
+
+        # Embeddings and predictions are computed by the enrich stage, outside of any transaction
+        enqueue_enrichment(new_ids)
+
+        self.update_feed_metadata(feed, parsed_feed, pending=len(done) < len(entries))
+        return len(entries)
+
+    def conditional_headers(self, feed):
+        """If-None-Match / If-Modified-Since headers from the validators of the previous fetch"""
+        headers = {}
+        if feed.etag:
+            headers['If-None-Match'] = feed.etag
+        if feed.last_modified:
+            headers['If-Modified-Since'] = feed.last_modified
+        return headers
+
+    def feed_changed(self, feed, status, headers, body):
+        """
+        Decide from the HTTP response whether the feed needs parsing. A 304 or a body identical to the
+        previous one (for servers without validators) means there is nothing new.
+        New validators and the body hash are set on the feed and saved with the feed metadata.
+        :raises FeedFetchError: On any other non-200 status.
+        """
+        if status == 304:
+            return False
+        if status != 200:
+            raise FeedFetchError(f"Fetching feed {feed.url} returned HTTP {status}")
+
+        body_hash = feed_body_hash(body)
+        unchanged = body_hash == feed.content_hash
+        feed.etag = headers.get('ETag') or feed.etag
+        feed.last_modified = headers.get('Last-Modified') or feed.last_modified
+        feed.content_hash = body_hash
+        if unchanged:
+            feed.save(update_fields=['etag', 'last_modified', 'content_hash', 'updated_at'])
+        return not unchanged
+
+    def update_feed_metadata(self, feed, parsed_feed, pending=False):
+        """
+        Save the fetch time, the build date and the validators set by feed_changed.
+        :param pending: Some entries failed transiently and were not marked as seen. The validators, body hash
+                        and build date are then left as they were, so the next poll does not get a 304 or an
+                        unchanged body and retries those entries.
+        """
         feed.last_fetched = datetime.now()
-        if hasattr(parsed_feed.feed, 'updated_parsed'):
+        if pending:
+            feed.save(update_fields=['last_fetched', 'updated_at'])
+            return
+        if getattr(parsed_feed.feed, 'updated_parsed', None):
             feed.last_built = datetime(*parsed_feed.feed.updated_parsed[:6])
-        if is_naive(feed.last_built):
+        if feed.last_built and is_naive(feed.last_built):
             feed.last_built = make_aware(feed.last_built, get_default_timezone())
         feed.save()
 
@@ -59,35 +153,60 @@ class FeedParser:
         if not feed.last_built:
             return True
 
-        # if hasattr(parsed_feed.feed, 'updated_parsed'):
-        #     feed_updated = datetime(*parsed_feed.feed.updated_parsed[:6])
+        if getattr(parsed_feed.feed, 'updated_parsed', None):
+            feed_updated = datetime(*parsed_feed.feed.updated_parsed[:6])
 
-        #     if is_naive(feed_updated):
-        #         feed_updated = make_aware(feed_updated)
+            if is_naive(feed_updated):
+                feed_updated = make_aware(feed_updated, get_default_timezone())
 
-        #     return feed_updated > feed.last_built
+            return feed_updated > feed.last_built
 
         return True
 
     def process_article_entry(self, entry, feed):
-        """Process and store a new article with NLP features"""
-        if Articles.objects.filter(url=entry.link).exists():
-            return
+        """Store a new raw article. Returns it, or None if it was skipped."""
+        result = self.extraction.extract(entry.link, entry.title)
+        return self.store_entry(entry, feed, result, canonical_urls([entry.link])[0])
+
+    def unseen_entries(self, feed, entries):
+        """
+        Entries of a feed that were neither seen in a previous poll nor stored from another feed,
+        using one query per table for the whole batch. Links are not requested here: wrappers that are
+        neither cached nor decodable are compared as they are and resolved when the page is stored.
+        """
+        entries = [entry for entry in entries if entry.get('link')]
+        guids = [entry_guid(entry) for entry in entries]
+        seen = set(FeedEntry.objects.filter(feed=feed, guid__in=guids).values_list('guid', flat=True))
+        entries = [entry for entry, guid in zip(entries, guids) if guid not in seen]
+
+        urls = canonical_urls([entry.link for entry in entries], resolve=False)
+        stored = set(Articles.objects.filter(canonical_url__in=urls).values_list('canonical_url', flat=True))
+        return [entry for entry, url in zip(entries, urls) if url not in stored]
+
+    def mark_entries_seen(self, feed, entries):
+        """Record entries as processed so later polls skip them, whether or not they produced an article"""
+        FeedEntry.objects.bulk_create(
+            [FeedEntry(feed=feed, guid=entry_guid(entry)) for entry in entries],
+            ignore_conflicts=True,
+            batch_size=500,
+        )
 
-        result = self.extractor.get_article_content(entry.link, entry.title)
-        if not result or result["word_count"] < 100:
-            return
+    def store_entry(self, entry, feed, content_result, canonical=None):
+        """
+        Store an entry whose page was already extracted. Returns the article, or None if it was skipped.
+        :param canonical: Canonical URL of the entry, with redirect wrappers already resolved; defaults to
+                          the link canonicalized without requests.
+        """
+        if not content_result or content_result["word_count"] < 100:
+            return None
 
         try:
-            with transaction.atomic():
-                article = self.create_base_article(entry, feed, result)
-                
-                # Process NLP features in same transaction
-                self.process_article_nlp(article)
+            return self.create_base_article(entry, feed, content_result, canonical)
         except Exception as e:
             logger.error(f"Error processing article '{entry.title}' from {feed.url}: {e}")
+            return None
 
-    def create_base_article(self, entry, feed, content_result):
+    def create_base_article(self, entry, feed, content_result, canonical=None):
         """Create the article with basic fields"""
         image_url = self.extractor.get_article_image(entry) or DEFAULT_IMAGE_URL
 
@@ -117,6 +236,7 @@ class FeedParser:
             author=entry.get('author', ''),
             content=content_result["truncated_content"],
             url=entry.link,
+            canonical_url=canonical or canonical_url(entry.link, resolve=False),
             image_url=image_url,
             source=feed.source,
             published_date=pub_date,
@@ -126,37 +246,6 @@ class FeedParser:
             feed=feed,
         )
 
-    def process_article_nlp(self, article):
-        """Compute and store NLP features for an article"""
-        try:
-            text = f"{article.title} {article.content}"
-            
-            # Generate embedding
-            if text.strip():
-                article.embedding = embedding_model.encode(text).tolist()
-            
-            # Get NLP predictions
-            predictions = self.nlp_service.predict_batch([text])
-            if predictions and isinstance(predictions[0], dict):
-                pred = predictions[0]
-                article.is_fake = pred.get("is_fake")
-                article.fake_score = 1.0 if pred.get("is_fake") else 0.0
-                article.sentiment = pred.get("sentiment")
-            
-            # Save all updates at once
-            article.save(update_fields=[
-                "embedding", 
-                "is_fake", 
-                "fake_score", 
-                "sentiment"
-            ])
-            
-            logger.info(f"Processed NLP for article {article.id}")
-            
-        except Exception as e:
-            logger.error(f"Error processing NLP for article {article.id}: {e}")
-            raise
-
 if __name__ == "__main__":
     parser = FeedParser()
-    parser.fetch_new_articles()
\ No newline at end of file
+    parser.crawl_active_feeds()
\ No newline at end of file
@@ -1,5 +1,6 @@
 from .base_fetcher import BaseFetcher
 from .fetcher_interface import FetcherInterface
+from .provider_cache import ProviderCache
 import os
 from dotenv import load_dotenv
 
@@ -9,12 +10,14 @@ GNEWS_API_URL = "https://gnews.io/api/v4/search"
 GNEWS_API_KEY = os.getenv('GNEWS_API_KEY')
 
 class GNewsApiFetcher(BaseFetcher, FetcherInterface):
+    provider = 'gnews'
     VALID_LANGUAGES = {'ar', 'de', 'el', 'en', 'es', 'fr', 'he', 'hi', 'it', 'ja', 'ml', 'mr', 'nl', 'no', 'pt', 'ro', 'ru', 'sv', 'ta', 'te', 'uk', 'zh'}
     VALID_COUNTRIES = {'au', 'br', 'ca', 'cn', 'eg', 'fr', 'de', 'gr', 'hk', 'in', 'ie', 'il', 'it', 'jp', 'nl', 'no', 'pk', 'pe', 'ph', 'pt', 'ro', 'ru', 'sg', 'es', 'se', 'ch', 'tw', 'ua', 'gb', 'us'}
 
     def __init__(self):
         super().__init__()  # Call parent constructor to initialize logger
         self.api_key = GNEWS_API_KEY
+        self.cache = ProviderCache('gnews')
 
     def fetch_articles(self, query, language=None, country=None):
         """
@@ -31,7 +34,9 @@ class GNewsApiFetcher(BaseFetcher, FetcherInterface):
         query = self._validate_and_format_query(query)
         language = self._validate_language(language)
         country = self._validate_country(country)
-        
+        return self.cache.get_or_fetch(query, language, country, lambda: self._fetch_uncached(query, language, country))
+
+    def _fetch_uncached(self, query, language, country):
         # GNewsAPI also accepts the query syntax directly
         params = {
             "apikey": self.api_key,
@@ -2,12 +2,22 @@ import feedparser
 import html
 import re
 import logging
+import requests
+from .base_fetcher import get_session
+from .provider_cache import ProviderCache
+from .rate_limiter import ProviderRateLimiter
 
 logger = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT = (3.05, 10)
+
 class RssFeedFetcher:
-    def __init__(self):
+    def __init__(self, timeout=REQUEST_TIMEOUT):
         self.base_url = "https://news.google.com/rss"
+        self.timeout = timeout
+        self.cache = ProviderCache('rss')
+        self.session = get_session('rss')
+        self.rate_limiter = ProviderRateLimiter('rss')
 
     def fetch_feed(self, query, language="en", country="US"):
         """
@@ -17,11 +27,26 @@ class RssFeedFetcher:
         :param country: The region code for the feed (default is 'US' for the United States).
         :return: A list of parsed items, each containing relevant information (title, link, etc.).
         """
+        return self.cache.get_or_fetch(query, language, country, lambda: self._fetch_uncached(query, language, country))
+
+    def _fetch_uncached(self, query, language, country):
         rss_url = f"{self.base_url}/search?q={query}&hl={language}&gl={country}&ceid={country}:{language}"
 
         logger.info(f"Fetching RSS feed from: {rss_url}")
 
-        feed = feedparser.parse(rss_url)
+        if not self.rate_limiter.acquire():
+            logger.warning("Google News RSS request budget exhausted")
+            return []
+
+        # Download with a timeout; feedparser.parse(url) would block without one
+        try:
+            response = self.session.get(rss_url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning(f"Error fetching RSS feed: {e}")
+            return []
+
+        feed = feedparser.parse(response.content)
 
         if feed.bozo:
             logger.warning("Issue with fetching or parsing the feed.")
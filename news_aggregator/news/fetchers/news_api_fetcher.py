@@ -2,18 +2,25 @@ from datetime import datetime, timedelta
 import os
 from .base_fetcher import BaseFetcher
 from .fetcher_interface import FetcherInterface
+from .provider_cache import ProviderCache
 
 NEWS_API_URL = "https://newsapi.org/v2/everything"
 NEWS_API_KEY = os.getenv('NEWS_API_KEY')
+# Each page costs a request against the daily quota; deeper pagination is opt-in
+DEFAULT_PAGES = 1
 MAX_PAGES = 5
+PAGE_SIZE = 100
 VALID_LANGUAGES = {'ar', 'de', 'en', 'es', 'fr', 'he', 'it', 'nl', 'no', 'pt', 'ru', 'sv', 'ud', 'zh'}
 
 class NewsApiFetcher(BaseFetcher, FetcherInterface):
+    provider = 'newsapi'
+
     def __init__(self):
         super().__init__()  # Call parent constructor to initialize logger
         self.api_key = NEWS_API_KEY
+        self.cache = ProviderCache('newsapi')
 
-    def fetch_articles(self, query, language=None, country=None):
+    def fetch_articles(self, query, language=None, country=None, max_pages=DEFAULT_PAGES):
         """
         Fetch articles from NewsAPI with proper query formatting.
         
@@ -22,10 +29,41 @@ class NewsApiFetcher(BaseFetcher, FetcherInterface):
         - Required terms with +: +bitcoin
         - Excluded terms with -: -bitcoin
         - AND/OR/NOT operators: crypto AND (ethereum OR litecoin) NOT bitcoin
+
+        :param max_pages: Number of result pages to request (at most MAX_PAGES). Only the default
+                          single-page response is cached; deeper fetches always go to the API.
         """
         # Basic validation without URL encoding yet
         query = self._validate_and_format_query(query)
         language = self._validate_language(language)
+        max_pages = max(1, min(max_pages, MAX_PAGES))
+        if max_pages != DEFAULT_PAGES:
+            return self._fetch_uncached(query, language, max_pages)
+        return self.cache.get_or_fetch(query, language, None, lambda: self._fetch_uncached(query, language, max_pages))
+
+    def iter_articles(self, query, language=None, max_pages=MAX_PAGES):
+        """
+        Stream articles from NewsAPI as pages arrive, fetching up to max_pages pages concurrently.
+        Bypasses the response cache.
+        """
+        query = self._validate_and_format_query(query)
+        language = self._validate_language(language)
+        max_pages = max(1, min(max_pages, MAX_PAGES))
+        return self._iter_pages(NEWS_API_URL, self._build_params(query, language), PAGE_SIZE, max_pages)
+
+    def _fetch_uncached(self, query, language, max_pages=DEFAULT_PAGES):
+        articles = []
+        try:
+            self.logger.info(f"Fetching articles from NewsAPI with query: {query}")
+            for article in self._iter_pages(NEWS_API_URL, self._build_params(query, language), PAGE_SIZE, max_pages):
+                articles.append(article)
+            self.logger.info(f"Received {len(articles)} articles from NewsAPI")
+        except Exception as e:
+            self.logger.error(f"Failed to fetch articles from NewsAPI: {e}")
+
+        return articles
+
+    def _build_params(self, query, language):
         one_week_ago = (datetime.now() - timedelta(days=7)).isoformat()
 
         # For NewsAPI, we don't need to transform the query syntax
@@ -35,23 +73,13 @@ class NewsApiFetcher(BaseFetcher, FetcherInterface):
             "apiKey": self.api_key,
             "q": query,  # Send the query as is - NewsAPI handles the syntax
             "sortBy": "popularity",
-            "pageSize": 100,
+            "pageSize": PAGE_SIZE,
             "from": one_week_ago,
         }
         
         if language:
             params["language"] = language
-
-        articles = []
-        try:
-            self.logger.info(f"Fetching articles from NewsAPI with query: {query}")
-            response_data = self._send_request(NEWS_API_URL, params)
-            articles = response_data.get("articles", [])
-            self.logger.info(f"Received {len(articles)} articles from NewsAPI")
-        except Exception as e:
-            self.logger.error(f"Failed to fetch articles from NewsAPI: {e}")
-
-        return articles
+        return params
 
     def _validate_language(self, language):
         if language and language not in VALID_LANGUAGES:
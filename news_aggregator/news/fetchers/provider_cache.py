@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import re
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds a provider response is served as fresh
+DEFAULT_PROVIDER_TTLS = {
+    'newsapi': 15 * 60,
+    'gnews': 15 * 60,
+    'rss': 5 * 60,
+}
+PROVIDER_TTLS = {**DEFAULT_PROVIDER_TTLS, **getattr(settings, 'NEWS_PROVIDER_CACHE_TTLS', {})}
+DEFAULT_TTL = 10 * 60
+# After expiring, a response is still served for this long while a background refresh runs
+STALE_TTL = getattr(settings, 'NEWS_PROVIDER_CACHE_STALE_TTL', 60 * 60)
+REFRESH_LOCK_TIMEOUT = 60
+
+QUERY_TOKEN_RE = re.compile(r'"[^"]*"|\(|\)|[^\s()"]+')
+OPERATORS = {'AND', 'OR', 'NOT'}
+
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='provider-refresh')
+
+def _canonical_token(token):
+    if token.startswith('"'):
+        return '"' + ' '.join(token.strip('"').casefold().split()) + '"'
+    return token.casefold()
+
+def normalize_query(query):
+    """
+    Canonical form of a search query for cache keys: terms case-folded, whitespace collapsed,
+    implicit AND made explicit and 'NOT x' written as '-x'. Only upper-case AND/OR/NOT are operators,
+    as for the providers.
+    Without parentheses the query is a disjunction of conjunctions, so terms are sorted within
+    each AND group and the OR groups are sorted too; queries with parentheses keep their order.
+    """
+    tokens = QUERY_TOKEN_RE.findall(query or '')
+    if '(' in tokens or ')' in tokens:
+        return ' '.join(token if token in OPERATORS else _canonical_token(token) for token in tokens)
+
+    groups = [[]]
+    negate = False
+    for token in tokens:
+        if token == 'OR':
+            groups.append([])
+        elif token == 'NOT':
+            negate = True
+        elif token != 'AND':
+            term = _canonical_token(token)
+            groups[-1].append('-' + term.lstrip('+-') if negate else term)
+            negate = False
+
+    groups = sorted({' AND '.join(sorted(set(group))) for group in groups if group})
+    return ' OR '.join(groups)
+
+def cache_key(provider, query, language=None, country=None):
+    normalized = '|'.join([normalize_query(query), (language or '').lower(), (country or '').lower()])
+    return f"provider_response:{provider}:{hashlib.sha1(normalized.encode('utf-8')).hexdigest()}"
+
+class ProviderCache:
+    """
+    Cache of provider search responses, keyed by provider and normalized query, language and country.
+    Entries are zlib-compressed JSON in the Django cache (Redis). Fresh entries are served directly;
+    stale entries are served while one background refresh per key fetches a new response.
+    Empty responses are not cached, since fetchers return [] on errors.
+    """
+
+    def __init__(self, provider, ttl=None, stale_ttl=STALE_TTL):
+        self.provider = provider
+        self.ttl = ttl if ttl is not None else PROVIDER_TTLS.get(provider, DEFAULT_TTL)
+        self.stale_ttl = stale_ttl
+
+    def get_or_fetch(self, query, language, country, fetch):
+        """
+        :param fetch: Zero-argument callable performing the provider request and returning a list of articles.
+        :return: List of articles.
+        """
+        key = cache_key(self.provider, query, language, country)
+        entry = self.get(key)
+
+        if entry is None:
+            logger.info(f"{self.provider} cache miss for '{query}'")
+            return self.fetch_and_store(key, fetch)
+
+        age = time.time() - entry['fetched_at']
+        if age > self.ttl:
+            self.refresh_in_background(key, fetch)
+        logger.info(f"{self.provider} cache hit for '{query}' (age {age:.0f}s)")
+        return entry['articles']
+
+    def get(self, key):
+        data = cache.get(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(zlib.decompress(data))
+        except (zlib.error, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            return None
+
+    def set(self, key, articles):
+        data = zlib.compress(json.dumps({'fetched_at': time.time(), 'articles': articles}).encode('utf-8'))
+        cache.set(key, data, timeout=self.ttl + self.stale_ttl)
+
+    def fetch_and_store(self, key, fetch):
+        articles = fetch()
+        if articles:
+            self.set(key, articles)
+        return articles
+
+    def refresh_in_background(self, key, fetch):
+        # Only one process refreshes a given key at a time
+        if not cache.add(f"{key}:refreshing", 1, timeout=REFRESH_LOCK_TIMEOUT):
+            return
+        _refresh_executor.submit(self._refresh, key, fetch)
+
+    def _refresh(self, key, fetch):
+        try:
+            self.fetch_and_store(key, fetch)
+        except Exception as e:
+            logger.error(f"Background refresh of {key} failed: {e}")
+        finally:
+            cache.delete(f"{key}:refreshing")
@@ -0,0 +1,79 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SEARCH_DEADLINE = getattr(settings, 'NEWS_SEARCH_DEADLINE', 8.0)
+MAX_WORKERS = getattr(settings, 'NEWS_PROVIDER_WORKERS', 16)
+
+# Shared by all requests of the process. A per-request pool would block on shutdown until the
+# slowest provider returned, which is exactly the wait the deadline is meant to cut off.
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='news-provider')
+
+class FanoutResult:
+    """Articles of the providers that answered within the deadline, plus per-provider status"""
+
+    def __init__(self, articles, providers, elapsed_ms):
+        self.articles = articles
+        self.providers = providers
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def partial(self):
+        return any(info['status'] != 'ok' for info in self.providers.values())
+
+    def metadata(self):
+        return {
+            'partial': self.partial,
+            'elapsed_ms': round(self.elapsed_ms),
+            'providers': self.providers,
+        }
+
+class ProviderFanout:
+    """
+    Queries several news providers concurrently and returns whatever finished within a deadline.
+    Search latency is bounded by the deadline instead of the sum of all provider latencies; providers
+    that are still running are reported as timed out and their results are dropped.
+    """
+
+    def __init__(self, deadline=SEARCH_DEADLINE):
+        self.deadline = deadline
+
+    def run(self, calls):
+        """
+        :param calls: Dictionary of provider name to a zero-argument callable returning a list of articles.
+        :return: FanoutResult; articles are concatenated in the order of calls.
+        """
+        started = time.perf_counter()
+        futures = {name: _executor.submit(self._timed, call) for name, call in calls.items()}
+        wait(futures.values(), timeout=self.deadline)
+
+        articles = []
+        providers = {}
+        for name, future in futures.items():
+            if not future.done():
+                future.cancel()
+                providers[name] = {'status': 'timeout', 'count': 0}
+                logger.warning(f"Provider {name} did not answer within {self.deadline}s")
+                continue
+
+            try:
+                result, elapsed_ms = future.result()
+            except Exception as e:
+                providers[name] = {'status': 'error', 'count': 0, 'error': str(e)}
+                logger.error(f"Provider {name} failed: {e}")
+                continue
+
+            result = result or []
+            articles.extend(result)
+            providers[name] = {'status': 'ok', 'count': len(result), 'elapsed_ms': round(elapsed_ms)}
+
+        return FanoutResult(articles, providers, (time.perf_counter() - started) * 1000)
+
+    def _timed(self, call):
+        started = time.perf_counter()
+        result = call()
+        return result, (time.perf_counter() - started) * 1000
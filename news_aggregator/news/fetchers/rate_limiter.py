@@ -0,0 +1,119 @@
+import logging
+import time
+
+import redis
+from django.conf import settings
+
+from news.utils.storage import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Requests per period for each provider, shared by every web and Celery process
+DEFAULT_PROVIDER_BUDGETS = {
+    'newsapi': {'capacity': 100, 'period': 24 * 3600},
+    'gnews': {'capacity': 100, 'period': 24 * 3600},
+    'rss': {'capacity': 60, 'period': 60},
+}
+PROVIDER_BUDGETS = {**DEFAULT_PROVIDER_BUDGETS, **getattr(settings, 'NEWS_PROVIDER_BUDGETS', {})}
+# How long a request may queue for a token before giving up
+MAX_WAIT = getattr(settings, 'NEWS_PROVIDER_RATE_LIMIT_WAIT', 2.0)
+
+# Token bucket refilled continuously at capacity/period tokens per second. Uses the Redis clock, so
+# workers with skewed clocks share one consistent bucket.
+# Returns {allowed, tokens left, seconds until the requested tokens are available}.
+TOKEN_BUCKET_SCRIPT = """
+redis.replicate_commands()
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+    allowed = 1
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return {allowed, tostring(tokens), tostring(wait)}
+"""
+
+_token_bucket = redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+
+class RateLimitExceeded(Exception):
+    pass
+
+class ProviderRateLimiter:
+    """
+    Distributed token bucket for one provider's quota, stored in Redis and shared across processes.
+    When the bucket is empty, acquire() queues until a token is available or max_wait elapses.
+    If Redis is unreachable the limiter lets requests through rather than taking search down.
+    """
+
+    def __init__(self, provider, capacity=None, period=None, max_wait=MAX_WAIT):
+        budget = PROVIDER_BUDGETS.get(provider, {'capacity': 60, 'period': 60})
+        self.provider = provider
+        self.capacity = capacity or budget['capacity']
+        self.period = period or budget['period']
+        self.rate = self.capacity / self.period
+        self.max_wait = max_wait
+        self.key = f"rate_limit:{provider}"
+
+    def acquire(self, tokens=1, max_wait=None):
+        """
+        Take tokens from the bucket, waiting up to max_wait seconds for a refill.
+        :return: True if the tokens were granted.
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        while True:
+            try:
+                allowed, _, wait = self._call(tokens)
+            except redis.RedisError as e:
+                logger.warning(f"Rate limiter for {self.provider} unavailable, allowing request: {e}")
+                return True
+
+            if allowed:
+                return True
+
+            remaining = deadline - time.monotonic()
+            if wait > remaining:
+                logger.warning(f"{self.provider} budget exhausted, next token in {wait:.1f}s")
+                return False
+            time.sleep(wait)
+
+    def status(self):
+        """Current budget of the provider, for metrics"""
+        try:
+            _, tokens, _ = self._call(0)
+        except redis.RedisError as e:
+            return {'provider': self.provider, 'error': str(e)}
+        return {
+            'provider': self.provider,
+            'capacity': self.capacity,
+            'period_seconds': self.period,
+            'remaining': int(tokens),
+            'seconds_until_full': round((self.capacity - tokens) / self.rate),
+        }
+
+    def _call(self, tokens):
+        allowed, remaining, wait = _token_bucket(keys=[self.key], args=[self.capacity, self.rate, tokens])
+        return bool(allowed), float(remaining), float(wait)
+
+def budget_status():
+    """Remaining budget of every configured provider"""
+    return {provider: ProviderRateLimiter(provider).status() for provider in PROVIDER_BUDGETS}
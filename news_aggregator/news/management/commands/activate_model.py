@@ -0,0 +1,46 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from news.services.model_registry import BUNDLE_ROOT
+from nlp.models.bundle import MANIFEST_FILE, read_current_version, read_manifest, set_current_version, verify_bundle
+
+class Command(BaseCommand):
+    help = 'List exported NLP bundles or activate one. Running web and Celery processes swap it in without a restart.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('version', nargs='?', help='Bundle version to activate')
+        parser.add_argument('--list', action='store_true', help='List available bundle versions')
+
+    def handle(self, *args, **options):
+        current = read_current_version(BUNDLE_ROOT)
+
+        if options['list'] or not options['version']:
+            self.list_bundles(current)
+            return
+
+        version = options['version']
+        bundle_dir = os.path.join(BUNDLE_ROOT, version)
+        if not os.path.exists(os.path.join(bundle_dir, MANIFEST_FILE)):
+            raise CommandError(f"No bundle {version} in {BUNDLE_ROOT}")
+
+        try:
+            verify_bundle(bundle_dir)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        set_current_version(BUNDLE_ROOT, version)
+        self.stdout.write(self.style.SUCCESS(f"Activated NLP model {version} (was {current or 'legacy'})"))
+
+    def list_bundles(self, current):
+        if not os.path.isdir(BUNDLE_ROOT):
+            self.stdout.write(f"No bundles in {BUNDLE_ROOT}")
+            return
+
+        for name in sorted(os.listdir(BUNDLE_ROOT)):
+            bundle_dir = os.path.join(BUNDLE_ROOT, name)
+            if not os.path.exists(os.path.join(bundle_dir, MANIFEST_FILE)):
+                continue
+            manifest = read_manifest(bundle_dir)
+            marker = '*' if name == current else ' '
+            self.stdout.write(f"{marker} {name}  tasks={','.join(manifest['tasks'])}  dtype={manifest['storage_dtype']}  source={manifest.get('source')}")
@@ -0,0 +1,63 @@
+import os
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from news.utils.content_extractor import ContentExtractor
+
+TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+class Command(BaseCommand):
+    help = 'Compare the CPU cost of the content extraction backends on a directory of saved HTML pages.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('corpus_dir', help='Directory containing saved article pages (*.html)')
+        parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus per backend')
+        parser.add_argument('--backends', nargs='+', default=['soup', 'stream'],
+                            choices=ContentExtractor.BACKENDS)
+
+    def handle(self, *args, **options):
+        pages = self.load_corpus(options['corpus_dir'])
+        if not pages:
+            raise CommandError(f"No .html files in {options['corpus_dir']}")
+
+        self.stdout.write(f"Corpus: {len(pages)} pages, {sum(len(html) for _, html in pages) / 1024:.0f} KiB")
+
+        timings = {}
+        outputs = {}
+        for backend in options['backends']:
+            extractor = ContentExtractor(backend=backend)
+            started = time.process_time()
+            for _ in range(options['repeat']):
+                results = [extractor.extract_from_html(html, title) for title, html in pages]
+            elapsed = time.process_time() - started
+            timings[backend] = elapsed / (options['repeat'] * len(pages)) * 1000
+            outputs[backend] = [result['truncated_content'] if result else None for result in results]
+
+            extracted = sum(1 for result in results if result)
+            self.stdout.write(f"{backend:>8}: {timings[backend]:.2f} ms CPU/page, {extracted}/{len(pages)} pages with content")
+
+        if len(timings) > 1:
+            baseline, *others = options['backends']
+            for backend in others:
+                same = sum(1 for a, b in zip(outputs[baseline], outputs[backend]) if a == b)
+                self.stdout.write(
+                    f"{backend} vs {baseline}: {timings[baseline] / timings[backend]:.1f}x faster, "
+                    f"identical truncated content on {same}/{len(pages)} pages"
+                )
+
+    def load_corpus(self, corpus_dir):
+        if not os.path.isdir(corpus_dir):
+            raise CommandError(f"{corpus_dir} is not a directory")
+
+        pages = []
+        for name in sorted(os.listdir(corpus_dir)):
+            if not name.endswith(('.html', '.htm')):
+                continue
+            with open(os.path.join(corpus_dir, name), 'r', encoding='utf-8', errors='replace') as f:
+                html = f.read()
+            match = TITLE_RE.search(html)
+            title = match.group(1).strip() if match else os.path.splitext(name)[0]
+            pages.append((title, html))
+        return pages
@@ -1,7 +1,11 @@
+import json
 import os
 import re
+import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 from html import unescape
 from urllib.parse import urlparse
 
@@ -13,12 +17,44 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 
 from news.models import Feed, Sources
+from news.services.extraction_service import is_permanent_failure
+
+STATE_FILENAME = '.import_opml_state.json'
+FEED_UPDATE_FIELDS = ['title', 'description', 'source', 'country', 'category', 'language', 'last_built', 'is_active']
+MAX_FEED_BYTES = 5 * 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+# requests applies its timeout to each socket read, so reads are kept short and a total deadline is checked between them
+MAX_READ_TIMEOUT = 5
+
+class FeedTimeout(Exception):
+    pass
+
+@lru_cache(maxsize=None)
+def country_code(country_name):
+    """ISO alpha-2 code (lower case) of a country name; fuzzy search is slow, so names are looked up once"""
+    if not country_name:
+        return None
+
+    try:
+        country = pycountry.countries.get(name=country_name)
+        if country:
+            return country.alpha_2.lower()
+
+        country = pycountry.countries.search_fuzzy(country_name)[0]
+        return country.alpha_2.lower()
+    except Exception:
+        return None
 
 class Command(BaseCommand):
     help = 'Import RSS feeds from OPML files with proper category/country handling'
 
     def add_arguments(self, parser):
         parser.add_argument('--dir', type=str, help='Directory containing OPML files')
+        parser.add_argument('--workers', type=int, default=16, help='Feeds validated concurrently')
+        parser.add_argument('--timeout', type=float, default=15, help='Seconds allowed to fetch one feed')
+        parser.add_argument('--batch-size', type=int, default=200, help='Validated feeds written per bulk upsert')
+        parser.add_argument('--state-file', type=str, help=f'Progress file for resuming (default: <dir>/{STATE_FILENAME})')
+        parser.add_argument('--restart', action='store_true', help='Ignore the progress of an interrupted import')
 
     def handle(self, *args, **options):
         opml_dir = options['dir']
@@ -26,90 +62,188 @@ class Command(BaseCommand):
             self.stderr.write(self.style.ERROR('Please specify --dir parameter'))
             return
 
+        self.workers = options['workers']
+        self.timeout = options['timeout']
+        self.batch_size = options['batch_size']
+        self.state_file = options['state_file'] or os.path.join(opml_dir, STATE_FILENAME)
+        if options['restart'] and os.path.exists(self.state_file):
+            os.remove(self.state_file)
+
         self.process_opml_directory(opml_dir)
 
     def process_opml_directory(self, directory):
-        for filename in os.listdir(directory):
-            if filename.endswith('.opml'):
-                filepath = os.path.join(directory, filename)
-                dir_name = os.path.basename(os.path.normpath(directory)).lower()
-                self.stdout.write(f"Processing {filename}...")
+        """
+        Collect the feeds of every OPML file, validate them concurrently and bulk upsert them in batches.
+        Feeds handled in an earlier, interrupted run (recorded in the state file after each batch) are skipped.
+        """
+        # A feed listed more than once takes its category/country from the last listing, as with update_or_create
+        outlines = {outline['feed_url']: outline for outline in self.read_opml_directory(directory)}
+
+        done = self.load_state()
+        pending = [outline for url, outline in outlines.items() if url not in done]
+        if done:
+            self.stdout.write(f"Resuming: {len(outlines) - len(pending)} of {len(outlines)} feeds already imported")
+        self.stdout.write(f"Validating {len(pending)} feeds with {self.workers} workers...")
+
+        batch = []
+        retry = 0
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            futures = {executor.submit(self.get_feed_info, outline['feed_url']): outline for outline in pending}
+            for future in as_completed(futures):
+                outline = futures[future]
+                feed_info = future.result()
+                if feed_info.get('retry'):
+                    retry += 1
+                    self.stdout.write(self.style.WARNING(f"Feed temporarily unavailable, will retry: {outline['feed_url']}"))
+                elif not feed_info.get('valid'):
+                    self.stdout.write(self.style.WARNING(f"Skipping invalid/empty feed: {outline['feed_url']}"))
+                batch.append((outline, feed_info))
+
+                if len(batch) >= self.batch_size:
+                    self.save_batch(batch, done)
+                    batch = []
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.save_batch(batch, done)
+            self.stderr.write(self.style.WARNING(f"Interrupted; run the command again to resume from {self.state_file}"))
+            raise
+        executor.shutdown()
+
+        self.save_batch(batch, done)
+        if retry:
+            # Keep the state file, so the next run only retries the feeds that failed temporarily
+            self.stdout.write(self.style.WARNING(f"{retry} feeds failed temporarily; run the command again to retry them"))
+        elif os.path.exists(self.state_file):
+            os.remove(self.state_file)
+        self.stdout.write(self.style.SUCCESS(f"Imported feeds from {len(outlines)} outlines"))
+
+    def read_opml_directory(self, directory):
+        """Yield the feed outlines of every OPML file as dictionaries"""
+        dir_name = os.path.basename(os.path.normpath(directory)).lower()
+        is_country = dir_name == 'country'
+
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith('.opml'):
+                continue
+            filepath = os.path.join(directory, filename)
+            self.stdout.write(f"Processing {filename}...")
+            try:
                 try:
                     with open(filepath, 'r', encoding='utf-8') as f:
-                        try:
-                            content = f.read()
-                        except UnicodeDecodeError:
-                            with open(filepath, 'r', encoding='latin-1') as f2:
-                                content = f2.read()
-                    
-                    content = self.clean_xml(content)
-                    parser = ET.XMLParser(encoding='utf-8')
-                    tree = ET.ElementTree(ET.fromstring(content, parser=parser))
-                    root = tree.getroot()
-                    
-                    is_country = dir_name == 'country'
-                    
-                    # Get all parent outlines (categories/countries)
-                    for parent_outline in root.findall('.//body/outline'):
-                        category_or_country = parent_outline.attrib.get('text', '').lower()
-                        
-                        # Process each feed within this category/country
-                        for feed_outline in parent_outline.findall('outline'):
-                            self.process_feed(feed_outline, is_country, category_or_country)
-                        
-                except ET.ParseError as e:
-                    self.stderr.write(self.style.ERROR(f"XML parse error in {filename}: {e}"))
-                except Exception as e:
-                    self.stderr.write(self.style.ERROR(f"Error processing {filename}: {e}"))
-
-    def process_feed(self, outline, is_country, category_or_country):
-        feed_url = outline.attrib.get('xmlUrl')
-        if not feed_url:
-            return
+                        content = f.read()
+                except UnicodeDecodeError:
+                    with open(filepath, 'r', encoding='latin-1') as f:
+                        content = f.read()
 
-        feed_info = self.get_feed_info(feed_url)
-        if not feed_info or not feed_info.get('valid'):
-            self.stdout.write(self.style.WARNING(f"Skipping invalid/empty feed: {feed_url}"))
-            return
+                content = self.clean_xml(content)
+                parser = ET.XMLParser(encoding='utf-8')
+                root = ET.fromstring(content, parser=parser)
+            except ET.ParseError as e:
+                self.stderr.write(self.style.ERROR(f"XML parse error in {filename}: {e}"))
+                continue
+            except Exception as e:
+                self.stderr.write(self.style.ERROR(f"Error processing {filename}: {e}"))
+                continue
 
-        with transaction.atomic():
-            domain = urlparse(feed_url).netloc
-            
-            # Determine country/category values
-            if is_country:
-                country_code = self.get_country_code(category_or_country)
-                category = None
-            else:
-                country_code = None
-                category = category_or_country
-
-            source, created = Sources.objects.get_or_create(
-                url=f"https://{domain}",
-                defaults={
-                    'name': outline.attrib.get('title', domain),
-                    'country': country_code,
-                    'language': feed_info.get('language_code')
-                }
-            )
+            # Get all parent outlines (categories/countries)
+            for parent_outline in root.findall('.//body/outline'):
+                category_or_country = parent_outline.attrib.get('text', '').lower()
 
-            feed, created = Feed.objects.update_or_create(
-                url=feed_url,
-                defaults={
-                    'title': feed_info.get('title') or outline.attrib.get('title', ''),
-                    'description': feed_info.get('description') or outline.attrib.get('description', ''),
-                    'source': source,
-                    'country': country_code,
-                    'category': category,
-                    'language': feed_info.get('language_code'),
-                    'last_built': feed_info.get('last_built'), # TODO: Switch to updated_parsed
-                    'is_active': True
-                }
+                # Each feed within this category/country
+                for feed_outline in parent_outline.findall('outline'):
+                    feed_url = feed_outline.attrib.get('xmlUrl')
+                    if not feed_url:
+                        continue
+                    yield {
+                        'feed_url': feed_url,
+                        'title': feed_outline.attrib.get('title', ''),
+                        'description': feed_outline.attrib.get('description', ''),
+                        'country': country_code(category_or_country) if is_country else None,
+                        'category': None if is_country else category_or_country,
+                    }
+
+    def save_batch(self, batch, done):
+        """
+        Bulk upsert the sources and feeds of a batch of validated outlines, then record the batch in the
+        state file: valid and definitively rejected feeds, but not the ones that failed temporarily.
+        :param batch: List of (outline, feed info) tuples.
+        :param done: Set of feed URLs handled so far; updated in place.
+        """
+        valid = [(outline, info) for outline, info in batch if info.get('valid')]
+        if valid:
+            with transaction.atomic():
+                sources = self.upsert_sources(valid)
+                self.upsert_feeds(valid, sources)
+
+        done.update(outline['feed_url'] for outline, info in batch if not info.get('retry'))
+        self.save_state(done)
+
+    def upsert_sources(self, valid):
+        """
+        Create the sources of a batch that do not exist yet; existing sources are left unchanged.
+        :return: Dictionary of source URL to Sources.
+        """
+        new_sources = {}
+        for outline, feed_info in valid:
+            domain = urlparse(outline['feed_url']).netloc
+            url = f"https://{domain}"
+            if url not in new_sources:
+                new_sources[url] = Sources(
+                    url=url,
+                    name=outline['title'] or domain,
+                    country=outline['country'],
+                    language=feed_info.get('language_code'),
+                )
+
+        Sources.objects.bulk_create(new_sources.values(), ignore_conflicts=True, batch_size=500)
+        return {source.url: source for source in Sources.objects.filter(url__in=list(new_sources))}
+
+    def upsert_feeds(self, valid, sources):
+        urls = [outline['feed_url'] for outline, _ in valid]
+        existing = set(Feed.objects.filter(url__in=urls).values_list('url', flat=True))
+
+        feeds = [
+            Feed(
+                url=outline['feed_url'],
+                title=feed_info.get('title') or outline['title'],
+                description=feed_info.get('description') or outline['description'],
+                source=sources.get(f"https://{urlparse(outline['feed_url']).netloc}"),
+                country=outline['country'],
+                category=outline['category'],
+                language=feed_info.get('language_code'),
+                last_built=feed_info.get('last_built'),  # TODO: Switch to updated_parsed
+                is_active=True,
             )
+            for outline, feed_info in valid
+        ]
+        Feed.objects.bulk_create(
+            feeds,
+            update_conflicts=True,
+            unique_fields=['url'],
+            update_fields=FEED_UPDATE_FIELDS,
+            batch_size=500,
+        )
+
+        added = len(set(urls) - existing)
+        self.stdout.write(self.style.SUCCESS(f"Added {added} new feeds, updated {len(feeds) - added} existing feeds"))
+
+    def load_state(self):
+        if not os.path.exists(self.state_file):
+            return set()
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return set(json.load(f).get('done', []))
+        except (OSError, ValueError) as e:
+            self.stderr.write(self.style.WARNING(f"Ignoring unreadable state file {self.state_file}: {e}"))
+            return set()
 
-            if created:
-                self.stdout.write(self.style.SUCCESS(f"Added new feed: {feed_url}"))
-            else:
-                self.stdout.write(f"Updated existing feed: {feed_url}")
+    def save_state(self, done):
+        # Write-then-rename, so an interruption never leaves a truncated state file
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'done': sorted(done)}, f)
+        os.replace(tmp_path, self.state_file)
 
     def escape_unescaped_ampersands(self, text):
         # Replace & not followed by one of: amp;, lt;, gt;, quot;, apos;, #digits; or #xhex;
@@ -125,9 +259,37 @@ class Command(BaseCommand):
         content = ''.join(char for char in content if ord(char) >= 32 or char in '\t\n\r')
         return content
 
+    def read_feed(self, response, deadline):
+        """
+        Read at most MAX_FEED_BYTES of a streamed response before the deadline (a time.monotonic() value).
+        :raises FeedTimeout: If the deadline passes while reading.
+        """
+        content = b''
+        for chunk in response.iter_content(chunk_size=READ_CHUNK_BYTES):
+            content += chunk
+            if len(content) >= MAX_FEED_BYTES:
+                return content[:MAX_FEED_BYTES]
+            if time.monotonic() > deadline:
+                raise FeedTimeout(f"Reading took longer than {self.timeout}s")
+        return content
+
     def get_feed_info(self, feed_url):
+        """
+        Fetch (within the timeout, in total) and parse a feed. Runs in the validation thread pool.
+        :return: Feed details with 'valid' set; invalid feeds that may work later (timeouts, connection
+                 errors, 5xx and 429 responses) also have 'retry' set.
+        """
+        deadline = time.monotonic() + self.timeout
         try:
-            feed = feedparser.parse(feed_url)
+            response = requests.get(feed_url, timeout=(self.timeout, min(self.timeout, MAX_READ_TIMEOUT)), stream=True)
+            try:
+                if response.status_code != 200:
+                    return {'valid': False, 'retry': response.status_code >= 400 and not is_permanent_failure(response.status_code)}
+                content = self.read_feed(response, deadline)
+            finally:
+                response.close()
+
+            feed = feedparser.parse(content)
             
             if getattr(feed, 'bozo', False) or not feed.entries:
                 return {'valid': False}
@@ -149,24 +311,13 @@ class Command(BaseCommand):
                 'entry_count': len(feed.entries)
             }
             
+        except (FeedTimeout, requests.Timeout, requests.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+            self.stdout.write(self.style.WARNING(f"Error fetching feed {feed_url}: {str(e)}"))
+            return {'valid': False, 'retry': True}
         except Exception as e:
             self.stdout.write(self.style.WARNING(f"Error processing feed {feed_url}: {str(e)}"))
             return {'valid': False}
 
-    def get_country_code(self, country_name):
-        if not country_name:
-            return None
-            
-        try:
-            country = pycountry.countries.get(name=country_name)
-            if country:
-                return country.alpha_2.lower()
-            
-            country = pycountry.countries.search_fuzzy(country_name)[0]
-            return country.alpha_2.lower()
-        except:
-            return None
-
     def validate_feed_url(self, url):
         try:
             response = requests.get(url, timeout=10)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0011_alter_userinteraction_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articles',
+            name='model_version',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
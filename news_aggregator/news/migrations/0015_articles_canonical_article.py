@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0014_feed_polling_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articles',
+            name='canonical_article',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='news.articles'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0015_articles_canonical_article'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articles',
+            name='canonical_url',
+            field=models.TextField(null=True),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2 on 2026-10-19 10:00
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.db import migrations
+
+# Frozen copy of news.utils.url_canonicalizer.canonicalize_url as of this migration, so later changes to
+# the canonical form (or to the settings it reads) do not change what this migration computes.
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', 'ocid', 'cmpid',
+    'ref', 'ref_src', 'ref_url', 'referrer', 'smid', 'ito', 'ns_mchannel', 'ns_source', 'ns_campaign',
+    'ns_linkname', 'ns_fee', 'sr_share', 'spm', 'guccounter', 'oc',
+}
+TRACKING_PREFIXES = ('utm_', '_hs', 'hsa_', 'pk_', 'mtm_', 'at_', 'vero_')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url):
+    url = (url or '').strip()
+    if not url:
+        return ''
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+
+    host = (parts.hostname or '').rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    if port and port != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{port}"
+
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/')
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+def populate_canonical_url(apps, schema_editor):
+    """
+    Canonicalize the URLs of stored articles (without resolving redirects). When several articles share a
+    canonical URL, the oldest keeps it and the others are marked as its duplicates.
+    """
+    Articles = apps.get_model('news', 'Articles')
+    canonical_ids = {}
+    batch = []
+
+    for article in Articles.objects.order_by('id').only('id', 'url', 'canonical_article_id').iterator(chunk_size=2000):
+        key = canonicalize_url(article.url)
+        if key in canonical_ids:
+            if article.canonical_article_id is None:
+                article.canonical_article_id = canonical_ids[key]
+        else:
+            canonical_ids[key] = article.id
+            article.canonical_url = key
+        batch.append(article)
+
+        if len(batch) >= 2000:
+            Articles.objects.bulk_update(batch, ['canonical_url', 'canonical_article'])
+            batch = []
+
+    if batch:
+        Articles.objects.bulk_update(batch, ['canonical_url', 'canonical_article'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0016_articles_canonical_url'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_canonical_url, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0017_populate_canonical_url'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='articles',
+            name='canonical_url',
+            field=models.TextField(null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='articles',
+            name='url',
+            field=models.TextField(db_index=True),
+        ),
+    ]
@@ -21,7 +21,8 @@ class Articles(models.Model):
     title = models.TextField()
     author = models.TextField(blank=True, null=True)
     content = models.TextField()
-    url = models.TextField(unique=True)
+    url = models.TextField(db_index=True)
+    canonical_url = models.TextField(unique=True, null=True)  # Deduplication key, see news.utils.url_canonicalizer
     image_url = models.TextField(blank=True, null=True)
     source = models.ForeignKey('Sources', models.SET_NULL, blank=True, null=True)
     published_date = models.DateTimeField(blank=True, null=True)
@@ -29,12 +30,14 @@ class Articles(models.Model):
     fake_score = models.FloatField(blank=True, null=True)  # For backward compatibility
     is_fake = models.BooleanField(blank=True, null=True)   # New field: True=fake, False=real
     sentiment = models.CharField(max_length=10, blank=True, null=True)  # New field: 'positive' or 'negative'
+    model_version = models.CharField(max_length=64, blank=True, null=True)  # NLP model version behind is_fake/sentiment
     embedding = VectorField(dimensions=384, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     keywords = models.ManyToManyField(Keyword, related_name='articles')
     language = models.CharField(max_length=10, blank=True, null=True)
     categories = models.TextField(blank=True, null=True)
     feed = models.ForeignKey('Feed', on_delete=models.SET_NULL, null=True, blank=True)
+    canonical_article = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='duplicates')  # Set on near-duplicates of an earlier article
 
     class Meta:
         managed = True
@@ -101,6 +104,18 @@ class Feed(models.Model):
     country = models.TextField(blank=True, null=True)
     language = models.TextField(blank=True, null=True)
     last_built = models.DateTimeField(blank=True, null=True)
+    etag = models.TextField(blank=True, null=True)
+    last_modified = models.TextField(blank=True, null=True)
+    content_hash = models.CharField(max_length=64, blank=True, null=True)
+    poll_interval = models.PositiveIntegerField(default=1800)
+    next_poll_at = models.DateTimeField(blank=True, null=True, db_index=True)
+    last_polled_at = models.DateTimeField(blank=True, null=True)
+    consecutive_failures = models.PositiveIntegerField(default=0)
+    success_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    avg_latency_ms = models.FloatField(blank=True, null=True)
+    avg_new_entries = models.FloatField(blank=True, null=True)
+    last_error = models.TextField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -111,6 +126,18 @@ class Feed(models.Model):
     def __str__(self):
         return f"{self.title} ({self.url})"
 
+class FeedEntry(models.Model):
+    feed = models.ForeignKey(Feed, on_delete=models.CASCADE, related_name='entries')
+    guid = models.TextField()
+    seen_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'feed_entries'
+        unique_together = ('feed', 'guid')
+
+    def __str__(self):
+        return f"{self.feed_id}: {self.guid}"
+
 class SavedCollection(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     name = models.CharField(max_length=100)
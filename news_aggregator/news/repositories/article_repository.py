@@ -2,6 +2,7 @@ from news.models import Articles
 from .interfaces import ArticleRepositoryInterface
 from django.utils.timezone import now
 from django.db.utils import IntegrityError
+from news.utils.url_canonicalizer import canonical_url
 
 class ArticleRepository(ArticleRepositoryInterface):
     def get_or_create_article(self, **kwargs) -> Articles:
@@ -12,7 +13,8 @@ class ArticleRepository(ArticleRepositoryInterface):
                 article.save()
             return article, created
         except IntegrityError:
-            return Articles.objects.get(url=kwargs['url']), False
+            lookup = {key: kwargs[key] for key in ('canonical_url', 'url') if key in kwargs}
+            return Articles.objects.get(**lookup), False
 
     def get_article_by_url(self, url: str) -> Articles:
-        return Articles.objects.get(url=url)
\ No newline at end of file
+        return Articles.objects.get(canonical_url=canonical_url(url, resolve=False))
\ No newline at end of file
@@ -13,4 +13,9 @@ class ArticleRepositoryInterface(ABC):
 class SourceRepositoryInterface(ABC):
     @abstractmethod
     def get_or_create_source(self, **kwargs) -> Sources:
-        pass
\ No newline at end of file
+        pass
+
+class KeywordRepositoryInterface(ABC):
+    @abstractmethod
+    def link_keywords(self, article_keywords) -> int:
+        pass
@@ -0,0 +1,49 @@
+from news.models import Articles, Keyword
+from .interfaces import KeywordRepositoryInterface
+
+QUERY_OPERATORS = {"AND", "OR", "NOT"}
+
+def normalize_keywords(keywords):
+    """
+    Normalize search terms into stored keywords: lowercase, quotes and leading '+' removed.
+    Boolean operators and excluded ('-' prefixed) terms are dropped.
+    """
+    normalized = []
+    for keyword in keywords or []:
+        keyword = (keyword or "").strip().strip('"').strip()
+        if not keyword or keyword.upper() in QUERY_OPERATORS or keyword.startswith("-"):
+            continue
+        keyword = keyword.lstrip("+").strip().lower()
+        if keyword and keyword not in normalized:
+            normalized.append(keyword)
+    return normalized
+
+class KeywordRepository(KeywordRepositoryInterface):
+    def link_keywords(self, article_keywords) -> int:
+        """
+        Attach keywords to many articles at once.
+        All distinct keywords are upserted in one statement and the Articles.keywords through-rows are
+        bulk-inserted with conflict skipping, so the cost does not grow with the number of articles.
+        :param article_keywords: Mapping of article id to an iterable of raw keywords.
+        :return: Number of (article, keyword) pairs submitted.
+        """
+        normalized = {
+            article_id: normalize_keywords(keywords)
+            for article_id, keywords in article_keywords.items()
+        }
+        distinct = {keyword for keywords in normalized.values() for keyword in keywords}
+        if not distinct:
+            return 0
+
+        Keyword.objects.bulk_create([Keyword(keyword=keyword) for keyword in distinct], ignore_conflicts=True)
+        keyword_ids = dict(Keyword.objects.filter(keyword__in=distinct).values_list("keyword", "id"))
+
+        through = Articles.keywords.through
+        links = [
+            through(articles_id=article_id, keyword_id=keyword_ids[keyword])
+            for article_id, keywords in normalized.items()
+            for keyword in keywords
+            if keyword in keyword_ids
+        ]
+        through.objects.bulk_create(links, ignore_conflicts=True, batch_size=1000)
+        return len(links)
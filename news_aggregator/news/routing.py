@@ -3,4 +3,5 @@ from . import consumers
 
 websocket_urlpatterns = [
     re_path(r'ws/news/$', consumers.NewsConsumer.as_asgi()),
+    re_path(r'ws/tasks/(?P<task_id>[\w-]+)/$', consumers.TaskProgressConsumer.as_asgi()),
 ]
\ No newline at end of file
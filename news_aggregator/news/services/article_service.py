@@ -1,16 +1,20 @@
-from news.models import Keyword
 from news.repositories.article_repository import ArticleRepository
+from news.repositories.keyword_repository import KeywordRepository
 from news.repositories.source_repository import SourceRepository
+from news.utils.url_canonicalizer import canonical_urls
 
 class ArticleService:
     def __init__(self):
         self.article_repo = ArticleRepository()
         self.source_repo = SourceRepository()
+        self.keyword_repo = KeywordRepository()
 
     def store_articles(self, articles, query):
         parsed_keywords = self._parse_query(query)
+        article_ids = []
+        keys = canonical_urls([article["url"] for article in articles])
 
-        for article in articles:
+        for article, key in zip(articles, keys):
             source_name = article["source"]["name"]
             source_url = article["source"].get("url", source_name)
 
@@ -20,8 +24,9 @@ class ArticleService:
             )
 
             article_obj, created = self.article_repo.get_or_create_article(
-                url=article["url"],
+                canonical_url=key,
                 defaults={
+                    "url": article["url"],
                     "title": article["title"],
                     "content": article.get("content", "") or "",
                     "source": source_obj,
@@ -32,12 +37,9 @@ class ArticleService:
                 }
             )
 
-            existing_keywords = set(article_obj.keywords.values_list('keyword', flat=True)) if not created else set()
-            
-            for keyword in parsed_keywords:
-                if created or keyword not in existing_keywords:
-                    keyword_obj, _ = Keyword.objects.get_or_create(keyword=keyword)
-                    article_obj.keywords.add(keyword_obj)
+            article_ids.append(article_obj.id)
+
+        self.keyword_repo.link_keywords({article_id: parsed_keywords for article_id in article_ids})
 
     def _parse_query(self, query):
         import re
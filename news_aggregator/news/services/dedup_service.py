@@ -0,0 +1,139 @@
+import hashlib
+import logging
+import re
+
+import numpy as np
+import redis
+from django.conf import settings
+
+from news.utils.storage import redis_client
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+# Estimated Jaccard similarity of title+content shingles above which two articles are the same story
+SIMILARITY_THRESHOLD = getattr(settings, 'NEWS_DEDUP_THRESHOLD', 0.8)
+# Duplicates are looked for among articles indexed within this window
+INDEX_TTL = getattr(settings, 'NEWS_DEDUP_WINDOW', 14 * 24 * 3600)
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+# Fixed seed: signatures must stay comparable across processes and restarts
+_random = np.random.RandomState(20240501)
+PERMUTATION_A = _random.randint(1, 1 << 31, size=NUM_PERMUTATIONS, dtype=np.uint64)
+PERMUTATION_B = _random.randint(0, 1 << 31, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+WORD_RE = re.compile(r'\w+')
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Set of word n-grams of the lowercased text"""
+    words = WORD_RE.findall((text or '').lower())
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def minhash_signature(shingle_set):
+    """MinHash signature (NUM_PERMUTATIONS uint32 values) of a shingle set"""
+    if not shingle_set:
+        return None
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingle_set),
+        dtype=np.uint64,
+        count=len(shingle_set),
+    )
+    permuted = ((np.outer(hashes, PERMUTATION_A) + PERMUTATION_B) % MERSENNE_PRIME) & MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+def estimate_similarity(signature, other):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return float(np.mean(signature == other))
+
+def article_signature(article):
+    return minhash_signature(shingles(f"{article.title} {article.content}"))
+
+class NearDuplicateDetector:
+    """
+    MinHash/LSH index of recently ingested articles, persisted in Redis.
+    Each signature is split into LSH_BANDS bands; articles sharing any band bucket are candidates, and a
+    candidate is accepted as the same story when the estimated similarity reaches the threshold.
+    Index entries expire after INDEX_TTL, so only recent stories are matched.
+    """
+
+    def __init__(self, client=redis_client, threshold=SIMILARITY_THRESHOLD, ttl=INDEX_TTL):
+        self.client = client
+        self.threshold = threshold
+        self.ttl = ttl
+
+    def find_canonical(self, signature):
+        """
+        :return: Id of the indexed article most similar to the signature above the threshold, or None.
+        """
+        band_keys = self._band_keys(signature)
+        pipe = self.client.pipeline(transaction=False)
+        for key in band_keys:
+            pipe.smembers(key)
+        candidates = set().union(*pipe.execute())
+        if not candidates:
+            return None
+
+        candidates = sorted(int(candidate) for candidate in candidates)
+        pipe = self.client.pipeline(transaction=False)
+        for candidate in candidates:
+            pipe.get(f"dedup:sig:{candidate}")
+
+        best_id, best_score = None, self.threshold
+        for candidate, raw in zip(candidates, pipe.execute()):
+            if raw is None:
+                continue
+            score = estimate_similarity(signature, np.frombuffer(raw, dtype=np.uint32))
+            if score >= best_score:
+                best_id, best_score = candidate, score
+        return best_id
+
+    def index(self, article_id, signature):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(f"dedup:sig:{article_id}", signature.tobytes(), ex=self.ttl)
+        for key in self._band_keys(signature):
+            pipe.sadd(key, article_id)
+            pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def link_duplicates(self, articles):
+        """
+        Match a batch of stored articles against the index (and against each other) and set
+        canonical_article_id on the duplicates. Articles without a match are indexed as canonical.
+        If Redis is unavailable every article is treated as canonical.
+        :return: Tuple of (canonical articles, duplicate articles).
+        """
+        originals, duplicates = [], []
+        for position, article in enumerate(articles):
+            signature = article_signature(article)
+            if signature is None:
+                originals.append(article)
+                continue
+
+            try:
+                canonical_id = self.find_canonical(signature)
+                if canonical_id is None or canonical_id == article.id:
+                    self.index(article.id, signature)
+            except redis.RedisError as e:
+                logger.warning(f"Near-duplicate index unavailable, skipping dedup: {e}")
+                originals.extend(articles[position:])
+                break
+
+            if canonical_id is None or canonical_id == article.id:
+                originals.append(article)
+            else:
+                article.canonical_article_id = canonical_id
+                duplicates.append(article)
+
+        return originals, duplicates
+
+    def _band_keys(self, signature):
+        return [
+            f"dedup:lsh:{band}:{hashlib.blake2b(signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes(), digest_size=8).hexdigest()}"
+            for band in range(LSH_BANDS)
+        ]
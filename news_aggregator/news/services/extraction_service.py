@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from news.utils.content_extractor import ContentExtractor
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = getattr(settings, 'EXTRACTION_CACHE_PATH', os.path.join(settings.BASE_DIR, 'extraction_cache.sqlite3'))
+CACHE_TTL = getattr(settings, 'EXTRACTION_CACHE_TTL', 7 * 24 * 3600)
+# Failed downloads are retried sooner than successful extractions are refreshed
+FAILURE_CACHE_TTL = getattr(settings, 'EXTRACTION_FAILURE_CACHE_TTL', 3600)
+MAX_WORKERS = getattr(settings, 'EXTRACTION_MAX_WORKERS', 16)
+MAX_PER_DOMAIN = getattr(settings, 'EXTRACTION_MAX_PER_DOMAIN', 2)
+DOMAIN_DELAY = getattr(settings, 'EXTRACTION_DOMAIN_DELAY', 0.5)
+REQUEST_TIMEOUT = (5, 10)
+
+STATUS_OK = 'ok'
+STATUS_NO_CONTENT = 'no_content'
+STATUS_FAILED = 'failed'
+
+def is_permanent_failure(status):
+    """HTTP statuses after which a page is not worth requesting again (e.g. 404, 410); timeouts and throttling excluded"""
+    return 400 <= status < 500 and status not in (408, 425, 429)
+
+class ExtractionCache:
+    """
+    Persistent URL -> extraction result cache in a local SQLite file, so re-crawls and retried tasks
+    do not download the same pages again. Results are stored as zlib-compressed JSON.
+    Each thread uses its own connection.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, failure_ttl=FAILURE_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS extractions ("
+            "url TEXT PRIMARY KEY, status TEXT NOT NULL, word_count INTEGER, content BLOB, fetched_at REAL NOT NULL)"
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, url):
+        """
+        :return: Tuple of (status, result or None) for a fresh entry, or None if the URL is not cached or expired.
+        """
+        row = self._connection().execute(
+            "SELECT status, content, fetched_at FROM extractions WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        status, content, fetched_at = row
+        ttl = self.failure_ttl if status == STATUS_FAILED else self.ttl
+        if time.time() - fetched_at > ttl:
+            return None
+        return status, json.loads(zlib.decompress(content)) if content else None
+
+    def set(self, url, status, result):
+        content = zlib.compress(json.dumps(result).encode('utf-8')) if result else None
+        word_count = result['word_count'] if result else None
+        self._connection().execute(
+            "INSERT OR REPLACE INTO extractions (url, status, word_count, content, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            (url, status, word_count, content, time.time()),
+        )
+
+    def purge_expired(self):
+        """Delete entries older than the longest TTL"""
+        cutoff = time.time() - max(self.ttl, self.failure_ttl)
+        self._connection().execute("DELETE FROM extractions WHERE fetched_at < ?", (cutoff,))
+
+class DomainLimiter:
+    """Per-domain politeness: at most max_concurrent requests in flight and min_delay seconds between request starts"""
+
+    def __init__(self, max_concurrent=MAX_PER_DOMAIN, min_delay=DOMAIN_DELAY):
+        self.max_concurrent = max_concurrent
+        self.min_delay = min_delay
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_slot = {}
+
+    def acquire(self, domain):
+        with self._lock:
+            semaphore = self._semaphores.setdefault(domain, threading.BoundedSemaphore(self.max_concurrent))
+        semaphore.acquire()
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(domain, now))
+            self._next_slot[domain] = slot + self.min_delay
+        if slot > now:
+            time.sleep(slot - now)
+
+    def release(self, domain):
+        self._semaphores[domain].release()
+
+class ContentExtractionService:
+    """
+    Downloads and extracts article pages concurrently: one keep-alive session with a connection pool sized
+    to the worker pool, a bounded thread pool, per-domain politeness limits and a persistent result cache.
+    """
+
+    def __init__(self, extractor=None, cache=None, max_workers=MAX_WORKERS, limiter=None):
+        self.extractor = extractor or ContentExtractor()
+        self.cache = cache if cache is not None else ExtractionCache()
+        self.max_workers = max_workers
+        self.limiter = limiter or DomainLimiter()
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'Mozilla/5.0'})
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def extract(self, url, title):
+        """
+        Extract one article, from the cache when possible.
+        :return: Extraction result dictionary (see ContentExtractor.extract_from_html) or None.
+        """
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached[1]
+
+        domain = urlsplit(url).netloc.lower()
+        self.limiter.acquire(domain)
+        try:
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            html = response.text
+        except requests.RequestException as e:
+            logger.warning(f"Error downloading {url}: {e}")
+            status = getattr(e.response, 'status_code', None)
+            # A page that is gone stays gone; only transient failures are retried after FAILURE_CACHE_TTL
+            self.cache.set(url, STATUS_NO_CONTENT if status and is_permanent_failure(status) else STATUS_FAILED, None)
+            return None
+        finally:
+            self.limiter.release(domain)
+
+        try:
+            result = self.extractor.extract_from_html(html, title or '')
+        except Exception as e:
+            logger.error(f"Error extracting {url}: {e}")
+            result = None
+
+        self.cache.set(url, STATUS_OK if result else STATUS_NO_CONTENT, result)
+        return result
+
+    def extract_many(self, items):
+        """
+        Extract many articles concurrently.
+        :param items: Iterable of (url, title) pairs.
+        :return: Dictionary of url to extraction result or None.
+        """
+        items = list(dict(items).items())
+        if not items:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            results = executor.map(lambda item: self.extract(*item), items)
+            return {url: result for (url, _), result in zip(items, results)}
+
+    def rejected(self, url):
+        """True if the URL was downloaded before and has no article content, or is permanently unavailable"""
+        cached = self.cache.get(url)
+        return cached is not None and cached[0] == STATUS_NO_CONTENT
+
+    def close(self):
+        self.session.close()
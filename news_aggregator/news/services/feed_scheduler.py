@@ -0,0 +1,124 @@
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from news.models import Feed
+
+logger = logging.getLogger(__name__)
+
+MIN_POLL_INTERVAL = getattr(settings, 'FEED_MIN_POLL_INTERVAL', 5 * 60)
+MAX_POLL_INTERVAL = getattr(settings, 'FEED_MAX_POLL_INTERVAL', 24 * 3600)
+DEFAULT_POLL_INTERVAL = 30 * 60
+# A feed is polled often enough to find about this many new entries per poll
+TARGET_NEW_ENTRIES = 3
+QUIET_BACKOFF = 1.5
+FAILURE_BACKOFF = 2
+MAX_CONSECUTIVE_FAILURES = getattr(settings, 'FEED_MAX_CONSECUTIVE_FAILURES', 10)
+DISPATCH_BATCH_SIZE = getattr(settings, 'FEED_DISPATCH_BATCH_SIZE', 200)
+# Dispatched feeds are pushed this far into the future so the next beat does not dispatch them again
+CLAIM_TIMEOUT = 15 * 60
+JITTER = 0.1
+EMA_WEIGHT = 0.3
+
+def next_poll_interval(current_interval, new_entries=0, failed=False):
+    """
+    Seconds until the next poll of a feed.
+    Failing feeds back off exponentially, quiet feeds back off more gently, and feeds that published
+    new entries are polled at the interval expected to yield TARGET_NEW_ENTRIES entries per poll
+    (tightening at most 4x per poll). The result is clamped to [MIN_POLL_INTERVAL, MAX_POLL_INTERVAL].
+    """
+    current_interval = current_interval or DEFAULT_POLL_INTERVAL
+
+    if failed:
+        interval = current_interval * FAILURE_BACKOFF
+    elif new_entries <= 0:
+        interval = current_interval * QUIET_BACKOFF
+    else:
+        interval = max(current_interval * TARGET_NEW_ENTRIES / new_entries, current_interval / 4)
+
+    return int(min(max(interval, MIN_POLL_INTERVAL), MAX_POLL_INTERVAL))
+
+def moving_average(previous, value, weight=EMA_WEIGHT):
+    return value if previous is None else previous + weight * (value - previous)
+
+class FeedScheduler:
+    """
+    Decides when each feed is polled, based on how often it publishes and whether polls succeed.
+    dispatch_due_feeds runs on Celery beat, claims the feeds that are due and queues one poll_feed task per feed.
+    Claiming locks and reschedules the due rows in one transaction, so overlapping dispatch runs never
+    queue the same feed twice. The poll results are recorded here.
+    """
+
+    STATS_FIELDS = [
+        'poll_interval', 'next_poll_at', 'last_polled_at', 'consecutive_failures', 'success_count',
+        'error_count', 'avg_latency_ms', 'avg_new_entries', 'last_error', 'updated_at',
+    ]
+
+    def due_feeds(self, now=None, limit=DISPATCH_BATCH_SIZE):
+        """Active feeds whose next poll time has passed, most overdue (or never polled) first. Read-only."""
+        now = now or timezone.now()
+        return list(self._due(now).values_list('id', flat=True)[:limit])
+
+    def claim_due_feeds(self, now=None, limit=DISPATCH_BATCH_SIZE):
+        """
+        Atomically select the due feeds and push their next poll time CLAIM_TIMEOUT ahead.
+        Rows locked by a concurrent dispatch run are skipped, and the update re-checks that each feed is
+        still due, so every feed is returned to exactly one caller.
+        :return: Ids of the claimed feeds.
+        """
+        now = now or timezone.now()
+        with transaction.atomic():
+            feed_ids = list(
+                self._due(now).select_for_update(skip_locked=True).values_list('id', flat=True)[:limit]
+            )
+            due = Q(next_poll_at__isnull=True) | Q(next_poll_at__lte=now)
+            claimed = Feed.objects.filter(due, id__in=feed_ids)
+            claimed_ids = list(claimed.values_list('id', flat=True))
+            claimed.update(next_poll_at=now + timedelta(seconds=CLAIM_TIMEOUT))
+        return claimed_ids
+
+    def _due(self, now):
+        return (
+            Feed.objects.filter(is_active=True)
+            .filter(Q(next_poll_at__isnull=True) | Q(next_poll_at__lte=now))
+            .order_by(F('next_poll_at').asc(nulls_first=True))
+        )
+
+    def record_success(self, feed, new_entries, latency_ms, now=None):
+        """Update polling stats after a successful poll and schedule the next one"""
+        now = now or timezone.now()
+        feed.poll_interval = next_poll_interval(feed.poll_interval, new_entries)
+        feed.avg_new_entries = moving_average(feed.avg_new_entries, new_entries)
+        feed.avg_latency_ms = moving_average(feed.avg_latency_ms, latency_ms)
+        feed.success_count += 1
+        feed.consecutive_failures = 0
+        feed.last_error = None
+        self._schedule(feed, now)
+        feed.save(update_fields=self.STATS_FIELDS)
+
+    def record_failure(self, feed, error, latency_ms, now=None):
+        """Update polling stats after a failed poll; deactivate the feed after MAX_CONSECUTIVE_FAILURES"""
+        now = now or timezone.now()
+        feed.poll_interval = next_poll_interval(feed.poll_interval, failed=True)
+        feed.avg_latency_ms = moving_average(feed.avg_latency_ms, latency_ms)
+        feed.error_count += 1
+        feed.consecutive_failures += 1
+        feed.last_error = str(error)[:1000]
+        self._schedule(feed, now)
+
+        if feed.consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+            feed.is_active = False
+            logger.warning(f"Deactivating feed {feed.url} after {feed.consecutive_failures} consecutive failures: {feed.last_error}")
+
+        feed.save(update_fields=self.STATS_FIELDS + ['is_active'])
+
+    def _schedule(self, feed, now):
+        # Jitter spreads feeds that share an interval so they are not all due on the same beat
+        delay = feed.poll_interval * random.uniform(1 - JITTER, 1 + JITTER)
+        feed.last_polled_at = now
+        feed.next_poll_at = now + timedelta(seconds=delay)
@@ -0,0 +1,298 @@
+import logging
+from django.conf import settings
+from django.db import InterfaceError, OperationalError
+from news.models import Articles, Sources
+from news.repositories.keyword_repository import KeywordRepository
+from news.utils.url_canonicalizer import canonical_url, canonical_urls
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMAGE_URL = 'https://raw.githubusercontent.com/mMelnic/news-fake-detection/refs/heads/users/news_aggregator/newspaper_beige.jpg'
+ENRICHMENT_FIELDS = ["embedding", "is_fake", "fake_score", "sentiment", "model_version"]
+DB_BATCH_SIZE = 500
+
+# Ingestion runs as three Celery stages, each with its own queue, batch size and retry policy:
+#   store  - insert raw articles (fast, DB bound)
+#   enrich - embeddings and classifier predictions (slow, CPU bound, no DB writes)
+#   apply  - bulk update of enrichment results and duplicate links (fast, DB bound)
+# Override per stage with settings.NEWS_INGESTION_STAGES, e.g. {"enrich": {"batch_size": 64}}.
+# The queues are declared in news_aggregator/celery.py; a renamed queue must be added there too, or no worker consumes it.
+# Searches larger than the store stage's chunk_size are split into chunks stored in parallel.
+DEFAULT_INGESTION_STAGES = {
+    "store": {"queue": "ingest_store", "batch_size": 500, "chunk_size": 100, "max_retries": 3, "retry_backoff": 5},
+    "enrich": {"queue": "ingest_enrich", "batch_size": 32, "max_retries": 2, "retry_backoff": 30},
+    "apply": {"queue": "ingest_apply", "batch_size": 500, "max_retries": 5, "retry_backoff": 2},
+}
+INGESTION_STAGES = {
+    stage: {**defaults, **getattr(settings, 'NEWS_INGESTION_STAGES', {}).get(stage, {})}
+    for stage, defaults in DEFAULT_INGESTION_STAGES.items()
+}
+RETRYABLE_ERRORS = (OperationalError, InterfaceError, ConnectionError, TimeoutError)
+
+def stage_task_options(stage):
+    """Celery task options (queue and retry policy) for an ingestion stage"""
+    config = INGESTION_STAGES[stage]
+    return {
+        "queue": config["queue"],
+        "autoretry_for": RETRYABLE_ERRORS,
+        "max_retries": config["max_retries"],
+        "retry_backoff": config["retry_backoff"],
+        "retry_jitter": True,
+    }
+
+class ArticleIngestionService:
+    """
+    Set-based article ingestion: a batch of normalized articles is stored with a constant number of queries
+    (existing-URL lookup, source upsert, article insert), and NLP enrichment is applied afterwards with one
+    bulk update, outside of the insert transaction.
+    """
+
+    def __init__(self, embedding_model=None, nlp_service=None, dedup=None):
+        self.embedding_model = embedding_model
+        self.nlp_service = nlp_service
+        self.dedup = dedup
+        self.keyword_repo = KeywordRepository()
+
+    def store_raw(self, normalized_articles):
+        """
+        Insert articles that are not stored yet, deduplicated by canonical URL. Only touches the database;
+        call resolve_canonical_urls first (outside any transaction) to key wrapped links by the publisher URL.
+        :param normalized_articles: Dictionaries produced by normalize_article.
+        :return: List of the newly created Articles, with primary keys.
+        """
+        by_url = {}
+        for art in normalized_articles:
+            key = self._canonical_url(art)
+            if key and key not in by_url:
+                by_url[key] = art
+        if not by_url:
+            return []
+
+        existing_urls = set(Articles.objects.filter(canonical_url__in=list(by_url)).values_list("canonical_url", flat=True))
+        new_articles = [art for url, art in by_url.items() if url not in existing_urls]
+        if not new_articles:
+            return []
+
+        sources = self.get_or_create_sources(new_articles)
+
+        Articles.objects.bulk_create(
+            [self._build_article(art, sources.get(art["source_url"])) for art in new_articles],
+            ignore_conflicts=True,
+            batch_size=DB_BATCH_SIZE,
+        )
+
+        # ignore_conflicts does not return primary keys, so read the rows back in one query
+        return list(
+            Articles.objects.filter(canonical_url__in=[art["canonical_url"] for art in new_articles]).select_related("source")
+        )
+
+    def link_keywords(self, normalized_articles):
+        """
+        Link the search keywords of a batch to its articles, new and previously stored ones alike.
+        :return: Number of (article, keyword) pairs submitted.
+        """
+        keywords_by_url = {
+            self._canonical_url(art): art.get("keywords") or [] for art in normalized_articles if art["url"]
+        }
+        if not any(keywords_by_url.values()):
+            return 0
+
+        ids_by_url = dict(
+            Articles.objects.filter(canonical_url__in=list(keywords_by_url)).values_list("canonical_url", "id")
+        )
+        return self.keyword_repo.link_keywords({
+            ids_by_url[url]: keywords for url, keywords in keywords_by_url.items() if url in ids_by_url
+        })
+
+    def get_or_create_sources(self, normalized_articles):
+        """
+        Bulk get-or-create of the sources referenced by a batch.
+        :return: Dictionary of source URL to Sources.
+        """
+        names = {}
+        for art in normalized_articles:
+            if art["source_url"] and art["source_url"] not in names:
+                names[art["source_url"]] = art["source_name"] or ""
+        if not names:
+            return {}
+
+        Sources.objects.bulk_create(
+            [Sources(url=url, name=name) for url, name in names.items()],
+            ignore_conflicts=True,
+            batch_size=DB_BATCH_SIZE,
+        )
+        return {source.url: source for source in Sources.objects.filter(url__in=list(names))}
+
+    def enrich(self, articles):
+        """
+        Compute embeddings and NLP predictions for a batch of articles in memory. Nothing is written to the database.
+        :return: The same articles with enrichment fields set.
+        """
+        if not articles:
+            return articles
+
+        texts = [f"{article.title} {article.content}" for article in articles]
+
+        if self.embedding_model:
+            try:
+                embeddings = self.embedding_model.encode(texts, batch_size=32)
+                for article, text, embedding in zip(articles, texts, embeddings):
+                    if text.strip():
+                        article.embedding = embedding.tolist()
+            except Exception as e:
+                logger.error(f"Embedding error for batch of {len(articles)} articles: {e}")
+
+        if self.nlp_service:
+            try:
+                predictions = self.nlp_service.predict_batch(texts)
+                for article, pred in zip(articles, predictions):
+                    if isinstance(pred, dict):
+                        article.is_fake = pred.get("is_fake")
+                        article.sentiment = pred.get("sentiment")
+                        article.fake_score = 1.0 if article.is_fake else 0.0
+                        article.model_version = pred.get("model_version")
+            except Exception as e:
+                logger.error(f"NLP error for batch of {len(articles)} articles: {e}")
+
+        return articles
+
+    def enrich_deduplicated(self, articles):
+        """
+        Enrich a batch, computing embeddings and predictions only for canonical articles.
+        Near-duplicates (found by the dedup detector) are linked to their canonical article and reuse its
+        enrichment; the apply stage writes the links and copies the enrichment, so nothing is written here.
+        :return: Tuple of (canonical articles with enrichment fields set, duplicates with canonical_article_id set).
+        """
+        if self.dedup is None:
+            return self.enrich(articles), []
+
+        linked = [article for article in articles if article.canonical_article_id is not None]
+        originals, duplicates = self.dedup.link_duplicates([article for article in articles if article.canonical_article_id is None])
+        if duplicates:
+            logger.info(f"Found {len(duplicates)} near-duplicates of existing stories in a batch of {len(articles)} articles")
+
+        return self.enrich(originals), duplicates + linked
+
+    def link_duplicates(self, links):
+        """
+        Write duplicate links and copy each duplicate's enrichment from its canonical article. The canonical is
+        read after the link is written, so one enriched later reaches the duplicate through propagate_to_duplicates.
+        :param links: Dictionaries with the id and canonical_article_id of each duplicate.
+        :return: Number of duplicates that received enrichment.
+        """
+        if not links:
+            return 0
+        duplicates = [Articles(id=link["id"], canonical_article_id=link["canonical_article_id"]) for link in links]
+        Articles.objects.bulk_update(duplicates, ["canonical_article"], batch_size=DB_BATCH_SIZE)
+
+        copied = self.copy_enrichment(duplicates)
+        self.save_enrichment(copied)
+        if len(copied) < len(duplicates):
+            logger.info(f"{len(duplicates) - len(copied)} duplicates wait for the enrichment of their canonical article")
+        return len(copied)
+
+    def copy_enrichment(self, duplicates):
+        """
+        Copy enrichment fields from each duplicate's canonical article, read from the database.
+        :return: The duplicates whose canonical article had enrichment to copy.
+        """
+        ids = {article.canonical_article_id for article in duplicates}
+        canonicals = {article.id: article for article in Articles.objects.filter(id__in=ids).only("id", *ENRICHMENT_FIELDS)}
+
+        copied = []
+        for article in duplicates:
+            canonical = canonicals.get(article.canonical_article_id)
+            if canonical is None or not self._has_enrichment(canonical):
+                continue
+            for field in ENRICHMENT_FIELDS:
+                setattr(article, field, getattr(canonical, field))
+            copied.append(article)
+        return copied
+
+    def propagate_to_duplicates(self, results):
+        """
+        Give duplicates whose canonical article was enriched later (in another batch) the canonical's enrichment.
+        :return: Number of updated duplicates.
+        """
+        by_id = {result["id"]: result for result in results if any(result.get(field) is not None for field in ENRICHMENT_FIELDS)}
+        if len(by_id) < len(results):
+            # Enrichment failed for these canonicals (see enrich), so their duplicates have nothing to receive
+            logger.warning(f"{len(results) - len(by_id)} articles were applied without enrichment; their duplicates stay unenriched")
+        pending = Articles.objects.filter(canonical_article_id__in=list(by_id), embedding__isnull=True).values_list("id", "canonical_article_id")
+        duplicates = [
+            Articles(id=article_id, **{field: by_id[canonical_id].get(field) for field in ENRICHMENT_FIELDS})
+            for article_id, canonical_id in pending
+        ]
+        self.save_enrichment(duplicates)
+        return len(duplicates)
+
+    def save_enrichment(self, articles):
+        """Write enrichment fields of already-stored articles with a single bulk update"""
+        if articles:
+            Articles.objects.bulk_update(articles, ENRICHMENT_FIELDS, batch_size=DB_BATCH_SIZE)
+
+    def serialize_enrichment(self, articles, duplicates=()):
+        """
+        Enrichment fields of a batch as plain data, so they can be passed between Celery stages.
+        Duplicates are passed as links to their canonical article; the apply stage copies the enrichment.
+        """
+        return [
+            {"id": article.id, **{field: self._plain(getattr(article, field)) for field in ENRICHMENT_FIELDS}}
+            for article in articles
+        ] + [
+            {"id": article.id, "canonical_article_id": article.canonical_article_id}
+            for article in duplicates
+        ]
+
+    def apply_enrichment(self, results):
+        """
+        Bulk-apply the output of serialize_enrichment: the enrichment of canonical articles first, then the
+        duplicate links, which copy it.
+        :return: Number of updated articles.
+        """
+        enriched = [result for result in results if "canonical_article_id" not in result]
+        links = [result for result in results if "canonical_article_id" in result]
+        self.save_enrichment([
+            Articles(id=result["id"], **{field: result.get(field) for field in ENRICHMENT_FIELDS})
+            for result in enriched
+        ])
+        self.propagate_to_duplicates(enriched)
+        return len(enriched) + self.link_duplicates(links)
+
+    def resolve_canonical_urls(self, normalized_articles):
+        """
+        Set the canonical URL of every article of a batch, resolving redirect wrappers concurrently.
+        May make network requests, so it must not run inside a transaction.
+        """
+        articles = [art for art in normalized_articles if art["url"]]
+        for art, key in zip(articles, canonical_urls([art["url"] for art in articles])):
+            art["canonical_url"] = key
+
+    def _canonical_url(self, art):
+        if not art.get("canonical_url") and art["url"]:
+            art["canonical_url"] = canonical_url(art["url"], resolve=False)
+        return art.get("canonical_url")
+
+    def _has_enrichment(self, article):
+        return any(getattr(article, field) is not None for field in ENRICHMENT_FIELDS)
+
+    def _plain(self, value):
+        return value.tolist() if hasattr(value, "tolist") else value
+
+    def _build_article(self, art, source):
+        return Articles(
+            title=art["title"],
+            url=art["url"],
+            canonical_url=art["canonical_url"],
+            content=art["content"],
+            author=art["author"],
+            image_url=art["image_url"] or DEFAULT_IMAGE_URL,
+            source=source,
+            published_date=art["published_date"],
+            language=art["language"],
+            country=art["country"],
+            categories=art["categories"],
+            is_fake=art["is_fake"],
+            sentiment=art["sentiment"],
+            fake_score=art["fake_score"],
+        )
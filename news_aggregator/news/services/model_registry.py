@@ -0,0 +1,168 @@
+import gc
+import json
+import logging
+import os
+import threading
+import time
+import torch
+from transformers import AutoTokenizer
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = os.path.join(settings.BASE_DIR, 'nlp/outputs')
+MODEL_PATH = os.path.join(MODEL_DIR, 'second_multi_task_model_state_dict.pt')
+LABEL_MAPS_PATH = os.path.join(MODEL_DIR, 'label_maps.json')
+CLASS_WEIGHTS_PATH = os.path.join(MODEL_DIR, 'class_weights.json')
+BUNDLE_ROOT = getattr(settings, 'NLP_BUNDLE_ROOT', os.path.join(MODEL_DIR, 'bundles'))
+REFRESH_INTERVAL = getattr(settings, 'NLP_MODEL_REFRESH_INTERVAL', 30)
+LEGACY_VERSION = "legacy"
+
+class LoadedModel:
+    """An immutable snapshot of one model version. Requests keep using the snapshot they started with."""
+
+    def __init__(self, version, model, tokenizer, label_maps):
+        self.version = version
+        self.model = model
+        self.tokenizer = tokenizer
+        self.label_maps = label_maps
+        self.loaded_at = time.time()
+
+def load_bundle_version(version, device):
+    """Load an exported inference bundle from BUNDLE_ROOT/<version>"""
+    from nlp.models.bundle import load_bundle
+
+    model, tokenizer, manifest = load_bundle(os.path.join(BUNDLE_ROOT, version), device=device)
+    label_maps = {
+        task: {int(k): v for k, v in mapping.items()}
+        for task, mapping in manifest["label_maps"].items()
+    }
+    return LoadedModel(manifest["version"], model, tokenizer, label_maps)
+
+def load_legacy_model(device):
+    """Load the raw training state dict used before inference bundles existed"""
+    with open(LABEL_MAPS_PATH, 'r') as f:
+        raw_label_maps = json.load(f)
+
+    label_maps = {
+        task: {int(k): v for k, v in mapping.items()}
+        for task, mapping in raw_label_maps.items()
+    }
+
+    with open(CLASS_WEIGHTS_PATH, 'r') as f:
+        class_weights = json.load(f)
+
+    # Define all task classes
+    task_classes = {
+        "sentiment_analysis": 2,
+        "fake_news_detection": 2,
+        "topic_classification": len(class_weights.get("topic_classification", {}))
+    }
+
+    # Import here to avoid circular imports
+    from nlp.models.lightning_model import LightningMultiTaskModel
+
+    # Initialize model with all three heads to match the state dict
+    model = LightningMultiTaskModel(
+        model_name="distilroberta-base",
+        task_heads_config=task_classes,
+        class_weights=class_weights
+    )
+
+    # Load state dict with strict=False to allow missing or unexpected keys
+    state_dict = torch.load(MODEL_PATH, map_location=device)
+    model.load_state_dict(state_dict, strict=False)
+    model.eval()
+    model.to(device)
+
+    tokenizer = AutoTokenizer.from_pretrained("distilroberta-base")
+    return LoadedModel(LEGACY_VERSION, model, tokenizer, label_maps)
+
+class ModelRegistry:
+    """
+    Holds the model version currently served by this process and swaps in new versions without a restart.
+    New versions are loaded on a background thread while the old one keeps serving, then the reference
+    is replaced atomically. The old version is released once in-flight requests drop their snapshot.
+    The version to serve is read from BUNDLE_ROOT/CURRENT (see the activate_model command), checked at most
+    every REFRESH_INTERVAL seconds.
+    """
+
+    def __init__(self, device=None, refresh_interval=REFRESH_INTERVAL):
+        self.device = device or torch.device("cpu")
+        self.refresh_interval = refresh_interval
+        self._current = None
+        self._lock = threading.Lock()
+        self._loading_version = None
+        self._last_checked = 0.0
+
+    def current(self):
+        """Return the LoadedModel snapshot currently being served, or None"""
+        return self._current
+
+    def load_initial(self):
+        """Synchronously load the active version (or the legacy model if no bundle is active)"""
+        from nlp.models.bundle import read_current_version
+
+        version = read_current_version(BUNDLE_ROOT)
+        loaded = load_bundle_version(version, self.device) if version else load_legacy_model(self.device)
+        self._swap(loaded)
+        self._last_checked = time.monotonic()
+        return loaded
+
+    def refresh(self, force=False):
+        """
+        Start loading the active version in the background if it differs from the served one.
+        Cheap enough to call on every prediction: it only stats the pointer file once per refresh_interval.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_checked < self.refresh_interval:
+            return
+        self._last_checked = now
+
+        from nlp.models.bundle import read_current_version
+
+        version = read_current_version(BUNDLE_ROOT)
+        current = self._current
+        if not version or (current is not None and current.version == version):
+            return
+        self.load_async(version)
+
+    def load_async(self, version):
+        """Load a bundle version on a background thread and swap it in when ready"""
+        with self._lock:
+            if self._loading_version == version:
+                return None
+            self._loading_version = version
+
+        thread = threading.Thread(target=self._load_and_swap, args=(version,), name=f"model-load-{version}", daemon=True)
+        thread.start()
+        return thread
+
+    def _load_and_swap(self, version):
+        started = time.perf_counter()
+        try:
+            loaded = load_bundle_version(version, self.device)
+            self._swap(loaded)
+            logger.info(f"Swapped in NLP model version {loaded.version} after {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            logger.error(f"Failed to load NLP model version {version}, keeping the current one: {e}")
+        finally:
+            with self._lock:
+                if self._loading_version == version:
+                    self._loading_version = None
+
+    def _swap(self, loaded):
+        with self._lock:
+            previous = self._current
+            self._current = loaded
+        if previous is not None and previous is not loaded:
+            version = previous.version
+            # Drop the registry's reference; requests still holding the snapshot keep it alive until they finish
+            del previous
+            self._unload(version)
+
+    def _unload(self, version):
+        logger.info(f"Unloading NLP model version {version}")
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
@@ -1,17 +1,9 @@
-import os
 import torch
-import json
 import logging
-from transformers import AutoTokenizer
-from django.conf import settings
+from news.services.model_registry import ModelRegistry
 
 logger = logging.getLogger(__name__)
 
-MODEL_DIR = os.path.join(settings.BASE_DIR, 'nlp/outputs')
-MODEL_PATH = os.path.join(MODEL_DIR, 'second_multi_task_model_state_dict.pt')
-LABEL_MAPS_PATH = os.path.join(MODEL_DIR, 'label_maps.json')
-CLASS_WEIGHTS_PATH = os.path.join(MODEL_DIR, 'class_weights.json')
-
 class NLPPredictionService:
     _instance = None
     
@@ -26,9 +18,7 @@ class NLPPredictionService:
             return
             
         self.device = torch.device("cpu")
-        self.model = None
-        self.tokenizer = None
-        self.label_maps = None
+        self.registry = ModelRegistry(device=self.device)
         
         try:
             self._load_model()
@@ -42,48 +32,36 @@ class NLPPredictionService:
         logger.info("Loading NLP prediction model and resources...")
         
         try:
-            with open(LABEL_MAPS_PATH, 'r') as f:
-                raw_label_maps = json.load(f)
-                
-            self.label_maps = {
-                task: {int(k): v for k, v in mapping.items()}
-                for task, mapping in raw_label_maps.items()
-            }
-            
-            with open(CLASS_WEIGHTS_PATH, 'r') as f:
-                class_weights = json.load(f)
-                
-            # Define all task classes
-            task_classes = {
-                "sentiment_analysis": 2,
-                "fake_news_detection": 2,
-                "topic_classification": len(class_weights.get("topic_classification", {}))
-            }
-            
-            # Import here to avoid circular imports
-            from nlp.models.lightning_model import LightningMultiTaskModel
-            
-            # Initialize model with all three heads to match the state dict
-            self.model = LightningMultiTaskModel(
-                model_name="distilroberta-base",
-                task_heads_config=task_classes,
-                class_weights=class_weights
-            )
-            
-            # Load state dict with strict=False to allow missing or unexpected keys
-            state_dict = torch.load(MODEL_PATH, map_location=self.device)
-            self.model.load_state_dict(state_dict, strict=False)
-            self.model.eval()
-            self.model.to(self.device)
-            
-            # Load tokenizer
-            self.tokenizer = AutoTokenizer.from_pretrained("distilroberta-base")
-            
-            logger.info("NLP model loaded successfully")
-            
+            loaded = self.registry.load_initial()
+            logger.info(f"NLP model version {loaded.version} loaded successfully")
         except Exception as e:
             logger.error(f"Error loading NLP model: {str(e)}")
             raise
+
+    @property
+    def model(self):
+        loaded = self.registry.current()
+        return loaded.model if loaded else None
+
+    @property
+    def tokenizer(self):
+        loaded = self.registry.current()
+        return loaded.tokenizer if loaded else None
+
+    @property
+    def label_maps(self):
+        loaded = self.registry.current()
+        return loaded.label_maps if loaded else None
+
+    @property
+    def model_version(self):
+        loaded = self.registry.current()
+        return loaded.version if loaded else None
+
+    def _snapshot(self):
+        """Pick up a newly activated model version (loaded in the background) and return the one to use now"""
+        self.registry.refresh()
+        return self.registry.current()
     
     def predict_batch(self, texts, tasks=None):
         """
@@ -94,11 +72,11 @@ class NLPPredictionService:
             tasks: List of task names to run. Defaults to fake news detection and sentiment.
             
         Returns:
-            List of dictionaries with predictions for each text
+            List of dictionaries with predictions for each text, including the model_version that produced them
         """
         if not self._initialized:
             logger.warning("NLP model not initialized, returning empty predictions")
-            return [{"is_fake": None, "sentiment": None} for _ in texts]
+            return [{"is_fake": None, "sentiment": None, "model_version": None} for _ in texts]
             
         if not texts:
             return []
@@ -107,6 +85,9 @@ class NLPPredictionService:
         if tasks is None:
             tasks = ["fake_news_detection", "sentiment_analysis"]
             
+        # The whole batch runs on one snapshot, even if a new version is swapped in meanwhile
+        loaded = self._snapshot()
+
         try:
             # Filter out non-English content
             filtered_texts = []
@@ -122,13 +103,14 @@ class NLPPredictionService:
             
             results = [{
                 "is_fake": None,
-                "sentiment": None
+                "sentiment": None,
+                "model_version": loaded.version
             } for _ in texts]
             
             if not filtered_texts:
                 return results
                 
-            encoded = self.tokenizer(
+            encoded = loaded.tokenizer(
                 filtered_texts,
                 padding=True,
                 truncation=True,
@@ -143,7 +125,7 @@ class NLPPredictionService:
                         continue
                         
                     try:
-                        logits = self.model(
+                        logits = loaded.model(
                             encoded["input_ids"],
                             encoded["attention_mask"],
                             task_name=task
@@ -151,8 +133,8 @@ class NLPPredictionService:
                         pred_ids = torch.argmax(logits, dim=1).cpu().tolist()
                         
                         # Map predictions to labels
-                        if task in self.label_maps:
-                            preds = [self.label_maps[task][i] for i in pred_ids]
+                        if task in loaded.label_maps:
+                            preds = [loaded.label_maps[task][i] for i in pred_ids]
                         else:
                             preds = pred_ids
                             
@@ -172,7 +154,7 @@ class NLPPredictionService:
         except Exception as e:
             logger.error(f"Error in NLP prediction: {str(e)}")
             logger.exception("Full traceback:")
-            return [{"is_fake": None, "sentiment": None} for _ in texts]
+            return [{"is_fake": None, "sentiment": None, "model_version": None} for _ in texts]
             
     def is_ready(self):
         """Check if the model is initialized and ready for prediction"""
@@ -199,8 +181,10 @@ class NLPPredictionService:
             logger.warning("Text is unlikely to be English.")
             return None
 
+        loaded = self._snapshot()
+
         try:
-            encoded = self.tokenizer(
+            encoded = loaded.tokenizer(
                 text[:2000],  # Limit long input
                 padding=True,
                 truncation=True,
@@ -210,14 +194,14 @@ class NLPPredictionService:
 
             # Run model for topic classification
             with torch.no_grad():
-                logits = self.model(
+                logits = loaded.model(
                     encoded["input_ids"],
                     encoded["attention_mask"],
                     task_name="topic_classification"
                 )
                 pred_id = torch.argmax(logits, dim=1).item()
 
-            label_map = self.label_maps.get("topic_classification", {})
+            label_map = loaded.label_maps.get("topic_classification", {})
             return label_map.get(pred_id, None)
 
         except Exception as e:
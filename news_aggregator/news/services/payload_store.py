@@ -0,0 +1,54 @@
+import json
+import logging
+import uuid
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+# Payloads only need to outlive the tasks (and retries) that read them
+PAYLOAD_TTL = getattr(settings, 'NEWS_PAYLOAD_TTL', 3600)
+
+class PayloadMissing(Exception):
+    pass
+
+class PayloadStore:
+    """
+    Large task arguments and results (article lists) kept out of the Celery broker and result backend.
+    A payload is stored once as zlib-compressed JSON in the cache (Redis) and tasks exchange only its key.
+    """
+
+    def __init__(self, ttl=PAYLOAD_TTL):
+        self.ttl = ttl
+
+    def put(self, items, prefix='payload'):
+        """
+        :return: Key of the stored payload.
+        """
+        key = f"{prefix}:{uuid.uuid4().hex}"
+        data = zlib.compress(json.dumps(items, cls=DjangoJSONEncoder).encode('utf-8'))
+        cache.set(key, data, timeout=self.ttl)
+        logger.debug(f"Stored payload {key}: {len(items)} items, {len(data)} bytes")
+        return key
+
+    def put_chunks(self, items, chunk_size, prefix='payload'):
+        """
+        Store a list as consecutive chunks of at most chunk_size items, so each can be processed by its own task.
+        :return: List of keys, in order.
+        """
+        return [self.put(items[i:i + chunk_size], prefix) for i in range(0, len(items), chunk_size)]
+
+    def get(self, key):
+        """
+        :raises PayloadMissing: If the payload expired or was deleted.
+        """
+        data = cache.get(key)
+        if data is None:
+            raise PayloadMissing(f"Payload {key} not found or expired")
+        return json.loads(zlib.decompress(data))
+
+    def delete(self, key):
+        cache.delete(key)
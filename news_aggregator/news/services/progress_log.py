@@ -0,0 +1,132 @@
+import json
+import logging
+
+import redis
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from news.utils.storage import redis_client
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_TTL = getattr(settings, 'NEWS_TASK_PROGRESS_TTL', 3600)
+DEFAULT_IMAGE_URL = 'https://raw.githubusercontent.com/mMelnic/news-fake-detection/refs/heads/users/news_aggregator/newspaper_beige.jpg'
+
+def task_group(task_id):
+    """Channels group that receives the progress events of a task"""
+    return f"task_{task_id}"
+
+def publish_task_event(task_id, event_type, **payload):
+    """
+    Push a progress event to WebSocket subscribers of a task (see TaskProgressConsumer).
+    Best effort: without a channel layer or subscribers, clients still have the polling endpoint.
+    :param event_type: 'task.progress' (a batch of articles) or 'task.status'.
+    """
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(task_group(task_id), {'type': event_type, 'task_id': task_id, **payload})
+    except Exception as e:
+        logger.warning(f"Could not publish {event_type} for task {task_id}: {e}")
+
+def article_summary(article):
+    """Article fields shown in search results while a task is running (no content)"""
+    return {
+        'id': article.id,
+        'title': article.title,
+        'author': article.author,
+        'url': article.url,
+        'image_url': article.image_url or DEFAULT_IMAGE_URL,
+        'source': article.source.name if article.source else 'Unknown',
+        'published_date': article.published_date,
+        'country': article.country,
+        'language': article.language,
+        'categories': article.categories,
+        'is_fake': article.is_fake,
+        'sentiment': article.sentiment,
+    }
+
+class TaskProgressLog:
+    """
+    Append-only progress of an ingestion task in Redis: a list of summaries of the articles stored so far
+    and a small status hash. Each batch appends only its own articles, and readers ask for the entries
+    after the offset they already have, so both sides do work proportional to the new articles.
+    Every append and status change is also pushed to the task's Channels group.
+    Chunk tasks of one search append to the same log, and search tasks record their formatted results, so
+    subscribers connecting late can catch up. Redis failures are logged and never fail ingestion.
+    """
+
+    def __init__(self, task_id, client=redis_client, ttl=PROGRESS_TTL):
+        self.task_id = task_id
+        self.client = client
+        self.ttl = ttl
+        self.items_key = f"task_progress:{task_id}:articles"
+        self.status_key = f"task_progress:{task_id}:status"
+
+    def append(self, articles):
+        """Add summaries of newly stored articles and mark the task as processing"""
+        self.append_summaries([article_summary(article) for article in articles])
+
+    def append_summaries(self, summaries):
+        """Add already formatted article dictionaries (e.g. search results that are not stored) to the log"""
+        items = [json.dumps(summary, cls=DjangoJSONEncoder) for summary in summaries]
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            if items:
+                pipe.rpush(self.items_key, *items)
+            pipe.hset(self.status_key, 'status', 'processing')
+            pipe.hincrby(self.status_key, 'stored', len(items))
+            pipe.expire(self.items_key, self.ttl)
+            pipe.expire(self.status_key, self.ttl)
+            results = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not record progress of task {self.task_id}: {e}")
+            return
+
+        if not items:
+            return
+        # The list length after the push tells where this batch starts, so subscribers can skip what they already have
+        length, stored = results[0], results[2]
+        publish_task_event(
+            self.task_id,
+            'task.progress',
+            articles=[json.loads(item) for item in items],
+            offset=length - len(items),
+            stored=stored,
+        )
+
+    def finish(self, status='completed'):
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.hset(self.status_key, 'status', status)
+            pipe.expire(self.status_key, self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not record progress of task {self.task_id}: {e}")
+        publish_task_event(self.task_id, 'task.status', status=status)
+
+    def read(self, offset=0):
+        """
+        :return: Dictionary with the task status ('pending' before anything was stored), the article
+                 summaries from offset on, the offset to continue from and the number of stored articles;
+                 or None if Redis is unavailable.
+        """
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.hgetall(self.status_key)
+            pipe.lrange(self.items_key, offset, -1)
+            status, items = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not read progress of task {self.task_id}: {e}")
+            return None
+
+        status = {key.decode(): value.decode() for key, value in status.items()}
+        return {
+            'status': status.get('status', 'pending'),
+            'articles': [json.loads(item) for item in items],
+            'offset': offset + len(items),
+            'stored': int(status.get('stored', 0)),
+        }
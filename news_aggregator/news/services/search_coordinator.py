@@ -0,0 +1,76 @@
+import hashlib
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from news.fetchers.provider_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# How long a started search is shared with identical requests
+SINGLE_FLIGHT_TTL = getattr(settings, 'NEWS_SEARCH_SINGLE_FLIGHT_TTL', 120)
+# Upper bound on starting a search (provider fan-out plus task dispatch); the lock expires after it
+LOCK_TIMEOUT = 30
+WAIT_INTERVAL = 0.1
+
+class SearchSingleFlight:
+    """
+    Collapses concurrent identical searches into one.
+    The first request for a (search type, normalized query, language, country) takes a cache lock, runs the
+    provider fan-out and starts the ingestion task, then publishes the task id under a shared key. Requests
+    arriving while the lock is held wait for that key; later ones read it directly. All of them return the
+    same task id and therefore poll the same progress.
+    """
+
+    def __init__(self, ttl=SINGLE_FLIGHT_TTL, lock_timeout=LOCK_TIMEOUT):
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+
+    def key(self, search_type, query, language=None, country=None):
+        normalized = '|'.join([search_type, normalize_query(query), (language or '').lower(), (country or '').lower()])
+        return f"search_flight:{hashlib.sha1(normalized.encode('utf-8')).hexdigest()}"
+
+    def run(self, key, start):
+        """
+        :param key: Shared key from key().
+        :param start: Zero-argument callable that starts the search and returns a JSON-serializable dictionary
+                      with at least 'task_id'.
+        :return: Tuple of (result dictionary, True if an existing search was joined).
+        """
+        existing = cache.get(key)
+        if existing:
+            return existing, True
+
+        token = uuid.uuid4().hex
+        lock_key = f"{key}:lock"
+        if cache.add(lock_key, token, timeout=self.lock_timeout):
+            try:
+                result = start()
+                cache.set(key, result, timeout=self.ttl)
+                return result, False
+            finally:
+                if cache.get(lock_key) == token:
+                    cache.delete(lock_key)
+
+        existing = self.wait_for(key)
+        if existing:
+            return existing, True
+
+        # The leader failed or took too long; do not leave this request without a result
+        logger.warning(f"Single-flight leader for {key} did not publish a task, starting the search separately")
+        return start(), False
+
+    def wait_for(self, key):
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            existing = cache.get(key)
+            if existing:
+                return existing
+            if cache.get(f"{key}:lock") is None:
+                # The leader gave up without publishing
+                return cache.get(key)
+            time.sleep(WAIT_INTERVAL)
+        return None
@@ -1,11 +1,19 @@
-from celery import shared_task
+from celery import chain, chord, shared_task
+from celery.utils import uuid as celery_uuid
 from pgvector.django import CosineDistance
-from .models import Articles, UserInteraction, Recommendation, Sources, Keyword
+from .models import Articles, Feed, UserInteraction, Recommendation, Sources, Keyword
 from django.contrib.auth import get_user_model
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from news.services.nlp_service import NLPPredictionService
+from news.services.dedup_service import NearDuplicateDetector
+from news.services.feed_scheduler import FeedScheduler
+from news.services.ingestion_service import INGESTION_STAGES, ArticleIngestionService, stage_task_options
+from news.services.payload_store import PayloadStore
+from news.services.progress_log import TaskProgressLog
+from news.utils.url_canonicalizer import canonical_url
 import logging
+import time
 import traceback
 from django.db import transaction
 from datetime import datetime
@@ -24,6 +32,7 @@ except Exception as e:
 
 DEFAULT_IMAGE_URL = 'https://raw.githubusercontent.com/mMelnic/news-fake-detection/refs/heads/users/news_aggregator/newspaper_beige.jpg'
 nlp_service = NLPPredictionService()
+payload_store = PayloadStore()
 
 def normalize_article(article, source_name=None, source_url=None, default_language=None, default_country=None):
     """Normalize article fields across different sources."""
@@ -72,6 +81,7 @@ def normalize_article(article, source_name=None, source_url=None, default_langua
     return {
         "title": title,
         "url": url,
+        "canonical_url": canonical_url(url, resolve=False) if url else "",  # Wrappers are resolved in bulk by store_raw
         "content": content,
         "published_date": published_at,
         "author": author,
@@ -87,14 +97,38 @@ def normalize_article(article, source_name=None, source_url=None, default_langua
     }
 
 
-from django.core.cache import cache
-
-@shared_task(bind=True)
-def process_and_store_articles(self, raw_articles, language=None, country=None, extracted_terms=None, extracted_phrases=None):
+def start_article_ingestion(raw_articles, language=None, country=None, extracted_terms=None, extracted_phrases=None):
+    """
+    Start the store stage for a search's raw articles. The articles go to the payload store in chunks and
+    only their keys travel through the broker. A single chunk is stored by one task; larger searches run
+    as a chord of chunk tasks spread over the store workers, gathered by finish_article_ingestion.
+    :return: Id of the task to poll.
+    """
+    keys = payload_store.put_chunks(raw_articles, INGESTION_STAGES["store"]["chunk_size"], prefix="ingest")
+    if len(keys) <= 1:
+        key = keys[0] if keys else payload_store.put([], prefix="ingest")
+        task = process_and_store_articles.delay(key, language, country, extracted_terms, extracted_phrases)
+        return task.id
+
+    task_id = celery_uuid()
+    chord(
+        process_and_store_articles.s(key, language, country, extracted_terms, extracted_phrases, progress_id=task_id)
+        for key in keys
+    )(finish_article_ingestion.s(task_id).set(task_id=task_id))
+    logger.info(f"Ingesting {len(raw_articles)} articles as {len(keys)} chunks under task {task_id}")
+    return task_id
+
+@shared_task(bind=True, **stage_task_options("store"))
+def process_and_store_articles(self, payload_key, language=None, country=None, extracted_terms=None, extracted_phrases=None, progress_id=None):
+    """
+    Store stage of ingestion: insert raw articles right away and hand enrichment to the enrich/apply stages.
+    :param payload_key: Payload store key of the raw articles.
+    :param progress_id: Task id of the whole search when this task stores one of its chunks.
+    """
     extracted_terms = extracted_terms or []
     extracted_phrases = extracted_phrases or []
-    task_id = self.request.id
-    redis_key = f"articles_task:{task_id}"
+    raw_articles = payload_store.get(payload_key)
+    progress = TaskProgressLog(progress_id or self.request.id)
 
     normalized = []
     for article in raw_articles:
@@ -102,71 +136,102 @@ def process_and_store_articles(self, raw_articles, language=None, country=None,
         norm['keywords'] = extracted_terms + extracted_phrases
         normalized.append(norm)
 
-    stored_ids = []
+    ingestion = ArticleIngestionService()
+    # Redirect wrappers are resolved over the network, so before any transaction is opened
+    ingestion.resolve_canonical_urls(normalized)
 
-    batch_size = 20
+    stored_ids = []
+    batch_size = INGESTION_STAGES["store"]["batch_size"]
     for i in range(0, len(normalized), batch_size):
         batch = normalized[i:i + batch_size]
-
         with transaction.atomic():
-            for art in batch:
-                if not art["url"] or Articles.objects.filter(url=art["url"]).exists():
-                    continue
-
-                source_obj, _ = Sources.objects.get_or_create(
-                    url=art["source_url"],
-                    defaults={"name": art["source_name"] or ""}
-                )
-
-                article_obj = Articles.objects.create(
-                    title=art["title"],
-                    url=art["url"],
-                    content=art["content"],
-                    author=art["author"],
-                    image_url=art["image_url"] or DEFAULT_IMAGE_URL,
-                    source=source_obj,
-                    published_date=art["published_date"],
-                    language=art["language"],
-                    country=art["country"],
-                    categories=art["categories"],
-                    is_fake=art["is_fake"],
-                    sentiment=art["sentiment"],
-                    fake_score=art["fake_score"],
-                )
-
-                text = f"{article_obj.title} {article_obj.content}"
-                if embedding_model and text.strip():
-                    try:
-                        article_obj.embedding = embedding_model.encode(text).tolist()
-                    except Exception as e:
-                        logger.error(f"Embedding error for article {article_obj.id}: {e}")
-
-                try:
-                    nlp_preds = nlp_service.predict_batch([text])
-                    if nlp_preds and isinstance(nlp_preds[0], dict):
-                        article_obj.is_fake = nlp_preds[0].get("is_fake")
-                        article_obj.sentiment = nlp_preds[0].get("sentiment")
-                        article_obj.fake_score = 1.0 if article_obj.is_fake else 0.0
-                except Exception as e:
-                    logger.error(f"NLP error for article {article_obj.id}: {e}")
-
-                article_obj.save()
-                stored_ids.append(article_obj.id)
-
-        # Update Redis after each batch
-        cache.set(redis_key, {
-            "article_ids": stored_ids,
-            "status": "processing"
-        }, timeout=3600)
-
-    # Mark task as completed
-    cache.set(redis_key, {
-        "article_ids": stored_ids,
-        "status": "completed"
-    }, timeout=3600)
-
-    logger.info(f"Processed and stored {len(stored_ids)} articles.")
-    return {"stored": len(stored_ids)}
+            new_articles = ingestion.store_raw(batch)
+            ingestion.link_keywords(batch)
+        new_ids = [article.id for article in new_articles]
+        stored_ids.extend(new_ids)
+        enqueue_enrichment(new_ids)
+
+        # Publish only this batch's articles; pollers read the log from their last offset
+        progress.append(new_articles)
+
+    payload_store.delete(payload_key)
+
+    # Chunks of a larger search are marked completed by finish_article_ingestion
+    if progress_id is None:
+        progress.finish()
+
+    logger.info(f"Stored {len(stored_ids)} articles, enrichment queued.")
+    return {"stored": len(stored_ids), "article_ids": stored_ids}
+
+@shared_task(**stage_task_options("store"))
+def finish_article_ingestion(results, progress_id):
+    """Chord callback of a chunked ingestion: report the articles stored by all chunks"""
+    stored_ids = [article_id for result in results for article_id in result["article_ids"]]
+    TaskProgressLog(progress_id).finish()
+    logger.info(f"Stored {len(stored_ids)} articles from {len(results)} chunks.")
+    return {"stored": len(stored_ids), "chunks": len(results)}
+
+def enqueue_enrichment(article_ids):
+    """Queue enrich -> apply chains for newly stored articles, in enrich-stage sized batches"""
+    batch_size = INGESTION_STAGES["enrich"]["batch_size"]
+    for i in range(0, len(article_ids), batch_size):
+        chain(
+            enrich_articles.s(article_ids[i:i + batch_size]),
+            apply_article_enrichment.s(),
+        ).apply_async()
+
+@shared_task(**stage_task_options("enrich"))
+def enrich_articles(article_ids):
+    """
+    Enrich stage: compute embeddings and predictions. Near-duplicates of already ingested stories reuse the
+    canonical article's results instead; their links are written by the apply stage. Reads articles but
+    holds no transaction or locks and writes nothing to the database.
+    """
+    articles = list(Articles.objects.filter(id__in=article_ids).only("id", "title", "content", "canonical_article_id"))
+    ingestion = ArticleIngestionService(embedding_model, nlp_service, dedup=NearDuplicateDetector())
+    return ingestion.serialize_enrichment(*ingestion.enrich_deduplicated(articles))
+
+@shared_task(**stage_task_options("apply"))
+def apply_article_enrichment(results):
+    """Apply stage: write enrichment results and duplicate links back in bulk"""
+    ingestion = ArticleIngestionService()
+    batch_size = INGESTION_STAGES["apply"]["batch_size"]
+    updated = 0
+    for i in range(0, len(results), batch_size):
+        updated += ingestion.apply_enrichment(results[i:i + batch_size])
+    logger.info(f"Applied enrichment to {updated} articles.")
+    return {"updated": updated}
+
+@shared_task
+def dispatch_due_feeds():
+    """Periodic (Celery beat) task: queue a poll for every feed that is due"""
+    feed_ids = FeedScheduler().claim_due_feeds()
+    for feed_id in feed_ids:
+        poll_feed.delay(feed_id)
+    logger.info(f"Dispatched {len(feed_ids)} feed polls.")
+    return {"dispatched": len(feed_ids)}
+
+@shared_task
+def poll_feed(feed_id):
+    """Poll one feed and record the outcome, which decides when it is polled next"""
+    # Imported here: feed_processor imports this module
+    from news.fetchers.feed_processor import FeedParser
+
+    feed = Feed.objects.select_related('source').filter(id=feed_id, is_active=True).first()
+    if feed is None:
+        return {"new_entries": 0}
+
+    scheduler = FeedScheduler()
+    started = time.perf_counter()
+    try:
+        new_entries = FeedParser().process_feed(feed)
+    except Exception as e:
+        logger.error(f"Failed to poll feed {feed.url}: {e}")
+        scheduler.record_failure(feed, e, (time.perf_counter() - started) * 1000)
+        return {"new_entries": 0, "error": str(e)}
+
+    scheduler.record_success(feed, new_entries, (time.perf_counter() - started) * 1000)
+    return {"new_entries": new_entries}
 
 User = get_user_model()
 
@@ -267,6 +332,9 @@ def process_articles_nlp(article_ids):
                     
                 if prediction["sentiment"] is not None:
                     updates["sentiment"] = prediction["sentiment"]
+
+                if updates:
+                    updates["model_version"] = prediction.get("model_version")
                     
                 if updates:
                     Articles.objects.filter(id=article.id).update(**updates)
@@ -284,9 +352,15 @@ import uuid
 from celery import shared_task
 from datetime import datetime
 
-@shared_task
-def process_search_results(articles):
-    """Process and format search results from external APIs"""
+@shared_task(bind=True)
+def process_search_results(self, payload_key):
+    """
+    Process and format search results from external APIs, and record them in the task's progress log,
+    which also pushes them to WebSocket subscribers.
+    :param payload_key: Payload store key of the raw articles.
+    :return: Payload store key of the formatted articles, and their count.
+    """
+    articles = payload_store.get(payload_key)
     DEFAULT_IMAGE_URL = 'https://raw.githubusercontent.com/mMelnic/news-fake-detection/refs/heads/users/news_aggregator/newspaper_beige.jpg'
     
     processed_articles = []
@@ -335,5 +409,11 @@ def process_search_results(articles):
         }
         
         processed_articles.append(processed_article)
-    
-    return processed_articles
\ No newline at end of file
+
+    payload_store.delete(payload_key)
+    result_key = payload_store.put(processed_articles, prefix="search_results")
+    # Logged, not only published, so clients subscribing after the task finished still get the results
+    progress = TaskProgressLog(self.request.id)
+    progress.append_summaries(processed_articles)
+    progress.finish()
+    return {"payload_key": result_key, "count": len(processed_articles)}
\ No newline at end of file
@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase
+from news.utils.content_extractor import ContentExtractor, decode_html
+
+PARAGRAPH = "The city council approved the new transit budget after a long debate over funding priorities. " * 7
+
+def article_page(charset='utf-8', paragraphs=8):
+    body = ''.join(f"<p>{PARAGRAPH} Café report {i}.</p>" for i in range(paragraphs))
+    return f'<html><head><meta charset="{charset}"><title>Transit</title></head><body>{body}</body></html>'
+
+class ContentExtractorTestCase(SimpleTestCase):
+
+    def test_stream_backend_accepts_bytes(self):
+        """Raw response bytes, as passed by the async crawler, extract the same as the decoded page."""
+        html = article_page()
+        extractor = ContentExtractor(backend='stream')
+
+        from_bytes = extractor.extract_from_html(html.encode('utf-8'), 'Council vote')
+        from_text = extractor.extract_from_html(html, 'Council vote')
+
+        self.assertIsNotNone(from_bytes)
+        self.assertEqual(from_bytes, from_text)
+        self.assertIn('Café', from_bytes['full_content'])
+
+    def test_declared_charset_is_used(self):
+        """Bytes are decoded with the charset declared in the page."""
+        html = article_page(charset='iso-8859-1')
+
+        self.assertEqual(decode_html(html.encode('iso-8859-1')), html)
+
+    def test_unknown_charset_falls_back_to_utf8(self):
+        """An unknown declared charset does not fail extraction."""
+        html = article_page(charset='not-a-charset')
+
+        self.assertEqual(decode_html(html.encode('utf-8')), html)
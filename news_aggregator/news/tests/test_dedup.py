@@ -0,0 +1,99 @@
+from django.test import SimpleTestCase, TestCase
+from news.models import Articles
+from news.services.dedup_service import estimate_similarity, minhash_signature, shingles
+from news.services.ingestion_service import ENRICHMENT_FIELDS, ArticleIngestionService
+
+STORY = (
+    "The central bank raised interest rates by a quarter point on Wednesday, citing persistent inflation "
+    "in services and a labour market that remains tighter than policymakers expected at the start of the year. "
+    "Officials signalled that further increases were possible if price growth did not slow over the summer."
+)
+
+class NearDuplicateSignatureTestCase(SimpleTestCase):
+
+    def test_shingles_ignore_case_and_punctuation(self):
+        """Shingles are built from lowercased words only."""
+        self.assertEqual(shingles("Rates RISE, again!", size=2), {"rates rise", "rise again"})
+
+    def test_republished_story_is_similar(self):
+        """A copy with a reworded headline and a trailing line is estimated as highly similar."""
+        original = minhash_signature(shingles(f"Central bank raises rates {STORY}"))
+        copy = minhash_signature(shingles(f"Central bank raises interest rates {STORY} Reporting by staff."))
+        self.assertGreaterEqual(estimate_similarity(original, copy), 0.7)
+
+    def test_different_story_is_not_similar(self):
+        """Unrelated articles get a low similarity estimate."""
+        original = minhash_signature(shingles(STORY))
+        other = minhash_signature(shingles(
+            "The home team won the final in extra time after a late equaliser forced the match beyond ninety minutes, "
+            "and the captain lifted the trophy in front of a sold out stadium on Saturday night."
+        ))
+        self.assertLess(estimate_similarity(original, other), 0.2)
+
+    def test_empty_text_has_no_signature(self):
+        """Articles without words are never matched."""
+        self.assertIsNone(minhash_signature(shingles("  ...  ")))
+
+class LinkTo:
+    """Dedup detector that finds every unlinked article to be a duplicate of one story"""
+
+    def __init__(self, canonical_id):
+        self.canonical_id = canonical_id
+
+    def link_duplicates(self, articles):
+        for article in articles:
+            article.canonical_article_id = self.canonical_id
+        return [], articles
+
+class DuplicateEnrichmentTestCase(TestCase):
+
+    def setUp(self):
+        self.canonical = Articles.objects.create(title="Rates rise", content=STORY, url="https://example.com/rates")
+        self.duplicate = Articles.objects.create(title="Rates rise again", content=STORY, url="https://example.org/rates")
+        self.ingestion = ArticleIngestionService(dedup=LinkTo(self.canonical.id))
+        self.enrichment = {
+            "id": self.canonical.id, "embedding": [0.1] * 384, "is_fake": False,
+            "fake_score": 0.0, "sentiment": "negative", "model_version": "test",
+        }
+
+    def enrich_duplicate(self):
+        return self.ingestion.serialize_enrichment(*self.ingestion.enrich_deduplicated([self.duplicate]))
+
+    def test_enrich_stage_does_not_write_links(self):
+        """Duplicate links are passed on to the apply stage instead of being written while enriching."""
+        results = self.enrich_duplicate()
+
+        self.assertEqual(results, [{"id": self.duplicate.id, "canonical_article_id": self.canonical.id}])
+        self.duplicate.refresh_from_db()
+        self.assertIsNone(self.duplicate.canonical_article_id)
+
+        self.ingestion.apply_enrichment(results)
+        self.duplicate.refresh_from_db()
+        self.assertEqual(self.duplicate.canonical_article_id, self.canonical.id)
+
+    def test_duplicate_applied_before_canonical_receives_propagated_enrichment(self):
+        """A duplicate applied before its canonical article is not written as NULLs and gets the canonical's values later."""
+        self.ingestion.apply_enrichment(self.enrich_duplicate())
+        self.ingestion.apply_enrichment([self.enrichment])
+
+        self.duplicate.refresh_from_db()
+        self.assertEqual(self.duplicate.sentiment, "negative")
+        self.assertIsNotNone(self.duplicate.embedding)
+
+    def test_duplicate_applied_after_canonical_copies_enrichment(self):
+        """A duplicate applied after its canonical article copies the canonical's values."""
+        self.ingestion.apply_enrichment([self.enrichment])
+        self.ingestion.apply_enrichment(self.enrich_duplicate())
+
+        self.duplicate.refresh_from_db()
+        self.assertEqual(self.duplicate.sentiment, "negative")
+
+    def test_canonical_without_enrichment_is_logged(self):
+        """Applying a canonical article whose enrichment failed warns that its duplicates stay unenriched."""
+        self.ingestion.apply_enrichment(self.enrich_duplicate())
+
+        with self.assertLogs("news.services.ingestion_service", level="WARNING"):
+            self.ingestion.apply_enrichment([{"id": self.canonical.id, **{field: None for field in ENRICHMENT_FIELDS}}])
+
+        self.duplicate.refresh_from_db()
+        self.assertIsNone(self.duplicate.sentiment)
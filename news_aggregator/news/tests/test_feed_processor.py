@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+from news.fetchers.feed_processor import FeedParser
+from news.models import Feed
+
+FEED_BODY = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel>
+<title>Example</title><link>https://example.com/</link><description>News</description>
+<item><title>Story</title><link>https://example.com/story</link><guid>story-1</guid></item>
+</channel></rss>"""
+
+class ExtractionStub:
+    """Extraction service whose downloads fail (transiently) until succeed is set"""
+
+    def __init__(self):
+        self.succeed = False
+        self.requested = []
+
+    def extract_many(self, items):
+        urls = [url for url, _ in items]
+        self.requested.append(urls)
+        result = {"word_count": 10, "truncated_content": "Too short to store"} if self.succeed else None
+        return {url: result for url in urls}
+
+    def rejected(self, url):
+        return False
+
+def feed_response(url, headers=None, timeout=None):
+    """The same feed body on every poll; a 304 when the client sends the ETag"""
+    response = MagicMock(content=FEED_BODY, headers={'ETag': '"v1"'})
+    response.status_code = 304 if (headers or {}).get('If-None-Match') == '"v1"' else 200
+    return response
+
+@patch('news.fetchers.feed_processor.requests.get', side_effect=feed_response)
+class TransientEntryRetryTestCase(TestCase):
+
+    def setUp(self):
+        self.feed = Feed.objects.create(url="https://example.com/rss", title="Example")
+        self.extraction = ExtractionStub()
+        self.parser = FeedParser(extraction_service=self.extraction)
+
+    def poll(self):
+        self.feed.refresh_from_db()
+        return self.parser.process_feed(self.feed)
+
+    def test_failed_entry_is_retried_while_feed_is_unchanged(self, mock_get):
+        """Validators are not saved while an entry is pending, so an unchanged feed is parsed again."""
+        self.poll()
+        self.feed.refresh_from_db()
+        self.assertIsNone(self.feed.etag)
+
+        self.extraction.succeed = True
+        self.poll()
+
+        self.assertEqual(self.extraction.requested, [["https://example.com/story"], ["https://example.com/story"]])
+
+    def test_unchanged_feed_is_skipped_once_entries_are_handled(self, mock_get):
+        """After every entry was handled the validators are saved and the next poll gets a 304."""
+        self.extraction.succeed = True
+        self.poll()
+
+        self.assertEqual(self.poll(), 0)
+        self.assertEqual(len(self.extraction.requested), 1)
+        self.assertEqual(mock_get.call_args.kwargs["headers"]["If-None-Match"], '"v1"')
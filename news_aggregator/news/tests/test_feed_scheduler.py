@@ -0,0 +1,78 @@
+import threading
+
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TransactionTestCase, skipUnlessDBFeature
+from news.models import Feed
+from news.services.feed_scheduler import (
+    DEFAULT_POLL_INTERVAL, MAX_POLL_INTERVAL, MIN_POLL_INTERVAL, FeedScheduler, next_poll_interval
+)
+
+class NextPollIntervalTestCase(SimpleTestCase):
+
+    def test_failures_back_off_exponentially(self):
+        """Each failed poll doubles the interval."""
+        interval = 600
+        for expected in (1200, 2400, 4800):
+            interval = next_poll_interval(interval, failed=True)
+            self.assertEqual(interval, expected)
+
+    def test_quiet_feed_backs_off(self):
+        """A poll without new entries lengthens the interval."""
+        self.assertGreater(next_poll_interval(1800, new_entries=0), 1800)
+
+    def test_busy_feed_tightens(self):
+        """Many new entries per poll shorten the interval, by at most 4x per poll."""
+        self.assertEqual(next_poll_interval(3600, new_entries=6), 1800)
+        self.assertEqual(next_poll_interval(3600, new_entries=100), 900)
+
+    def test_interval_is_clamped(self):
+        """Intervals stay within the configured bounds."""
+        self.assertEqual(next_poll_interval(MAX_POLL_INTERVAL, failed=True), MAX_POLL_INTERVAL)
+        self.assertEqual(next_poll_interval(MIN_POLL_INTERVAL, new_entries=100), MIN_POLL_INTERVAL)
+
+    def test_missing_interval_uses_default(self):
+        """Feeds without an interval start from the default."""
+        self.assertEqual(next_poll_interval(None, new_entries=3), DEFAULT_POLL_INTERVAL)
+
+class ClaimDueFeedsTestCase(TransactionTestCase):
+
+    def setUp(self):
+        self.feeds = [Feed.objects.create(url=f"https://example{i}.com/rss", title=f"Feed {i}") for i in range(5)]
+
+    def test_claimed_feeds_are_not_due_again(self):
+        """A second dispatch run right after the first finds nothing to claim."""
+        scheduler = FeedScheduler()
+
+        first = scheduler.claim_due_feeds()
+        second = scheduler.claim_due_feeds()
+
+        self.assertCountEqual(first, [feed.id for feed in self.feeds])
+        self.assertEqual(second, [])
+
+    @skipUnlessDBFeature('has_select_for_update_skip_locked')
+    def test_concurrent_claims_do_not_overlap(self):
+        """While one dispatch run holds its claim open, an overlapping run skips the locked feeds."""
+        claimed = {}
+        first_claimed = threading.Event()
+        second_done = threading.Event()
+
+        def first_run():
+            try:
+                with transaction.atomic():
+                    claimed['first'] = FeedScheduler().claim_due_feeds()
+                    first_claimed.set()
+                    # Keep the row locks until the overlapping run has finished
+                    second_done.wait(timeout=10)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=first_run)
+        thread.start()
+        self.assertTrue(first_claimed.wait(timeout=10))
+
+        claimed['second'] = FeedScheduler().claim_due_feeds()
+        second_done.set()
+        thread.join()
+
+        self.assertCountEqual(claimed['first'], [feed.id for feed in self.feeds])
+        self.assertEqual(claimed['second'], [])
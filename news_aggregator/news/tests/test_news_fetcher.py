@@ -1,3 +1,5 @@
+import json
+from django.core.cache import cache
 from django.test import TestCase
 from unittest.mock import patch, MagicMock
 from requests.models import Response
@@ -37,36 +39,67 @@ class NewsFetcherTestCase(TestCase):
         with self.assertRaises(ValueError):
             self.fetcher._validate_and_format_query("a" * 501)  # Exceeds max length
 
-    @patch('requests.get')
-    def test_fetch_articles_partial_results(self, mock_get):
-        mock_response_1 = MagicMock(spec=Response)
-        mock_response_1.status_code = 200
-        mock_response_1.json.return_value = {
+    def _mock_page(self, total_results, articles, status_code=200):
+        response = MagicMock(spec=Response)
+        response.status_code = status_code
+        response.headers = {}
+        response.iter_content.return_value = [json.dumps({
             "status": "ok",
-            "totalResults": 120,
-            "articles": [
-                {"title": f"Article {i+1}", "description": f"Description {i+1}"}
-                for i in range(100)
-            ]
+            "totalResults": total_results,
+            "articles": articles,
+        }).encode("utf-8")]
+        return response
+
+    @patch('requests.Session.get')
+    def test_fetch_articles_single_page_by_default(self, mock_get):
+        """Only the first page is requested unless more pages are asked for."""
+        cache.clear()
+        first_page = [{"title": f"Article {i+1}", "description": f"Description {i+1}"} for i in range(100)]
+        mock_get.return_value = self._mock_page(300, first_page)
+
+        articles = NewsApiFetcher().fetch_articles("single page query", "en")
+
+        self.assertEqual(len(articles), 100)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(mock_get.call_args.kwargs["params"]["page"], 1)
+
+    @patch('requests.Session.get')
+    def test_fetch_articles_paginates(self, mock_get):
+        """With max_pages, remaining pages are fetched after the first one reports the total number of results."""
+        cache.clear()
+        pages = {
+            1: [{"title": f"Article {i+1}", "description": f"Description {i+1}"} for i in range(100)],
+            2: [{"title": f"Article {i+101}", "description": f"Description {i+101}"} for i in range(20)],
         }
-        
-        mock_get.return_value = mock_response_1
+        mock_get.side_effect = lambda url, params=None, **kwargs: self._mock_page(120, pages[params["page"]])
 
         fetcher = NewsApiFetcher()
 
-        articles = fetcher.fetch_articles("test query", "en")
+        articles = fetcher.fetch_articles("test query", "en", max_pages=5)
 
-        self.assertEqual(len(articles), 100)
+        self.assertEqual(len(articles), 120)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(sorted(call.kwargs["params"]["page"] for call in mock_get.call_args_list), [1, 2])
 
-        # Check that requests.get was called exactly once for the first page
-        mock_get.assert_called_once_with("https://newsapi.org/v2/everything", params={
-            "apiKey": fetcher.api_key,
-            "q": "test%20query",
-            "sortBy": "popularity",
-            "pageSize": 100,
-            "language": "en",
-            "page": 1
-        })
-
-        # Ensure no additional API calls for the second page or beyond
-        self.assertEqual(mock_get.call_count, 1)  # Only 1 call should be made for page 1
\ No newline at end of file
+        first_params = mock_get.call_args_list[0].kwargs["params"]
+        self.assertEqual(first_params["q"], "test query")
+        self.assertEqual(first_params["pageSize"], 100)
+        self.assertEqual(first_params["language"], "en")
+
+    @patch('requests.Session.get')
+    def test_fetch_articles_partial_results(self, mock_get):
+        """A failing later page does not discard the pages that were fetched."""
+        cache.clear()
+        first_page = [{"title": f"Article {i+1}", "description": f"Description {i+1}"} for i in range(100)]
+
+        def get(url, params=None, **kwargs):
+            if params["page"] == 1:
+                return self._mock_page(300, first_page)
+            return self._mock_page(300, [], status_code=426)
+
+        mock_get.side_effect = get
+
+        articles = NewsApiFetcher().fetch_articles("partial query", "en", max_pages=5)
+
+        self.assertEqual(len(articles), 100)
+        self.assertEqual(mock_get.call_count, 3)
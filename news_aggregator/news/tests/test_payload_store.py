@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase, override_settings
+from news.services.payload_store import PayloadMissing, PayloadStore
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class PayloadStoreTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.store = PayloadStore()
+        self.articles = [{'title': f'Article {i}', 'url': f'https://example.com/{i}', 'content': 'x' * 1000} for i in range(250)]
+
+    def test_round_trip(self):
+        """A stored payload is returned unchanged by its key."""
+        key = self.store.put(self.articles, prefix='ingest')
+
+        self.assertTrue(key.startswith('ingest:'))
+        self.assertEqual(self.store.get(key), self.articles)
+
+    def test_chunks_preserve_order(self):
+        """A list is split into ordered chunks of at most chunk_size items."""
+        keys = self.store.put_chunks(self.articles, 100)
+
+        chunks = [self.store.get(key) for key in keys]
+        self.assertEqual([len(chunk) for chunk in chunks], [100, 100, 50])
+        self.assertEqual([article for chunk in chunks for article in chunk], self.articles)
+
+    def test_missing_payload(self):
+        """Deleted or expired payloads raise PayloadMissing."""
+        key = self.store.put(self.articles)
+        self.store.delete(key)
+
+        with self.assertRaises(PayloadMissing):
+            self.store.get(key)
@@ -0,0 +1,140 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import redis
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.test import SimpleTestCase, override_settings
+from news.routing import websocket_urlpatterns
+from news.services.progress_log import TaskProgressLog
+
+class FakePipeline:
+    """Minimal in-memory stand-in for the Redis list and hash commands used by the progress log"""
+
+    def __init__(self, data):
+        self.data = data
+        self.results = []
+
+    def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(value.encode() for value in values)
+        self.results.append(len(self.data[key]))
+
+    def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field.encode()] = str(value).encode()
+        self.results.append(1)
+
+    def hincrby(self, key, field, amount):
+        current = int(self.data.setdefault(key, {}).get(field.encode(), b'0'))
+        self.data[key][field.encode()] = str(current + amount).encode()
+        self.results.append(current + amount)
+
+    def expire(self, key, ttl):
+        self.results.append(True)
+
+    def hgetall(self, key):
+        self.results.append(dict(self.data.get(key, {})))
+
+    def lrange(self, key, start, end):
+        self.results.append(self.data.get(key, [])[start:])
+
+    def execute(self):
+        results, self.results = self.results, []
+        return results
+
+def make_article(article_id):
+    return SimpleNamespace(
+        id=article_id, title=f'Article {article_id}', author='', url=f'https://example.com/{article_id}',
+        image_url=None, source=None, published_date=None, country='us', language='en', categories=None,
+        is_fake=None, sentiment=None,
+    )
+
+class TaskProgressLogTestCase(SimpleTestCase):
+
+    def setUp(self):
+        data = {}
+        self.client = MagicMock()
+        self.client.pipeline.side_effect = lambda transaction=False: FakePipeline(data)
+        self.log = TaskProgressLog('task-1', client=self.client)
+        publisher = patch('news.services.progress_log.publish_task_event')
+        self.publish = publisher.start()
+        self.addCleanup(publisher.stop)
+
+    def test_reads_only_new_articles_from_offset(self):
+        """Readers get the articles appended after their offset and the offset to continue from."""
+        self.log.append([make_article(1), make_article(2)])
+        first = self.log.read(0)
+
+        self.log.append([make_article(3)])
+        second = self.log.read(first['offset'])
+
+        self.assertEqual([a['id'] for a in first['articles']], [1, 2])
+        self.assertEqual([a['id'] for a in second['articles']], [3])
+        self.assertEqual(second['offset'], 3)
+        self.assertEqual(second['stored'], 3)
+        self.assertEqual(second['status'], 'processing')
+
+    def test_publishes_batches_with_their_offset(self):
+        """Each appended batch is pushed to subscribers with the offset it starts at."""
+        self.log.append([make_article(1), make_article(2)])
+        self.log.append([make_article(3)])
+        self.log.finish()
+
+        (_, progress_type), first = self.publish.call_args_list[0]
+        (_, _), second = self.publish.call_args_list[1]
+        self.assertEqual(progress_type, 'task.progress')
+        self.assertEqual((first['offset'], first['stored']), (0, 2))
+        self.assertEqual((second['offset'], second['stored'], second['articles'][0]['id']), (2, 3, 3))
+        self.publish.assert_called_with('task-1', 'task.status', status='completed')
+
+    def test_appends_formatted_summaries(self):
+        """Search results that are not stored are logged as given."""
+        self.log.append_summaries([{'id': 'tmp-1', 'title': 'Result', 'content': 'Text'}])
+
+        self.assertEqual(self.log.read(0)['articles'], [{'id': 'tmp-1', 'title': 'Result', 'content': 'Text'}])
+
+    def test_status_lifecycle(self):
+        """The log reports pending before the first batch and completed once finished."""
+        self.assertEqual(self.log.read(0)['status'], 'pending')
+
+        self.log.append([])
+        self.log.finish()
+
+        self.assertEqual(self.log.read(0)['status'], 'completed')
+
+    def test_redis_errors_do_not_propagate(self):
+        """Writes are skipped and reads return None when Redis is unavailable."""
+        self.client.pipeline.side_effect = redis.ConnectionError('down')
+
+        self.log.append([make_article(1)])
+        self.assertIsNone(self.log.read(0))
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class TaskProgressConsumerTestCase(SimpleTestCase):
+
+    def setUp(self):
+        data = {}
+        self.client = MagicMock()
+        self.client.pipeline.side_effect = lambda transaction=False: FakePipeline(data)
+        log_class = patch('news.consumers.TaskProgressLog', side_effect=lambda task_id: TaskProgressLog(task_id, client=self.client))
+        log_class.start()
+        self.addCleanup(log_class.stop)
+        publisher = patch('news.services.progress_log.publish_task_event')
+        publisher.start()
+        self.addCleanup(publisher.stop)
+
+    async def test_late_subscriber_receives_finished_search(self):
+        """A client connecting after a search task finished gets its results and final status."""
+        log = TaskProgressLog('search-1', client=self.client)
+        log.append_summaries([{'id': 'tmp-1', 'title': 'Result'}, {'id': 'tmp-2', 'title': 'Other result'}])
+        log.finish()
+
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), '/ws/tasks/search-1/')
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        progress = await communicator.receive_json_from()
+        status = await communicator.receive_json_from()
+        await communicator.disconnect()
+
+        self.assertEqual(progress['type'], 'task_progress')
+        self.assertEqual([article['id'] for article in progress['articles']], ['tmp-1', 'tmp-2'])
+        self.assertEqual(status, {'type': 'task_status', 'status': 'completed'})
@@ -0,0 +1,37 @@
+from django.test import SimpleTestCase
+from news.fetchers.provider_cache import cache_key, normalize_query
+
+class NormalizeQueryTestCase(SimpleTestCase):
+
+    def test_equivalent_queries_share_a_form(self):
+        """Term order, case, whitespace and implicit/explicit AND do not change the normalized query."""
+        test_cases = [
+            ('Bitcoin  ethereum', 'ethereum AND bitcoin'),
+            ('b OR a', 'a OR b'),
+            ('"Climate  Change" AND +renewable -fossil', '+renewable "climate change" NOT fossil'),
+            ('solar OR "Wind Power" OR solar', '"wind power" OR solar'),
+        ]
+
+        for first, second in test_cases:
+            with self.subTest(first=first, second=second):
+                self.assertEqual(normalize_query(first), normalize_query(second))
+
+    def test_different_queries_differ(self):
+        """Queries with different meaning keep different normalized forms."""
+        self.assertNotEqual(normalize_query('a OR b'), normalize_query('a AND b'))
+        self.assertNotEqual(normalize_query('a -b'), normalize_query('a b'))
+
+    def test_grouped_queries_keep_order(self):
+        """Queries with parentheses are only case-folded, not reordered."""
+        self.assertEqual(
+            normalize_query('Crypto AND (Ethereum OR litecoin) NOT bitcoin'),
+            'crypto AND ( ethereum OR litecoin ) NOT bitcoin',
+        )
+
+    def test_cache_key_includes_provider_language_and_country(self):
+        """The same query gets different keys per provider, language and country."""
+        key = cache_key('newsapi', 'climate', 'en', 'us')
+        self.assertEqual(key, cache_key('newsapi', 'Climate', 'EN', 'US'))
+        self.assertNotEqual(key, cache_key('gnews', 'climate', 'en', 'us'))
+        self.assertNotEqual(key, cache_key('newsapi', 'climate', 'de', 'us'))
+        self.assertNotEqual(key, cache_key('newsapi', 'climate', 'en', 'gb'))
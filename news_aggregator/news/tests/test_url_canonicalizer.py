@@ -0,0 +1,83 @@
+import base64
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+from news.utils.url_canonicalizer import (
+    RedirectResolver, canonical_urls, canonicalize_url, decode_google_news_url, downloaded_canonical_url
+)
+
+def google_news_link(url):
+    payload = b'\x08\x13\x22' + bytes([len(url)]) + url.encode() + b'\xd2\x01\x00'
+    return f"https://news.google.com/rss/articles/{base64.urlsafe_b64encode(payload).decode().rstrip('=')}?oc=5"
+
+class CanonicalizeUrlTestCase(SimpleTestCase):
+
+    def test_variants_share_a_canonical_url(self):
+        """Tracking parameters, scheme, host case, www, default port, fragment and trailing slash are ignored."""
+        variants = [
+            'https://www.example.com/news/story-1/',
+            'http://example.com/news/story-1',
+            'HTTPS://Example.COM:443/news//story-1?utm_source=newsapi&utm_medium=rss',
+            'https://example.com/news/story-1?fbclid=abc#comments',
+        ]
+
+        for url in variants:
+            with self.subTest(url=url):
+                self.assertEqual(canonicalize_url(url), 'https://example.com/news/story-1')
+
+    def test_meaningful_query_parameters_are_kept_and_sorted(self):
+        """Non-tracking parameters identify the page, so they stay, in a stable order."""
+        self.assertEqual(
+            canonicalize_url('https://example.com/article?page=2&id=7&utm_campaign=x'),
+            'https://example.com/article?id=7&page=2',
+        )
+        self.assertNotEqual(canonicalize_url('https://example.com/a?id=1'), canonicalize_url('https://example.com/a?id=2'))
+
+    def test_unparseable_urls_are_returned_unchanged(self):
+        """Values that are not absolute URLs are kept as they are."""
+        self.assertEqual(canonicalize_url('not a url'), 'not a url')
+        self.assertEqual(canonicalize_url(''), '')
+
+class RedirectResolverTestCase(SimpleTestCase):
+
+    def test_decodes_google_news_links(self):
+        """Publisher URLs embedded in Google News article ids are decoded without a request."""
+        link = google_news_link('https://www.example.com/world/story?utm_source=google')
+        self.assertEqual(decode_google_news_url(link), 'https://www.example.com/world/story?utm_source=google')
+
+    @patch('news.utils.url_canonicalizer.cache')
+    @patch('news.utils.url_canonicalizer.requests.head')
+    def test_follows_and_caches_wrapper_redirects(self, mock_head, mock_cache):
+        """Shortener links are followed once and the result cached; other hosts are not requested."""
+        mock_cache.get_many.return_value = {}
+        mock_head.return_value = MagicMock(status_code=200, url='https://example.com/story')
+        resolver = RedirectResolver()
+
+        self.assertEqual(resolver.resolve('https://bit.ly/abc'), 'https://example.com/story')
+        mock_cache.set_many.assert_called_once()
+        self.assertEqual(list(mock_cache.set_many.call_args[0][0].values()), ['https://example.com/story'])
+
+        self.assertEqual(resolver.resolve('https://example.com/other'), 'https://example.com/other')
+        mock_head.assert_called_once()
+
+    @patch('news.utils.url_canonicalizer.cache')
+    @patch('news.utils.url_canonicalizer.requests.head')
+    def test_batch_without_follow_makes_no_requests(self, mock_head, mock_cache):
+        """Without resolve, decodable wrappers are still resolved and the others keep the wrapper as key."""
+        mock_cache.get_many.return_value = {}
+        links = [google_news_link('https://example.com/decoded'), 'https://bit.ly/abc', 'https://example.com/plain']
+
+        keys = canonical_urls(links, resolve=False)
+
+        self.assertEqual(keys, ['https://example.com/decoded', 'https://bit.ly/abc', 'https://example.com/plain'])
+        mock_head.assert_not_called()
+
+    @patch('news.utils.url_canonicalizer.cache')
+    @patch('news.utils.url_canonicalizer.requests.head')
+    def test_downloaded_page_uses_final_url(self, mock_head, mock_cache):
+        """A page downloaded through a wrapper is keyed by the URL the download ended at, without another request."""
+        key = downloaded_canonical_url('https://feeds.feedburner.com/x/abc', 'https://www.example.com/story?utm_medium=rss')
+
+        self.assertEqual(key, 'https://example.com/story')
+        mock_cache.set.assert_called_once()
+        mock_head.assert_not_called()
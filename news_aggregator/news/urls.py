@@ -20,6 +20,7 @@ urlpatterns = [
     path('search/and/', search_and, name='search-and'),
     path('search/or/', search_or, name='search-or'),
     path('poll-task-articles/<str:task_id>/', poll_task_articles, name='poll-task-articles'),
+    path('providers/budgets/', views.provider_budgets, name='provider-budgets'),
     path('feed/categories/', FeedCategoryListView.as_view(), name='feed-category-list'),
     path('feed/categories/<str:category>/', FeedCategoryArticlesView.as_view(), name='feed-category-articles'),
     path('sources/', SourceListView.as_view(), name='source-list'),
@@ -2,43 +2,140 @@ import requests
 from bs4 import BeautifulSoup
 import re
 from html import unescape
+from html.parser import HTMLParser
 
 DEFAULT_IMAGE_URL = 'https://raw.githubusercontent.com/mMelnic/news-fake-detection/refs/heads/users/news_aggregator/newspaper_beige.jpg'
 MIN_CONTENT_WORDS = 100
 MAX_CONTENT_WORDS = 500
 
+BOILERPLATE_PHRASES = (
+    'cookie policy', 'privacy policy', 'terms of use',
+    'all rights reserved', '©', 'sign up for our newsletter',
+    'related articles', 'continue reading', 'click here',
+    'published on', 'last updated', 'photo credit',
+    'please share', 'follow us', 'comments', 'cookies'
+)
+BOILERPLATE_RE = re.compile('|'.join(re.escape(phrase) for phrase in BOILERPLATE_PHRASES), re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+
+STREAM_CHUNK_SIZE = 16384
+# Pages declare their charset in a <meta> tag near the top
+CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+CHARSET_SNIFF_BYTES = 4096
+
+SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'svg'}
+
+class _StopParsing(Exception):
+    pass
+
+class ParagraphCollector(HTMLParser):
+    """
+    Streaming <p> collector. Paragraph text is handed to on_paragraph as soon as the paragraph closes,
+    and parsing stops early once on_paragraph returns True.
+    """
+
+    def __init__(self, on_paragraph):
+        super().__init__(convert_charrefs=True)
+        self.on_paragraph = on_paragraph
+        self._parts = None
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == 'p':
+            # <p> cannot nest, so a new one implicitly closes the open one
+            self._flush()
+            self._parts = []
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag == 'p':
+            self._flush()
+
+    def handle_data(self, data):
+        if self._parts is not None and not self._skip_depth:
+            self._parts.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    def _flush(self):
+        if self._parts is None:
+            return
+        text = WHITESPACE_RE.sub(' ', ''.join(self._parts)).strip()
+        self._parts = None
+        if text and self.on_paragraph(text):
+            raise _StopParsing()
+
+
+def decode_html(html):
+    """Decode a downloaded page using its <meta> charset, falling back to UTF-8. Strings are returned unchanged."""
+    if isinstance(html, str):
+        return html
+    match = CHARSET_RE.search(html[:CHARSET_SNIFF_BYTES])
+    if match:
+        try:
+            return html.decode(match.group(1).decode('ascii'), errors='replace')
+        except LookupError:
+            pass
+    return html.decode('utf-8', errors='replace')
+
+
 class ContentExtractor:
+    """
+    Article text extraction from HTML <p> tags.
+    Backends: 'stream' (default) parses incrementally with the stdlib HTMLParser and stops once MAX_CONTENT_WORDS
+    of article text were collected; 'soup' builds the full BeautifulSoup tree. With the stream backend,
+    word_count counts the collected text only, so it is capped slightly above MAX_CONTENT_WORDS.
+    """
+
+    BACKENDS = ('stream', 'soup')
+
+    def __init__(self, backend='stream'):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown extraction backend '{backend}', expected one of {self.BACKENDS}")
+        self.backend = backend
 
     def get_article_content(self, url, title):
         """Get clean text content from article paragraphs"""
         try:
             headers = {'User-Agent': 'Mozilla/5.0'}
             response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Extract good paragraphs only
-            paragraphs = self.extract_clean_paragraphs(soup, title)
-
-            if not paragraphs:
-                return None
-
-            full_content = '\n\n'.join(paragraphs)
-            words = full_content.split()[:MAX_CONTENT_WORDS]
-            truncated = ' '.join(words)
-            if len(words) == MAX_CONTENT_WORDS:
-                truncated += " [...]"
-
-            return {
-                'full_content': full_content,
-                'truncated_content': truncated,
-                'word_count': len(full_content.split()),
-                'paragraph_count': len(paragraphs)
-            }
+            return self.extract_from_html(response.text, title)
 
         except Exception as e:
             print(f"Error scraping {url}: {e}")
             return None
 
+    def extract_from_html(self, html, title):
+        """
+        Get clean text content from an already downloaded article page.
+        :param html: Page as text, or as the raw response bytes (decoded with the page's declared charset).
+        """
+        if self.backend == 'stream':
+            paragraphs = self.stream_clean_paragraphs(decode_html(html), title)
+        else:
+            paragraphs = self.extract_clean_paragraphs(BeautifulSoup(html, 'html.parser'), title)
+
+        if not paragraphs:
+            return None
+
+        full_content = '\n\n'.join(paragraphs)
+        words = full_content.split()[:MAX_CONTENT_WORDS]
+        truncated = ' '.join(words)
+        if len(words) == MAX_CONTENT_WORDS:
+            truncated += " [...]"
+
+        return {
+            'full_content': full_content,
+            'truncated_content': truncated,
+            'word_count': len(full_content.split()),
+            'paragraph_count': len(paragraphs)
+        }
+
     def extract_clean_paragraphs(self, soup, title):
         """Extract only meaningful <p> tag content"""
         paragraphs = []
@@ -46,11 +143,33 @@ class ContentExtractor:
         for p in soup.find_all('p'):
             text = p.get_text(strip=True)
             if self.is_article_content(text, title):
-                clean_text = re.sub(r'\s+', ' ', text).strip()
+                clean_text = WHITESPACE_RE.sub(' ', text).strip()
                 paragraphs.append(clean_text)
 
         return paragraphs
 
+    def stream_clean_paragraphs(self, html, title, max_words=MAX_CONTENT_WORDS):
+        """Extract meaningful <p> tag content incrementally, stopping once max_words were collected"""
+        paragraphs = []
+        collected = 0
+
+        def on_paragraph(text):
+            nonlocal collected
+            if self.is_article_content(text, title):
+                paragraphs.append(text)
+                collected += len(text.split())
+            return collected >= max_words
+
+        parser = ParagraphCollector(on_paragraph)
+        try:
+            for start in range(0, len(html), STREAM_CHUNK_SIZE):
+                parser.feed(html[start:start + STREAM_CHUNK_SIZE])
+            parser.close()
+        except _StopParsing:
+            pass
+
+        return paragraphs
+
     def is_article_content(self, text, title, min_words=MIN_CONTENT_WORDS):
         """Check if text is meaningful article content"""
         text = text.strip()
@@ -58,18 +177,10 @@ class ContentExtractor:
         if len(text.split()) < min_words:
             return False
 
-        boilerplate_phrases = [
-            'cookie policy', 'privacy policy', 'terms of use',
-            'all rights reserved', '©', 'sign up for our newsletter',
-            'related articles', 'continue reading', 'click here',
-            'published on', 'last updated', 'photo credit',
-            'please share', 'follow us', 'comments', 'cookies'
-        ]
-
-        if any(phrase.lower() in text.lower() for phrase in boilerplate_phrases):
+        if BOILERPLATE_RE.search(text):
             return False
 
-        if title.lower() in text.lower():
+        if title and title.lower() in text.lower():
             return False
 
         if len(text) < 60 and (text.endswith('.') or text.endswith(':')):
@@ -0,0 +1,225 @@
+import base64
+import binascii
+import hashlib
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only identify the campaign or referrer, never the page
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', 'ocid', 'cmpid',
+    'ref', 'ref_src', 'ref_url', 'referrer', 'smid', 'ito', 'ns_mchannel', 'ns_source', 'ns_campaign',
+    'ns_linkname', 'ns_fee', 'sr_share', 'spm', 'guccounter', 'oc',
+} | set(getattr(settings, 'NEWS_URL_TRACKING_PARAMS', ()))
+TRACKING_PREFIXES = ('utm_', '_hs', 'hsa_', 'pk_', 'mtm_', 'at_', 'vero_')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Hosts whose links only redirect to the publisher's page
+REDIRECT_HOSTS = {
+    'news.google.com', 'feedproxy.google.com', 'feeds.feedburner.com', 't.co', 'bit.ly', 'ow.ly',
+    'dlvr.it', 'trib.al', 'apple.news', 'flip.it', 'lnkd.in', 'buff.ly',
+} | set(getattr(settings, 'NEWS_URL_REDIRECT_HOSTS', ()))
+REDIRECT_CACHE_TTL = getattr(settings, 'NEWS_URL_REDIRECT_CACHE_TTL', 30 * 24 * 3600)
+# Unresolvable wrappers are retried after this long
+REDIRECT_FAILURE_TTL = 3600
+REDIRECT_TIMEOUT = (3.05, 5)
+# Wrappers of one batch are followed concurrently
+REDIRECT_WORKERS = getattr(settings, 'NEWS_URL_REDIRECT_WORKERS', 16)
+
+GOOGLE_NEWS_PREFIX = b'\x08\x13\x22'
+EMBEDDED_URL_RE = re.compile(rb'https?://[\x21-\x7e]+')
+
+def canonicalize_url(url):
+    """
+    Canonical form of an article URL, used as its deduplication key: scheme and host lower-cased, http
+    upgraded to https, 'www.' and default ports dropped, tracking parameters and the fragment removed,
+    remaining query parameters sorted and trailing slashes removed from the path.
+    Does not follow redirects; see canonical_url().
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+
+    host = (parts.hostname or '').rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    if port and port != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{port}"
+
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/')
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+def is_redirect_wrapper(url):
+    try:
+        host = (urlsplit(url).hostname or '').lower()
+    except ValueError:
+        return False
+    return host in REDIRECT_HOSTS
+
+def decode_google_news_url(url):
+    """
+    Publisher URL embedded in a Google News article link (news.google.com/rss/articles/<id>), or None.
+    Older ids are base64-encoded protobufs holding the URL in clear; newer ones are opaque and need a request.
+    """
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split('/') if segment]
+    if len(segments) < 2 or segments[-2] != 'articles':
+        return None
+
+    article_id = segments[-1]
+    try:
+        decoded = base64.urlsafe_b64decode(article_id + '=' * (-len(article_id) % 4))
+    except (binascii.Error, ValueError):
+        return None
+
+    if decoded.startswith(GOOGLE_NEWS_PREFIX) and len(decoded) > len(GOOGLE_NEWS_PREFIX) + 2:
+        # Length-prefixed string field (single- or two-byte varint)
+        decoded = decoded[len(GOOGLE_NEWS_PREFIX):]
+        length, offset = decoded[0], 1
+        if length & 0x80:
+            length, offset = (length & 0x7f) | (decoded[1] << 7), 2
+        candidate = decoded[offset:offset + length]
+        if candidate.startswith(b'http'):
+            return candidate.decode('utf-8', errors='ignore')
+
+    match = EMBEDDED_URL_RE.search(decoded)
+    if match and not is_redirect_wrapper(match.group().decode('ascii')):
+        return match.group().decode('ascii')
+    return None
+
+class RedirectResolver:
+    """
+    Resolves links from redirect wrappers (Google News, feed proxies, URL shorteners) to the publisher URL.
+    Results, including failures, are cached in the Django cache so each wrapper is requested at most once
+    per TTL across all workers. URLs on other hosts are returned unchanged without a request.
+    Resolve whole batches with resolve_many: cached and decodable wrappers need no request and the rest
+    are followed concurrently.
+    """
+
+    def __init__(self, timeout=REDIRECT_TIMEOUT, ttl=REDIRECT_CACHE_TTL, failure_ttl=REDIRECT_FAILURE_TTL,
+                 max_workers=REDIRECT_WORKERS):
+        self.timeout = timeout
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.max_workers = max_workers
+
+    def resolve(self, url):
+        """
+        :return: Publisher URL, or the input URL if it is not a wrapper or could not be resolved.
+        """
+        return self.resolve_many([url]).get(url, url)
+
+    def resolve_many(self, urls, follow=True):
+        """
+        Resolve a batch of URLs with one cache lookup and concurrent requests for the uncached wrappers.
+        :param follow: If not set, wrappers that are neither cached nor decodable are left as they are
+                       instead of being requested.
+        :return: Dictionary of each URL to its publisher URL (the URL itself if it is not a wrapper or
+                 could not be resolved).
+        """
+        resolved = {url: url for url in urls}
+        wrappers = {self._key(url): url for url in resolved if url and is_redirect_wrapper(url)}
+        if not wrappers:
+            return resolved
+
+        cached = cache.get_many(list(wrappers))
+        found, pending = {}, {}
+        for key, url in wrappers.items():
+            if key in cached:
+                resolved[url] = cached[key]
+            elif decoded := decode_google_news_url(url):
+                resolved[url] = found[key] = decoded
+            else:
+                pending[key] = url
+        if found:
+            cache.set_many(found, timeout=self.ttl)
+
+        if follow and pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                targets = list(executor.map(self._follow, pending.values()))
+            followed = {key: target for key, target in zip(pending, targets) if target}
+            for key, url in pending.items():
+                resolved[url] = followed.get(key, url)
+            if followed:
+                cache.set_many(followed, timeout=self.ttl)
+            failed = {key: url for key, url in pending.items() if key not in followed}
+            if failed:
+                cache.set_many(failed, timeout=self.failure_ttl)
+        return resolved
+
+    def remember(self, url, target):
+        """Cache a redirect that was followed elsewhere (e.g. while downloading the page)"""
+        if target and target != url and is_redirect_wrapper(url) and not is_redirect_wrapper(target):
+            cache.set(self._key(url), target, timeout=self.ttl)
+            return True
+        return False
+
+    def _key(self, url):
+        return f"url_redirect:{hashlib.sha1(url.encode('utf-8')).hexdigest()}"
+
+    def _follow(self, url):
+        try:
+            response = requests.head(url, allow_redirects=True, timeout=self.timeout)
+            if response.status_code in (405, 501):
+                response = requests.get(url, allow_redirects=True, timeout=self.timeout, stream=True)
+                response.close()
+        except requests.RequestException as e:
+            logger.warning(f"Could not resolve redirect {url}: {e}")
+            return None
+
+        if response.url and response.url != url and not is_redirect_wrapper(response.url):
+            return response.url
+        return None
+
+_resolver = RedirectResolver()
+
+def canonical_url(url, resolve=True):
+    """
+    Deduplication key of an article URL: the wrapper is resolved (if resolve is set) and the result canonicalized.
+    Resolving may block on a request; on per-article paths pass resolve=False or use canonical_urls().
+    """
+    if resolve:
+        url = _resolver.resolve(url)
+    return canonicalize_url(url)
+
+def canonical_urls(urls, resolve=True):
+    """
+    Deduplication keys of a batch of URLs, in order. Cached and decodable wrappers are always resolved;
+    the others are requested concurrently if resolve is set, and otherwise keep the wrapper as key.
+    """
+    resolved = _resolver.resolve_many(urls, follow=resolve)
+    return [canonicalize_url(resolved.get(url, url)) for url in urls]
+
+def downloaded_canonical_url(url, final_url):
+    """
+    Deduplication key of a page that was already downloaded, using the URL the download was redirected
+    to instead of another request. The redirect is cached for later canonical_url() calls.
+    """
+    if _resolver.remember(url, final_url):
+        return canonicalize_url(final_url)
+    return canonical_url(url, resolve=False)
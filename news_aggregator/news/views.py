@@ -21,7 +21,12 @@ from rest_framework.views import APIView
 from news.fetchers.gnews_api_fetcher import GNewsApiFetcher
 from news.fetchers.google_rss_fetcher import RssFeedFetcher
 from news.fetchers.news_api_fetcher import NewsApiFetcher
+from news.fetchers.provider_fanout import ProviderFanout
+from news.fetchers.rate_limiter import budget_status
 from news.services.nlp_service import NLPPredictionService
+from news.services.payload_store import PayloadMissing, PayloadStore
+from news.services.progress_log import TaskProgressLog
+from news.services.search_coordinator import SearchSingleFlight
 from news.tasks import process_search_results
 
 from .models import (
@@ -35,7 +40,7 @@ from .models import (
     Sources,
     UserInteraction,
 )
-from .tasks import generate_recommendations, process_and_store_articles
+from .tasks import generate_recommendations, start_article_ingestion
 
 
 logger = logging.getLogger(__name__)
@@ -167,7 +172,7 @@ class ArticleListView(APIView):
       source, sorted by newest, oldest, random, popular
     """
     def get(self, request):
-        qs = Articles.objects.all()
+        qs = Articles.objects.filter(canonical_article__isnull=True)
 
         # Filters
         category = request.query_params.get('category')
@@ -264,7 +269,7 @@ class FeedCategoryArticlesView(APIView):
     """Return articles belonging to a feed category"""
 
     def get(self, request, category):
-        articles = Articles.objects.filter(categories__icontains=category).order_by('-published_date')[:50]
+        articles = Articles.objects.filter(categories__icontains=category, canonical_article__isnull=True).order_by('-published_date')[:50]
         data = [{
             'id': a.id,
             'title': a.title,
@@ -315,7 +320,7 @@ class SourceArticlesView(APIView):
     """Return articles belonging to a given source"""
 
     def get(self, request, source_id):
-        articles = Articles.objects.filter(source_id=source_id).order_by('-published_date')[:50]
+        articles = Articles.objects.filter(source_id=source_id, canonical_article__isnull=True).order_by('-published_date')[:50]
         data = [{
             'id': a.id,
             'title': a.title,
@@ -340,7 +345,7 @@ class ArticleOrSearchView(APIView):
     """
 
     def get(self, request):
-        qs = Articles.objects.all()
+        qs = Articles.objects.filter(canonical_article__isnull=True)
         or_filter = Q()
 
         category = request.query_params.get('category')
@@ -432,24 +437,25 @@ def search_and(request):
         # For AND search, we can pass the query directly to both APIs
         # since they both support space-separated terms for AND logic
         
-        # Process the search using the NewsAPI fetcher
-        newsapi_fetcher = NewsApiFetcher()
-        newsapi_articles = newsapi_fetcher.fetch_articles(query, language=language)
-        
-        # Process the search using GNews fetcher
-        gnews_fetcher = GNewsApiFetcher()
-        gnews_articles = gnews_fetcher.fetch_articles(query, language=language)
-        
-        # Combine results
-        all_articles = newsapi_articles + gnews_articles
-        
-        # Process and return results
-        task = process_search_results.delay(all_articles)
+        def start_search():
+            # Query both providers concurrently, keeping what arrives within the deadline
+            fanout = ProviderFanout().run({
+                'newsapi': lambda: NewsApiFetcher().fetch_articles(query, language=language),
+                'gnews': lambda: GNewsApiFetcher().fetch_articles(query, language=language),
+            })
+            task = process_search_results.delay(PayloadStore().put(fanout.articles, prefix="search"))
+            return {'task_id': str(task.id), **fanout.metadata()}
+
+        # Identical concurrent searches share one fetch and one task
+        single_flight = SearchSingleFlight()
+        result, shared = single_flight.run(single_flight.key('AND', query, language, country), start_search)
         
         # Return the task ID as a string
         return Response({
             'status': 'started',
-            'task_id': str(task.id)
+            'shared': shared,
+            'progress_ws': f"/ws/tasks/{result['task_id']}/",
+            **result,
         })
     
     except Exception as e:
@@ -487,19 +493,36 @@ def search_or(request):
     
     logger.info(f"OR search query transformed: '{raw_query}' -> '{api_query}'")
     
-    # Use the same query format for both APIs
-    newsapi_articles = NewsApiFetcher().fetch_articles(api_query, language=language)
-    gnews_articles = GNewsApiFetcher().fetch_articles(api_query, language=language, country=country)
-    
     # For RSS feed, build a separate query with spaces (no OR operators)
     rss_query = " ".join([p.strip('"') for p in phrases] + terms)
-    rss_articles = RssFeedFetcher().fetch_feed(query=rss_query, language=(language or 'en').lower(), country=(country or 'US').upper())
 
-    all_articles = newsapi_articles + gnews_articles + rss_articles
-    task = process_and_store_articles.delay(all_articles, language, country, extracted_terms=terms, extracted_phrases=phrases)
+    def start_search():
+        # Use the same query format for both APIs; all providers are queried concurrently
+        fanout = ProviderFanout().run({
+            'newsapi': lambda: NewsApiFetcher().fetch_articles(api_query, language=language),
+            'gnews': lambda: GNewsApiFetcher().fetch_articles(api_query, language=language, country=country),
+            'rss': lambda: RssFeedFetcher().fetch_feed(query=rss_query, language=(language or 'en').lower(), country=(country or 'US').upper()),
+        })
+        task_id = start_article_ingestion(fanout.articles, language, country, extracted_terms=terms, extracted_phrases=phrases)
+        return {"task_id": task_id, **fanout.metadata()}
+
+    # Identical concurrent searches share one fetch and one ingestion task, and poll the same progress
+    single_flight = SearchSingleFlight()
+    result, shared = single_flight.run(single_flight.key('OR', api_query, language, country), start_search)
+
+    return Response({
+        "status": "started",
+        "search_type": "OR",
+        "shared": shared,
+        "progress_ws": f"/ws/tasks/{result['task_id']}/",
+        **result,
+    })
 
-    return Response({"task_id": task.id, "status": "started", "search_type": "OR"})
 
+@api_view(['GET'])
+def provider_budgets(request):
+    """Remaining request budget of each news provider"""
+    return Response({'providers': budget_status()})
 
 def build_query_string(terms, phrases, operator):
     parts = []
@@ -528,14 +551,39 @@ from celery.result import AsyncResult
 
 @api_view(['GET'])
 def poll_task_articles(request, task_id):
-    """Poll for the status of a search task and return results if ready"""
+    """
+    Poll for the status of a search task and return results if ready.
+    With ?offset=N, ingestion tasks instead return the articles stored since the first N, as they arrive,
+    together with the offset to pass on the next poll.
+    """
     task = AsyncResult(task_id)
-    
+
+    offset = request.query_params.get('offset')
+    if offset is not None:
+        try:
+            offset = max(int(offset), 0)
+        except ValueError:
+            return Response({'error': "Query parameter 'offset' must be an integer"}, status=400)
+
+        progress = TaskProgressLog(task_id).read(offset)
+        # Tasks that keep no progress log (or an unreachable Redis) fall back to the plain response
+        if progress is not None and not (progress['status'] == 'pending' and task.ready()):
+            if progress['status'] != 'completed' and task.failed():
+                return Response({**progress, 'status': 'error', 'error': str(task.result)}, status=500)
+            return Response(progress)
+
     if task.ready():
         if task.successful():
+            result = task.result
+            if isinstance(result, dict) and 'payload_key' in result:
+                # Formatted search results are kept in the payload store, not the result backend
+                try:
+                    result = PayloadStore().get(result['payload_key'])
+                except PayloadMissing:
+                    return Response({'status': 'expired', 'error': 'Search results expired, please search again'}, status=410)
             return Response({
                 'status': 'completed',
-                'articles': task.result
+                'articles': result
             })
         else:
             return Response({
@@ -739,9 +787,9 @@ def get_real_time_recommendations(user, category, page, page_size):
     if user_articles_with_embeddings.count() < MIN_ARTICLES_FOR_RECOMMENDATIONS:
         # Not enough data, fall back to newest articles with optional category filter
         if category.lower() == 'all categories':
-            fallback_articles = Articles.objects.all().order_by('-published_date')
+            fallback_articles = Articles.objects.filter(canonical_article__isnull=True).order_by('-published_date')
         else:
-            fallback_articles = Articles.objects.filter(categories__icontains=category).order_by('-published_date')
+            fallback_articles = Articles.objects.filter(categories__icontains=category, canonical_article__isnull=True).order_by('-published_date')
         
         # Paginate fallback results
         start_idx = (page - 1) * page_size
@@ -769,7 +817,7 @@ def get_real_time_recommendations(user, category, page, page_size):
     mean_embedding = np.mean(embeddings_array, axis=0).tolist()
     
     # Query for similar articles, excluding already interacted ones
-    base_query = Articles.objects.exclude(id__in=user_articles.values_list('id', flat=True))
+    base_query = Articles.objects.filter(canonical_article__isnull=True).exclude(id__in=user_articles.values_list('id', flat=True))
     
     # Apply category filter
     if category.lower() != 'all categories':
@@ -811,10 +859,10 @@ class ArticleCategoryView(APIView):
         
         # Start with all articles if category is "All categories"
         if category.lower() == 'all categories':
-            qs = Articles.objects.all()
+            qs = Articles.objects.filter(canonical_article__isnull=True)
         else:
             # Filter by specific category
-            qs = Articles.objects.filter(categories__icontains=category)
+            qs = Articles.objects.filter(categories__icontains=category, canonical_article__isnull=True)
         
         if sort == 'newest':
             qs = qs.order_by('-published_date')
@@ -1152,16 +1200,12 @@ def direct_search(request):
             
             logger.info(f"AND search query: '{query}'")
         
-        # Process the search using the NewsAPI fetcher
-        newsapi_fetcher = NewsApiFetcher()
-        newsapi_articles = newsapi_fetcher.fetch_articles(newsapi_query, language=language)
-        
-        # Process the search using GNews fetcher
-        gnews_fetcher = GNewsApiFetcher()
-        gnews_articles = gnews_fetcher.fetch_articles(gnews_query, language=language, country=country)
-        
-        # Combine results
-        all_articles = newsapi_articles + gnews_articles
+        # Query both providers concurrently, keeping what arrives within the deadline
+        fanout = ProviderFanout().run({
+            'newsapi': lambda: NewsApiFetcher().fetch_articles(newsapi_query, language=language),
+            'gnews': lambda: GNewsApiFetcher().fetch_articles(gnews_query, language=language, country=country),
+        })
+        all_articles = fanout.articles
         DEFAULT_IMAGE_URL = 'https://raw.githubusercontent.com/mMelnic/news-fake-detection/refs/heads/users/news_aggregator/newspaper_beige.jpg'
         
         processed_articles = []
@@ -1213,7 +1257,8 @@ def direct_search(request):
         
         return Response({
             'articles': processed_articles,
-            'count': len(processed_articles)
+            'count': len(processed_articles),
+            **fanout.metadata(),
         })
     
     except Exception as e:
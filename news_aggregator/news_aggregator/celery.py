@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from kombu import Queue
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'news_aggregator.settings')
@@ -13,6 +14,22 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
 
+# The ingestion stages run on their own queues (news.services.ingestion_service.DEFAULT_INGESTION_STAGES).
+# Declaring them with the default queue makes a worker started without -Q consume all of them;
+# dedicated workers per stage select theirs with -Q (see README).
+INGESTION_QUEUES = ('ingest_store', 'ingest_enrich', 'ingest_apply')
+app.conf.task_default_queue = 'celery'
+app.conf.task_queues = [Queue('celery')] + [Queue(name) for name in INGESTION_QUEUES]
+
+# Feeds are polled on their own adaptive schedule (news.services.feed_scheduler);
+# beat only wakes the dispatcher that queues the feeds that are due.
+app.conf.beat_schedule = {
+    'dispatch-due-feeds': {
+        'task': 'news.tasks.dispatch_due_feeds',
+        'schedule': 60.0,
+    },
+}
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
\ No newline at end of file
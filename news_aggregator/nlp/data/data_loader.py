@@ -1,5 +1,8 @@
 import pandas as pd
 import json
+from typing import Iterator
+
+DEFAULT_CHUNK_SIZE = 50_000
 
 class DatasetLoader:
     def load_json(self, file_path: str, required_columns: list[str]) -> pd.DataFrame:
@@ -64,3 +67,68 @@ class DatasetLoader:
         except ValueError as ve:
             print(f"Error: {ve}")
             return pd.DataFrame()
+
+    def iter_json(self, file_path: str, required_columns: list[str], chunksize: int = DEFAULT_CHUNK_SIZE,
+                  dtype: dict = None) -> Iterator[pd.DataFrame]:
+        """
+        Streams a JSON lines dataset as DataFrame chunks, keeping only the required columns.
+        Only one chunk of parsed records is held in memory at a time.
+        :param file_path: Path to the dataset file.
+        :param required_columns: List of columns to extract.
+        :param chunksize: Number of lines per chunk.
+        :param dtype: Optional mapping of column name to dtype applied to each chunk.
+        :return: An iterator of pandas DataFrames.
+        """
+        with open(file_path, 'r') as file:
+            records = []
+            for line in file:
+                record = json.loads(line)
+                records.append({column: record.get(column) for column in required_columns})
+                if len(records) >= chunksize:
+                    yield self._build_chunk(records, required_columns, dtype)
+                    records = []
+            if records:
+                yield self._build_chunk(records, required_columns, dtype)
+
+    def iter_csv(self, file_path: str, required_columns: list[str] = None, chunksize: int = DEFAULT_CHUNK_SIZE,
+                 dtype: dict = None) -> Iterator[pd.DataFrame]:
+        """
+        Streams a CSV file as DataFrame chunks with column projection.
+        :param file_path: Path to the CSV file.
+        :param required_columns: List of columns to extract. If None, all columns will be loaded.
+        :param chunksize: Number of rows per chunk.
+        :param dtype: Optional mapping of column name to dtype passed to the CSV parser.
+        :return: An iterator of pandas DataFrames.
+        :raises ValueError: If the file cannot be parsed, including in a chunk after some were already yielded,
+                            so a malformed file never passes for a shorter complete one.
+        """
+        rows = 0
+        try:
+            for chunk in pd.read_csv(file_path, usecols=required_columns, dtype=dtype, chunksize=chunksize):
+                rows += len(chunk)
+                yield chunk
+        except FileNotFoundError:
+            print(f"Error: File not found at path {file_path}")
+        except ValueError as ve:
+            print(f"Error: Could not parse {file_path} after {rows} rows: {ve}")
+            raise
+
+    def iter_fake_news_data(self, true_path: str, fake_path: str, chunksize: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Streaming variant of load_fake_news_data. Reads only the 'title' column of both files
+        and yields labelled chunks, TRUE rows first.
+        :param true_path: Path to the TRUE.csv file.
+        :param fake_path: Path to the FAKE.csv file.
+        :param chunksize: Number of rows per chunk.
+        :return: An iterator of pandas DataFrames with 'title' and 'label' columns.
+        """
+        for path, label in ((true_path, 1), (fake_path, 0)):
+            for chunk in self.iter_csv(path, ["title"], chunksize=chunksize, dtype={"title": "string"}):
+                chunk["label"] = label
+                yield chunk
+
+    def _build_chunk(self, records: list[dict], required_columns: list[str], dtype: dict = None) -> pd.DataFrame:
+        chunk = pd.DataFrame.from_records(records, columns=required_columns)
+        if dtype:
+            chunk = chunk.astype(dtype)
+        return chunk
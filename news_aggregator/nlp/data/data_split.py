@@ -1,5 +1,7 @@
 from sklearn.model_selection import train_test_split
 from sklearn.utils.class_weight import compute_class_weight
+from collections import Counter
+import pandas as pd
 import numpy as np
 
 class DatasetSplitter:
@@ -39,4 +41,46 @@ class DatasetSplitter:
             classes=classes, 
             y=data[label_column]
         )
-        return {cls: float(w) for cls, w in zip(classes, new_weights)}
\ No newline at end of file
+        return {cls: float(w) for cls, w in zip(classes, new_weights)}
+
+    def split_chunks(self, chunks, key_column, label_counts=None, train_size=0.7, val_size=0.15, random_state=42):
+        """
+        Streaming split for data that does not fit in memory.
+        Each row is assigned to train, validation or test by hashing its key column with the seed,
+        so the assignment is deterministic across runs and identical rows always land in the same split.
+        Class proportions are preserved in expectation rather than exactly as in stratified_split.
+        :param chunks: Iterator of DataFrames, e.g. from DatasetLoader.iter_csv or ChunkedDataCleaner.chunks.
+        :param key_column: Column hashed to choose the split (usually the text column).
+        :param label_counts: Optional dict of Counters keyed by split name, updated with the 'label' column
+                             of every yielded chunk so class weights can be computed afterwards.
+        :param train_size: Proportion of data to allocate to training.
+        :param val_size: Proportion to allocate to validation.
+        :param random_state: Seed mixed into the hash.
+        :return: Iterator of (split_name, chunk) tuples with split_name in 'train', 'val', 'test'.
+        """
+        train_cut = np.uint64(train_size * 2**32)
+        val_cut = np.uint64((train_size + val_size) * 2**32)
+        for chunk in chunks:
+            hashes = pd.util.hash_pandas_object(chunk[key_column], index=False, hash_key=f"{random_state:016d}"[:16]).to_numpy()
+            buckets = hashes >> np.uint64(32)
+            assignments = {
+                "train": buckets < train_cut,
+                "val": (buckets >= train_cut) & (buckets < val_cut),
+                "test": buckets >= val_cut,
+            }
+            for split, mask in assignments.items():
+                part = chunk[mask]
+                if part.empty:
+                    continue
+                if label_counts is not None and "label" in part.columns:
+                    label_counts.setdefault(split, Counter()).update(part["label"].tolist())
+                yield split, part
+
+    def class_weights_from_counts(self, counts):
+        """
+        Balanced class weights from label counts, matching compute_class_weight('balanced').
+        :param counts: Mapping of class label to number of samples.
+        :return: Dictionary of class label to weight.
+        """
+        total = sum(counts.values())
+        return {cls: float(total / (len(counts) * count)) for cls, count in counts.items()}
@@ -1,8 +1,42 @@
+from concurrent.futures import ProcessPoolExecutor
 from transformers import AutoTokenizer
 import pandas as pd
+import numpy as np
+import hashlib
+import os
+
+_worker_tokenizer = None
+# Below this many rows formatting is faster in-process than the cost of starting a pool and pickling rows
+PARALLEL_FORMAT_MIN_ROWS = 100_000
+
+def _init_tokenizer_worker(tokenizer_name: str):
+    """
+    Loads the tokenizer once per worker process.
+    The fast tokenizer's own thread pool is disabled since the process pool already uses every core.
+    """
+    global _worker_tokenizer
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    _worker_tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+
+def _tokenize_chunk(args):
+    """
+    Tokenizes one chunk of texts without padding so chunks can be padded to a common length afterwards.
+    :param args: Tuple of (texts, max_length).
+    :return: List of input id lists.
+    """
+    texts, max_length = args
+    encoded = _worker_tokenizer(texts, padding=False, truncation=True, max_length=max_length)
+    return encoded["input_ids"]
+
+def _format_token_rows(rows):
+    """
+    Formats rows of token ids the same way str(list) does, which is what the collate function parses back.
+    """
+    return ["[" + ", ".join(map(str, row)) + "]" for row in rows]
 
 class DataPreprocessor:
     def __init__(self, tokenizer_name: str = "distilroberta-base"):
+        self.tokenizer_name = tokenizer_name
         self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
 
     def clean_text(self, text: str) -> str:
@@ -16,6 +50,23 @@ class DataPreprocessor:
         text = text.strip()
         return text
 
+    def clean_series(self, texts: pd.Series) -> pd.Series:
+        """
+        Vectorized equivalent of clean_text for a whole column.
+        :param texts: Series of raw text inputs.
+        :return: Series of cleaned strings, with missing and non-string values replaced by an empty string.
+        """
+        if isinstance(texts.dtype, pd.StringDtype):
+            texts = texts.fillna("")
+        elif pd.api.types.is_object_dtype(texts):
+            # Like clean_text, values that are not strings (numbers, None, NaN) become ""
+            is_text = np.fromiter((isinstance(value, str) for value in texts), dtype=bool, count=len(texts))
+            texts = texts.where(is_text, "")
+        else:
+            # e.g. an all-NaN column read from CSV as float: there is no text to keep
+            return pd.Series("", index=texts.index, dtype=object)
+        return texts.astype("string").str.strip().astype(object)
+
     def encode_labels(self, data: pd.DataFrame, label_column: str) -> pd.DataFrame:
         """
         Encodes categorical labels into numeric format.
@@ -36,7 +87,7 @@ class DataPreprocessor:
         :param max_length: Maximum sequence length for the tokenizer.
         :return: Tokenized inputs as a dictionary of tensors.
         """
-        
+
         encoded_data = self.tokenizer(
             list(data[text_column]),
             padding=True,
@@ -44,4 +95,82 @@ class DataPreprocessor:
             max_length=max_length,
             return_tensors='pt'
         )
-        return encoded_data
\ No newline at end of file
+        return encoded_data
+
+    def tokenize_parallel(self, data: pd.DataFrame, text_column: str, max_length: int = 50,
+                          chunk_size: int = 4096, num_workers: int = None, cache_dir: str = None):
+        """
+        Tokenizes a text column in chunks across a process pool.
+        Output matches tokenize(): every row is padded to the longest sequence in the column.
+        :param data: DataFrame containing the text to tokenize.
+        :param text_column: Column to use as input.
+        :param max_length: Maximum sequence length for the tokenizer.
+        :param chunk_size: Number of texts sent to a worker at once.
+        :param num_workers: Size of the process pool. Defaults to the number of CPUs.
+        :param cache_dir: Optional directory for the content-hash cache. Unchanged inputs are loaded from it instead of re-tokenized.
+        :return: Dictionary with 'input_ids' and 'attention_mask' as numpy arrays.
+        """
+        texts = list(data[text_column])
+        cache_path = None
+        if cache_dir:
+            cache_path = os.path.join(cache_dir, f"{self.content_hash(texts, max_length)}.npz")
+            if os.path.exists(cache_path):
+                cached = np.load(cache_path)
+                return {"input_ids": cached["input_ids"], "attention_mask": cached["attention_mask"]}
+
+        chunks = [(texts[i:i + chunk_size], max_length) for i in range(0, len(texts), chunk_size)]
+        num_workers = num_workers or os.cpu_count() or 1
+
+        if num_workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_tokenizer_worker,
+                                     initargs=(self.tokenizer_name,)) as pool:
+                rows = [row for chunk_rows in pool.map(_tokenize_chunk, chunks) for row in chunk_rows]
+        else:
+            rows = self.tokenizer(texts, padding=False, truncation=True, max_length=max_length)["input_ids"] if texts else []
+
+        seq_len = max((len(row) for row in rows), default=0)
+        input_ids = np.full((len(rows), seq_len), self.tokenizer.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(rows), seq_len), dtype=np.int64)
+        for i, row in enumerate(rows):
+            input_ids[i, :len(row)] = row
+            attention_mask[i, :len(row)] = 1
+
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            np.savez(cache_path, input_ids=input_ids, attention_mask=attention_mask)
+
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+    def format_token_column(self, token_array: np.ndarray, chunk_size: int = 16384, num_workers: int = None) -> list[str]:
+        """
+        Converts a 2D token array into the list-literal strings stored in the split CSV files.
+        :param token_array: Array of shape (rows, seq_len).
+        :param chunk_size: Number of rows formatted per worker task.
+        :param num_workers: Size of the process pool. Defaults to the number of CPUs.
+        :return: List of strings such as '[0, 713, 2]'.
+        """
+        rows = token_array.tolist()
+        if len(rows) < PARALLEL_FORMAT_MIN_ROWS:
+            return _format_token_rows(rows)
+
+        chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+        num_workers = num_workers or os.cpu_count() or 1
+
+        if num_workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=num_workers) as pool:
+                return [line for chunk in pool.map(_format_token_rows, chunks) for line in chunk]
+        return _format_token_rows(rows)
+
+    def content_hash(self, texts: list[str], max_length: int) -> str:
+        """
+        Hashes the tokenizer settings together with the input texts.
+        :param texts: Texts to be tokenized.
+        :param max_length: Maximum sequence length for the tokenizer.
+        :return: Hex digest identifying this exact tokenization job.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{self.tokenizer_name}|{max_length}|{len(texts)}".encode("utf-8"))
+        for text in texts:
+            digest.update(b"\x1f")
+            digest.update(str(text).encode("utf-8"))
+        return digest.hexdigest()
@@ -1,7 +1,30 @@
-import re
 from collections import Counter
 from nlp.data.data_loader import DatasetLoader
 import pandas as pd
+import numpy as np
+
+def normalize_special_characters(texts):
+    """
+    Vectorized normalization of curly quotes, dashes and whitespace for a whole column.
+    :param texts: Series of raw text values.
+    :return: Series of normalized strings.
+    """
+    return (
+        texts.astype(str)
+        .str.replace(r"[“”]", '"', regex=True)  # Replace curly quotes with double quotes
+        .str.replace(r"[‘’]", "'", regex=True)  # Replace curly apostrophe with a single quote
+        .str.replace(r"[–—]", "-", regex=True)  # Normalize dashes
+        .str.replace(r"\s+", " ", regex=True)  # Remove extra spaces
+        .str.strip()
+    )
+
+def count_words(texts):
+    """
+    Vectorized whitespace word count for a whole column.
+    :param texts: Series of text values.
+    :return: Series of word counts.
+    """
+    return texts.astype(str).str.count(r"\S+")
 
 class DataCleaner:
     def __init__(self, loader, file_path=None, file_type="csv", required_columns=None, true_path=None, fake_path=None):
@@ -29,14 +52,7 @@ class DataCleaner:
         Normalizes special characters such as curly quotes and dashes.
         :param text_column: Name of the column containing text data.
         """
-        def normalize_text(text):
-            text = re.sub(r"[“”]", '"', str(text))  # Replace curly quotes with double quotes
-            text = re.sub(r"[‘’]", "'", str(text))  # Replace curly apostrophe with a single quote
-            text = re.sub(r"[–—]", "-", text)  # Normalize dashes
-            text = re.sub(r"\s+", " ", text).strip()  # Remove extra spaces
-            return text
-
-        self.data[text_column] = self.data[text_column].apply(normalize_text)
+        self.data[text_column] = normalize_special_characters(self.data[text_column])
 
     def remove_duplicates(self, text_column):
         """
@@ -55,7 +71,7 @@ class DataCleaner:
         :param min_words: Minimum number of words required in an entry.
         """
         before_count = len(self.data)
-        self.data = self.data[self.data[text_column].apply(lambda x: len(str(x).split()) >= min_words)]
+        self.data = self.data[count_words(self.data[text_column]) >= min_words]
         after_count = len(self.data)
         print(f"Removed {before_count - after_count} short text entries.")
 
@@ -98,6 +114,96 @@ class DataCleaner:
         self.data.to_csv(output_path, index=False)
         print(f"Cleaned dataset saved to {output_path}")
 
+class ChunkedDataCleaner:
+    def __init__(self, chunks):
+        """
+        Cleaning pipeline over an iterator of DataFrame chunks, e.g. from DatasetLoader.iter_csv or iter_json.
+        Every step is lazy and nothing is read until save_cleaned_data consumes the stream,
+        so peak memory is bounded by the chunk size plus a set of the row hashes kept for de-duplication
+        (a Python int in a set, roughly 60-100 bytes per kept row).
+        Steps that need the whole dataset at once (such as balance_classes) are only available on DataCleaner.
+        :param chunks: Iterator of pandas DataFrames.
+        """
+        self.chunks = iter(chunks)
+
+    def clean_special_characters(self, text_column):
+        """
+        Normalizes special characters such as curly quotes and dashes in every chunk.
+        :param text_column: Name of the column containing text data.
+        """
+        def step(chunks):
+            for chunk in chunks:
+                chunk[text_column] = normalize_special_characters(chunk[text_column])
+                yield chunk
+        self.chunks = step(self.chunks)
+
+    def remove_duplicates(self, text_column):
+        """
+        Removes duplicate records based on the specified text column, across chunk boundaries.
+        :param text_column: Name of the column containing text data.
+        """
+        def step(chunks):
+            # Hashes of every kept text; set lookups keep each chunk's cost independent of the rows seen so far
+            seen = set()
+            removed = 0
+            for chunk in chunks:
+                hashes = pd.util.hash_pandas_object(chunk[text_column], index=False).to_numpy().tolist()
+                already_seen = np.fromiter((h in seen for h in hashes), dtype=bool, count=len(hashes))
+                keep = ~chunk[text_column].duplicated().to_numpy() & ~already_seen
+                removed += int((~keep).sum())
+                seen.update(h for h, kept in zip(hashes, keep) if kept)
+                yield chunk[keep]
+            print(f"Removed {removed} duplicate records.")
+        self.chunks = step(self.chunks)
+
+    def filter_short_texts(self, text_column, min_words=5):
+        """
+        Removes text entries that contain fewer than `min_words` words.
+        :param text_column: Name of the column containing text data.
+        :param min_words: Minimum number of words required in an entry.
+        """
+        def step(chunks):
+            removed = 0
+            for chunk in chunks:
+                mask = count_words(chunk[text_column]) >= min_words
+                removed += int((~mask).sum())
+                yield chunk[mask]
+            print(f"Removed {removed} short text entries.")
+        self.chunks = step(self.chunks)
+
+    def rename_rows_by_value(self, column_name, old_value, new_value):
+        """
+        Renames the rows where the column's value matches `old_value` to `new_value`.
+        :param column_name: The column to search for the `old_value`.
+        :param old_value: The value in the column that you want to rename.
+        :param new_value: The new value to replace the old value with.
+        """
+        def step(chunks):
+            for chunk in chunks:
+                if column_name not in chunk.columns:
+                    raise ValueError(f"Column '{column_name}' does not exist in the DataFrame.")
+                chunk[column_name] = chunk[column_name].replace(old_value, new_value)
+                yield chunk
+        self.chunks = step(self.chunks)
+
+    def rename_columns(self, columns):
+        """
+        Renames columns in every chunk.
+        :param columns: Mapping of old column names to new ones.
+        """
+        self.chunks = (chunk.rename(columns=columns) for chunk in self.chunks)
+
+    def save_cleaned_data(self, output_path):
+        """
+        Consumes the stream and appends each cleaned chunk to a CSV file.
+        :param output_path: Path to save the cleaned dataset.
+        """
+        total = 0
+        for i, chunk in enumerate(self.chunks):
+            chunk.to_csv(output_path, index=False, mode="w" if i == 0 else "a", header=i == 0)
+            total += len(chunk)
+        print(f"Cleaned dataset of {total} rows saved to {output_path}")
+
 if __name__ == '__main__':
     loader = DatasetLoader()
     cleaner = DataCleaner(loader, "nlp/data/datasets/news.csv", file_type="csv", required_columns=["news", "sentiment"])
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import torch
+from safetensors.torch import load_file, save_file
+from transformers import AutoConfig, AutoTokenizer
+from .multitask_model import MultiTaskModel
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+WEIGHTS_FILE = "model.safetensors"
+TOKENIZER_DIR = "tokenizer"
+CURRENT_POINTER_FILE = "CURRENT"
+# Manifest fields that describe an export but not its contents
+UNVERSIONED_FIELDS = ("version", "source")
+
+STORAGE_DTYPES = {
+    "fp32": torch.float32,
+    "fp16": torch.float16,
+    "bf16": torch.bfloat16,
+}
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_directory(directory):
+    """
+    Hashes every file below a directory.
+    :return: Dictionary of relative path to sha256 hex digest, sorted by path.
+    """
+    hashes = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            hashes[os.path.relpath(path, directory).replace(os.sep, "/")] = file_sha256(path)
+    return dict(sorted(hashes.items()))
+
+def manifest_version(manifest, exclude=UNVERSIONED_FIELDS):
+    """
+    Derives the bundle version from the manifest contents (file hashes included), so identical exports get identical versions.
+    The checkpoint path the bundle was exported from is kept in the manifest but not hashed.
+    """
+    payload = {key: value for key, value in manifest.items() if key not in exclude}
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+def read_manifest(bundle_dir):
+    with open(os.path.join(bundle_dir, MANIFEST_FILE), "r") as f:
+        return json.load(f)
+
+def verify_bundle(bundle_dir):
+    """
+    Checks that the files on disk still match the hashes recorded in the manifest.
+    :raises ValueError: If a file is missing or was modified.
+    """
+    manifest = read_manifest(bundle_dir)
+    for relative_path, expected in manifest["files"].items():
+        path = os.path.join(bundle_dir, relative_path)
+        if not os.path.exists(path) or file_sha256(path) != expected:
+            raise ValueError(f"Bundle file {relative_path} is missing or does not match the manifest")
+    # Bundles exported before the source path was left out of the version hashed it too
+    if manifest["version"] not in (manifest_version(manifest), manifest_version(manifest, exclude=("version",))):
+        raise ValueError("Bundle manifest does not match its version")
+    return manifest
+
+def load_bundle(bundle_dir, device="cpu", verify=False):
+    """
+    Loads an exported inference bundle without contacting the Hugging Face hub.
+    Weights stored in reduced precision are upcast to float32.
+    :param bundle_dir: Directory of one bundle version.
+    :param device: Device to move the model to.
+    :param verify: Re-hash the bundle files before loading.
+    :return: Tuple of (model in eval mode, tokenizer, manifest).
+    """
+    manifest = verify_bundle(bundle_dir) if verify else read_manifest(bundle_dir)
+
+    encoder_config = AutoConfig.from_pretrained(bundle_dir, local_files_only=True)
+    model = MultiTaskModel(manifest["model_name"], manifest["tasks"], encoder_config=encoder_config)
+
+    state_dict = load_file(os.path.join(bundle_dir, WEIGHTS_FILE), device="cpu")
+    state_dict = {key: value.float() if value.is_floating_point() else value for key, value in state_dict.items()}
+    model.load_state_dict(state_dict, strict=True)
+    model.eval()
+    model.to(device)
+
+    tokenizer = AutoTokenizer.from_pretrained(os.path.join(bundle_dir, TOKENIZER_DIR), local_files_only=True)
+    return model, tokenizer, manifest
+
+def write_bundle(output_root, model_name, encoder_config, tokenizer, state_dict, tasks, label_maps, storage_dtype="fp32", source=None):
+    """
+    Writes an inference bundle to output_root/<version>/ and returns that directory.
+    The bundle is assembled in a temporary directory and renamed into place once complete.
+    :param output_root: Directory holding all bundle versions.
+    :param model_name: Name of the pretrained encoder the model was trained from.
+    :param encoder_config: Encoder config, saved as config.json.
+    :param tokenizer: Tokenizer to vendor into the bundle.
+    :param state_dict: MultiTaskModel state dict restricted to the encoder and the selected heads.
+    :param tasks: Dictionary of task name to number of classes.
+    :param label_maps: Dictionary of task name to {class index: label}.
+    :param storage_dtype: One of 'fp32', 'fp16' or 'bf16'.
+    :param source: Optional description of the checkpoint the bundle was exported from.
+    """
+    dtype = STORAGE_DTYPES[storage_dtype]
+    os.makedirs(output_root, exist_ok=True)
+    # Unique per export, so a crashed run never blocks a retry
+    staging_dir = tempfile.mkdtemp(prefix=".staging-", dir=output_root)
+    try:
+        tensors = {
+            key: (value.to(dtype) if value.is_floating_point() else value).contiguous()
+            for key, value in state_dict.items()
+        }
+        save_file(tensors, os.path.join(staging_dir, WEIGHTS_FILE))
+        encoder_config.save_pretrained(staging_dir)
+        tokenizer.save_pretrained(os.path.join(staging_dir, TOKENIZER_DIR))
+
+        manifest = {
+            "format_version": BUNDLE_FORMAT_VERSION,
+            "model_name": model_name,
+            "tasks": tasks,
+            "label_maps": {task: {str(k): v for k, v in mapping.items()} for task, mapping in label_maps.items() if task in tasks},
+            "storage_dtype": storage_dtype,
+            "source": source,
+            "files": hash_directory(staging_dir),
+        }
+        manifest["version"] = manifest_version(manifest)
+        with open(os.path.join(staging_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+        bundle_dir = os.path.join(output_root, manifest["version"])
+        if os.path.exists(bundle_dir):
+            # Same content was exported before; keep the existing copy
+            shutil.rmtree(staging_dir)
+        else:
+            # mkdtemp creates the directory private to this user; bundles are read by the serving processes
+            os.chmod(staging_dir, 0o755)
+            os.rename(staging_dir, bundle_dir)
+    except BaseException:
+        # Never leave partial weights behind
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    return bundle_dir
+
+def read_current_version(output_root):
+    """Returns the version named in output_root/CURRENT, or None."""
+    try:
+        with open(os.path.join(output_root, CURRENT_POINTER_FILE), "r") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def set_current_version(output_root, version):
+    """Atomically points output_root/CURRENT at a bundle version."""
+    if not os.path.isdir(os.path.join(output_root, version)):
+        raise ValueError(f"No bundle with version {version} in {output_root}")
+    tmp_path = os.path.join(output_root, f".{CURRENT_POINTER_FILE}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(output_root, CURRENT_POINTER_FILE))
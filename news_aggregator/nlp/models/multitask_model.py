@@ -3,21 +3,19 @@ from .heads import TaskHeadFactory
 import torch.nn as nn
 
 class MultiTaskModel(nn.Module):
-    _instance = None
-
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super(MultiTaskModel, cls).__new__(cls)
-        return cls._instance
-
-    def __init__(self, model_name, task_heads_config):
+    def __init__(self, model_name, task_heads_config, encoder_config=None):
         """
         Initialize the multi-task model.
         :param model_name: Pretrained model name (e.g., 'roberta-base').
         :param task_heads_config: A dictionary containing task names and the number of classes for each.
+        :param encoder_config: Optional encoder config. When given, the encoder is built from it without
+                               downloading pretrained weights (used when loading an exported inference bundle).
         """
         super(MultiTaskModel, self).__init__()
-        self.shared_encoder = AutoModel.from_pretrained(model_name)
+        if encoder_config is not None:
+            self.shared_encoder = AutoModel.from_config(encoder_config)
+        else:
+            self.shared_encoder = AutoModel.from_pretrained(model_name)
         self.dropout = nn.Dropout(0.1)
         self.heads = nn.ModuleDict({
             task_name: TaskHeadFactory.create_head(task_name, self.shared_encoder.config.hidden_size, num_classes)
@@ -1,3 +1,24 @@
-from django.test import TestCase
+import pandas as pd
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from nlp.data.preprocess import DataPreprocessor
+
+class CleanSeriesTestCase(SimpleTestCase):
+
+    def setUp(self):
+        # clean_text and clean_series do not use the tokenizer, so skip loading it
+        self.preprocessor = DataPreprocessor.__new__(DataPreprocessor)
+
+    def test_matches_clean_text_on_mixed_input(self):
+        """The vectorized cleaner gives the same result as clean_text for strings, numbers and missing values."""
+        values = ["  Headline one ", 42, 3.5, None, float("nan"), "", True, "plain"]
+
+        cleaned = self.preprocessor.clean_series(pd.Series(values, dtype=object))
+
+        self.assertEqual(cleaned.tolist(), [self.preprocessor.clean_text(value) for value in values])
+
+    def test_string_dtype_column(self):
+        """Missing values of a string column become empty strings."""
+        cleaned = self.preprocessor.clean_series(pd.Series([" a ", None], dtype="string"))
+
+        self.assertEqual(cleaned.tolist(), ["a", ""])
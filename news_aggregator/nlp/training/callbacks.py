@@ -0,0 +1,170 @@
+import json
+import os
+import time
+from collections import Counter, defaultdict
+import pytorch_lightning as pl
+import torch
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+class ThroughputProfilerCallback(pl.Callback):
+    def __init__(self, output_subdir="profiling", profile_steps=0, profile_wait_steps=5):
+        """
+        Records where training time goes, one summary per epoch.
+        Per batch it measures the dataloader wait, forward, backward and optimizer step time,
+        counts samples per task and tracks peak resident memory.
+        Validation runs inside the training epoch are timed separately and excluded from the training
+        time that samples/sec and the epoch shares are computed from.
+        :param output_subdir: Directory created next to the checkpoints for the summaries and traces.
+        :param profile_steps: If > 0, also capture a torch profiler trace covering this many training steps.
+        :param profile_wait_steps: Steps skipped before the profiler starts warming up.
+        """
+        super().__init__()
+        self.output_subdir = output_subdir
+        self.profile_steps = profile_steps
+        self.profile_wait_steps = profile_wait_steps
+        self.output_dir = None
+        self.profiler = None
+        self._reset_epoch()
+
+    def _reset_epoch(self):
+        self.timings = defaultdict(float)
+        self.task_samples = Counter()
+        self.batches = 0
+        self._last_batch_end = None
+        self._batch_start = None
+        self._backward_start = None
+        self._backward_end = None
+        self._optimizer_start = None
+        self._validation_start = None
+        self._epoch_start = time.perf_counter()
+
+    def _resolve_output_dir(self, trainer):
+        checkpoint_callback = trainer.checkpoint_callback
+        base_dir = getattr(checkpoint_callback, "dirpath", None) or trainer.log_dir or trainer.default_root_dir
+        output_dir = os.path.join(base_dir, self.output_subdir)
+        os.makedirs(output_dir, exist_ok=True)
+        return output_dir
+
+    def _sync(self, pl_module):
+        if pl_module.device.type == "cuda":
+            torch.cuda.synchronize(pl_module.device)
+
+    def on_train_start(self, trainer, pl_module):
+        self.output_dir = self._resolve_output_dir(trainer)
+        if self.profile_steps > 0 and trainer.is_global_zero:
+            activities = [torch.profiler.ProfilerActivity.CPU]
+            if torch.cuda.is_available():
+                activities.append(torch.profiler.ProfilerActivity.CUDA)
+            self.profiler = torch.profiler.profile(
+                activities=activities,
+                schedule=torch.profiler.schedule(wait=self.profile_wait_steps, warmup=1, active=self.profile_steps, repeat=1),
+                on_trace_ready=torch.profiler.tensorboard_trace_handler(os.path.join(self.output_dir, "traces")),
+                profile_memory=True,
+            )
+            self.profiler.start()
+
+    def on_train_epoch_start(self, trainer, pl_module):
+        self._reset_epoch()
+
+    def on_train_batch_start(self, trainer, pl_module, batch, batch_idx):
+        now = time.perf_counter()
+        # Time between the end of the previous batch and this one is spent waiting on the dataloader
+        previous_end = self._last_batch_end if self._last_batch_end is not None else self._epoch_start
+        self.timings["dataloader_wait"] += now - previous_end
+        self._batch_start = now
+        self._backward_start = None
+        self._backward_end = None
+        self._optimizer_start = None
+
+    def on_before_backward(self, trainer, pl_module, loss):
+        self._sync(pl_module)
+        self._backward_start = time.perf_counter()
+        self.timings["forward"] += self._backward_start - self._batch_start
+
+    def on_after_backward(self, trainer, pl_module):
+        self._sync(pl_module)
+        self._backward_end = time.perf_counter()
+        if self._backward_start is not None:
+            self.timings["backward"] += self._backward_end - self._backward_start
+
+    def on_before_optimizer_step(self, trainer, pl_module, optimizer):
+        self._optimizer_start = time.perf_counter()
+
+    def on_validation_start(self, trainer, pl_module):
+        self._validation_start = time.perf_counter()
+
+    def on_validation_end(self, trainer, pl_module):
+        if self._validation_start is None:
+            return
+        now = time.perf_counter()
+        self.timings["validation"] += now - self._validation_start
+        self._validation_start = None
+        # Validation in the middle of an epoch must not count as dataloader wait for the next batch
+        if self._last_batch_end is not None:
+            self._last_batch_end = now
+
+    def on_train_batch_end(self, trainer, pl_module, outputs, batch, batch_idx):
+        self._sync(pl_module)
+        now = time.perf_counter()
+        if self._optimizer_start is not None:
+            self.timings["optimizer_step"] += now - self._optimizer_start
+        self.timings["batch_total"] += now - self._batch_start
+        self.task_samples.update(batch["tasks"])
+        self.batches += 1
+        self._last_batch_end = now
+        if self.profiler is not None:
+            self.profiler.step()
+
+    def on_train_epoch_end(self, trainer, pl_module):
+        if not trainer.is_global_zero or self.output_dir is None:
+            return
+
+        epoch_seconds = time.perf_counter() - self._epoch_start
+        validation = self.timings.get("validation", 0.0)
+        elapsed = epoch_seconds - validation
+        training_timings = {name: value for name, value in self.timings.items() if name != "validation"}
+        summary = {
+            "epoch": trainer.current_epoch,
+            "batches": self.batches,
+            "epoch_seconds": epoch_seconds,
+            "validation_seconds": validation,
+            "train_seconds": elapsed,
+            "seconds": dict(self.timings),
+            "share_of_epoch": {name: value / elapsed for name, value in training_timings.items() if elapsed > 0},
+            "samples": dict(self.task_samples),
+            "samples_per_sec": {task: count / elapsed for task, count in self.task_samples.items() if elapsed > 0},
+            "peak_rss_mb": self._peak_rss_mb(),
+            "peak_child_rss_mb": self._peak_rss_mb(children=True),
+        }
+        if torch.cuda.is_available():
+            summary["peak_cuda_allocated_mb"] = torch.cuda.max_memory_allocated() / 2**20
+
+        with open(os.path.join(self.output_dir, f"epoch_{trainer.current_epoch:03d}.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+
+        pl_module.log_dict({
+            "profile/dataloader_wait_share": summary["share_of_epoch"].get("dataloader_wait", 0.0),
+            "profile/samples_per_sec": sum(summary["samples_per_sec"].values()),
+        })
+
+    def on_train_end(self, trainer, pl_module):
+        if self.profiler is not None:
+            self.profiler.stop()
+            self.profiler = None
+
+    def _peak_rss_mb(self, children=False):
+        """
+        Peak resident set size of this process (kilobytes on Linux, bytes on macOS).
+        With children=True, the peak of the largest terminated child process, such as DataLoader workers.
+        The OS only reports children once they have exited, so workers kept alive with persistent_workers
+        are not included until they shut down.
+        """
+        if resource is None:
+            return None
+        who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+        peak = resource.getrusage(who).ru_maxrss
+        return peak / 2**20 if os.uname().sysname == "Darwin" else peak / 2**10
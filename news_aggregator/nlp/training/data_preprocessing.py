@@ -5,6 +5,8 @@ from imblearn.over_sampling import RandomOverSampler
 from imblearn.under_sampling import RandomUnderSampler
 import json
 
+TOKEN_CACHE_DIR = "nlp/outputs/token_cache"
+
 def merge_topic_classes(df):
     merge_map = {
         'THE WORLDPOST': 'WORLDPOST',
@@ -77,14 +79,15 @@ def split_tokenize_and_save_data():
             class_weights[task] = splitter.compute_class_weights(train_df, "label")
         class_weights[task] = weights
 
-        # Tokenize
+        # Tokenize in parallel chunks, reusing cached results for unchanged splits
         for split, split_df in zip(["train", "val", "test"], [train_df, val_df, test_df]):
-            split_df["title"] = split_df["title"].apply(preprocessor.clean_text)
-            split_encoded = preprocessor.tokenize(split_df, "title")
+            split_df = split_df.copy()
+            split_df["title"] = preprocessor.clean_series(split_df["title"])
+            split_encoded = preprocessor.tokenize_parallel(split_df, "title", cache_dir=TOKEN_CACHE_DIR)
 
             # Add tokenized columns to the dataframe
-            split_df["input_ids"] = split_encoded["input_ids"].tolist()
-            split_df["attention_mask"] = split_encoded["attention_mask"].tolist()
+            split_df["input_ids"] = preprocessor.format_token_column(split_encoded["input_ids"])
+            split_df["attention_mask"] = preprocessor.format_token_column(split_encoded["attention_mask"])
 
             if split == "train":
                 train_data[task] = split_df
@@ -1,80 +1,168 @@
-if __name__ == "__main__":
-    import torch
-    from sklearn.metrics import precision_recall_fscore_support
-    from torch.utils.data import DataLoader
-    import pandas as pd
-    from nlp.data.multitask_collate import multitask_collate_fn
-    from nlp.data.datasets import MultiTaskDataset
-    from nlp.models.lightning_model import LightningMultiTaskModel
-    import json
-
-    test_files = {
-        "sentiment_analysis": "nlp/outputs/sentiment_analysis_test_1.csv",
-        "topic_classification": "nlp/outputs/topic_classification_test_1.csv",
-        "fake_news_detection": "nlp/outputs/fake_news_detection_test_1.csv"
-    }
-
-    test_datasets = {task: pd.read_csv(file).sample(frac=0.1, random_state=100).to_dict(orient="records") for task, file in test_files.items()}
-
-    test_dataset = MultiTaskDataset(test_datasets)
-    test_loader = DataLoader(test_dataset, batch_size=16, num_workers=4, collate_fn=multitask_collate_fn)
-    with open("nlp/outputs/class_weights.json", "r") as f:
-            class_weights = json.load(f)
+import argparse
+import json
+import time
+import numpy as np
+import torch
+from sklearn.metrics import precision_recall_fscore_support
+from nlp.data.data_loader import DatasetLoader
+from nlp.data.multitask_collate import parse_token_list
+from nlp.models.lightning_model import LightningMultiTaskModel
+
+DEFAULT_TEST_FILES = {
+    "sentiment_analysis": "nlp/outputs/sentiment_analysis_test_1.csv",
+    "topic_classification": "nlp/outputs/topic_classification_test_1.csv",
+    "fake_news_detection": "nlp/outputs/fake_news_detection_test_1.csv"
+}
+DEFAULT_STATE_DICT_PATH = "nlp/outputs/second_multi_task_model_state_dict.pt"
+DEFAULT_CLASS_WEIGHTS_PATH = "nlp/outputs/class_weights.json"
+BATCHES_PER_CHUNK = 64
+
+def load_model(state_dict_path=DEFAULT_STATE_DICT_PATH, class_weights_path=DEFAULT_CLASS_WEIGHTS_PATH,
+               model_name="distilroberta-base", device="cpu"):
+    """
+    Builds the multi-task model used for evaluation and loads trained weights into it.
+    :param state_dict_path: Path to the saved state dict.
+    :param class_weights_path: Path to class_weights.json (used to size the topic head).
+    :param model_name: Pretrained encoder name.
+    :param device: Device to move the model to.
+    :return: Model in eval mode.
+    """
+    with open(class_weights_path, "r") as f:
+        class_weights = json.load(f)
 
     task_classes = {
-            "sentiment_analysis": 2,
-            "topic_classification": len(class_weights["topic_classification"]),
-            "fake_news_detection": 2
-        }
+        "sentiment_analysis": 2,
+        "topic_classification": len(class_weights["topic_classification"]),
+        "fake_news_detection": 2
+    }
 
     model = LightningMultiTaskModel(
-        model_name="distilroberta-base",
+        model_name=model_name,
         task_heads_config=task_classes,
         class_weights=class_weights
     )
-    model.load_state_dict(torch.load("nlp/outputs/second_multi_task_model_state_dict.pt", map_location=torch.device("cpu")))
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    model.load_state_dict(torch.load(state_dict_path, map_location=torch.device("cpu")))
     model.eval()
     model.to(device)
+    return model
+
+def iter_task_batches(file_path, batch_size, loader=None):
+    """
+    Streams a tokenized test split as task-homogeneous tensor batches.
+    The CSV is read in chunks that are a multiple of the batch size, so every batch except the last is full.
+    :param file_path: Path to a tokenized split CSV with input_ids, attention_mask and label columns.
+    :param batch_size: Number of samples per batch.
+    :param loader: Optional DatasetLoader instance.
+    :return: Iterator of (input_ids, attention_mask, labels) tensors.
+    """
+    loader = loader or DatasetLoader()
+    columns = ["input_ids", "attention_mask", "label"]
+    for chunk in loader.iter_csv(file_path, columns, chunksize=batch_size * BATCHES_PER_CHUNK):
+        input_ids = torch.tensor([parse_token_list(v) for v in chunk["input_ids"]], dtype=torch.long)
+        attention_mask = torch.tensor([parse_token_list(v) for v in chunk["attention_mask"]], dtype=torch.long)
+        labels = torch.tensor(chunk["label"].to_numpy(), dtype=torch.long)
+        for start in range(0, len(labels), batch_size):
+            end = start + batch_size
+            yield input_ids[start:end], attention_mask[start:end], labels[start:end]
+
+def latency_summary(batch_latencies, num_samples):
+    """
+    Summarizes per-batch forward latencies.
+    :param batch_latencies: List of per-batch wall times in seconds.
+    :param num_samples: Total number of samples processed.
+    :return: Dictionary with samples per second and p50/p95 batch latency in milliseconds.
+    """
+    if not batch_latencies:
+        return {"samples": 0, "batches": 0, "samples_per_sec": 0.0, "p50_ms": None, "p95_ms": None}
+    latencies_ms = np.array(batch_latencies) * 1000
+    total = float(np.sum(batch_latencies))
+    return {
+        "samples": num_samples,
+        "batches": len(batch_latencies),
+        "samples_per_sec": num_samples / total if total > 0 else 0.0,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+    }
 
-    task_metrics = {task: {"true_labels": [], "pred_labels": []} for task in test_files.keys()}
-
-    with torch.no_grad():
-        for batch in test_loader:
-            input_ids = batch["input_ids"].to(device)
-            attention_mask = batch["attention_mask"].to(device)
-            labels = batch["labels"].to(device)
-            tasks = batch["tasks"]  # List of task names (length = batch_size)
-
-            for i, task_name in enumerate(tasks):
-                # Get the i-th sample
-                sample_input_ids = input_ids[i].unsqueeze(0)
-                sample_attention_mask = attention_mask[i].unsqueeze(0)
-                sample_label = labels[i].unsqueeze(0)
-
-                # Forward pass
-                logits = model(sample_input_ids, sample_attention_mask, task_name=task_name)
-                prediction = torch.argmax(logits, dim=1)
-
-                # Accumulate metrics per task
-                task_metrics[task_name]["true_labels"].append(sample_label.item())
-                task_metrics[task_name]["pred_labels"].append(prediction.item())
+def evaluate(model, test_files=None, batch_size=64, device="cpu", max_batches=None, collect_outputs=False):
+    """
+    Runs the model over the full test split of every task and measures quality and speed.
+    :param model: Multi-task model in eval mode on `device`.
+    :param test_files: Mapping of task name to tokenized test CSV. Defaults to DEFAULT_TEST_FILES.
+    :param batch_size: Number of samples per forward pass.
+    :param device: Device the model lives on.
+    :param max_batches: Optional cap on batches per task, for quick speed-only runs.
+    :param collect_outputs: Also return true labels, predictions and class-1 probabilities per task.
+    :return: Dictionary keyed by task with 'metrics' (weighted precision/recall/F1) and 'speed' entries.
+    """
+    test_files = test_files or DEFAULT_TEST_FILES
+    device = torch.device(device)
+    results = {}
+
+    with torch.inference_mode():
+        for task, file_path in test_files.items():
+            true_labels, pred_labels, positive_probs, latencies = [], [], [], []
+
+            for i, (input_ids, attention_mask, labels) in enumerate(iter_task_batches(file_path, batch_size)):
+                if max_batches is not None and i >= max_batches:
+                    break
+                input_ids = input_ids.to(device, non_blocking=True)
+                attention_mask = attention_mask.to(device, non_blocking=True)
+
+                if device.type == "cuda":
+                    torch.cuda.synchronize()
+                start = time.perf_counter()
+                logits = model(input_ids, attention_mask, task_name=task)
+                if device.type == "cuda":
+                    torch.cuda.synchronize()
+                latencies.append(time.perf_counter() - start)
+
+                true_labels.extend(labels.tolist())
+                pred_labels.extend(torch.argmax(logits, dim=1).cpu().tolist())
+                if collect_outputs and logits.shape[1] == 2:
+                    positive_probs.extend(torch.softmax(logits, dim=1)[:, 1].cpu().tolist())
+
+            precision, recall, f1, _ = precision_recall_fscore_support(
+                true_labels, pred_labels, average="weighted", zero_division=0
+            )
+            results[task] = {
+                "metrics": {"precision": float(precision), "recall": float(recall), "f1": float(f1)},
+                "speed": latency_summary(latencies, len(true_labels)),
+            }
+            if collect_outputs:
+                results[task]["outputs"] = {
+                    "true_labels": true_labels,
+                    "pred_labels": pred_labels,
+                    "positive_probs": positive_probs,
+                }
+
+    return results
+
+def benchmark_batch_sizes(model, batch_sizes, test_files=None, device="cpu", max_batches=None):
+    """
+    Measures throughput and latency of the model for several batch sizes.
+    :return: Dictionary of batch size to per-task speed summaries.
+    """
+    return {
+        batch_size: {
+            task: result["speed"]
+            for task, result in evaluate(model, test_files, batch_size, device, max_batches).items()
+        }
+        for batch_size in batch_sizes
+    }
 
-    from sklearn.metrics import confusion_matrix
+def plot_results(results):
+    """
+    Plots confusion matrices for every task and ROC curves for the binary tasks.
+    :param results: Output of evaluate() with collect_outputs=True.
+    """
+    from sklearn.metrics import confusion_matrix, roc_curve, auc
     import seaborn as sns
     import matplotlib.pyplot as plt
 
-    # Calculate precision, recall, and F1 score for each task
-    for task, metrics in task_metrics.items():
-        true_labels = metrics["true_labels"]
-        pred_labels = metrics["pred_labels"]
-
-        precision, recall, f1, _ = precision_recall_fscore_support(true_labels, pred_labels, average="weighted")
-
-        print(f"Metrics for {task}:")
-        print(f"  Precision: {precision:.4f}, Recall: {recall:.4f}, F1-Score: {f1:.4f}")
-        # Plot confusion matrix
-        cm = confusion_matrix(true_labels, pred_labels)
+    for task, result in results.items():
+        outputs = result["outputs"]
+        cm = confusion_matrix(outputs["true_labels"], outputs["pred_labels"])
         plt.figure(figsize=(6, 5))
         sns.heatmap(cm, annot=True, fmt="d", cmap="Blues", xticklabels=range(cm.shape[1]), yticklabels=range(cm.shape[0]))
         plt.title(f"Confusion Matrix for {task}")
@@ -83,36 +171,10 @@ if __name__ == "__main__":
         plt.tight_layout()
         plt.show()
 
-    from sklearn.metrics import roc_curve, auc
-    import matplotlib.pyplot as plt
+        if not outputs["positive_probs"]:
+            continue
 
-    # ROC curves for binary classification tasks
-    for task in ["sentiment_analysis", "fake_news_detection"]:
-        true_labels = task_metrics[task]["true_labels"]
-        pred_labels = task_metrics[task]["pred_labels"]
-
-        # Re-run the model to collect predicted probabilities for ROC
-        probs = []
-        with torch.no_grad():
-            for batch in test_loader:
-                input_ids = batch["input_ids"].to(device)
-                attention_mask = batch["attention_mask"].to(device)
-                labels = batch["labels"].to(device)
-                tasks = batch["tasks"]
-
-                for i, task_name in enumerate(tasks):
-                    if task_name != task:
-                        continue
-
-                    sample_input_ids = input_ids[i].unsqueeze(0)
-                    sample_attention_mask = attention_mask[i].unsqueeze(0)
-
-                    logits = model(sample_input_ids, sample_attention_mask, task_name=task_name)
-                    prob = torch.softmax(logits, dim=1)[0][1].item()  # Probability of class 1
-                    probs.append(prob)
-
-        # Compute ROC curve and AUC
-        fpr, tpr, _ = roc_curve(true_labels, probs)
+        fpr, tpr, _ = roc_curve(outputs["true_labels"], outputs["positive_probs"])
         roc_auc = auc(fpr, tpr)
 
         plt.figure(figsize=(6, 5))
@@ -125,3 +187,62 @@ if __name__ == "__main__":
         plt.grid(True)
         plt.tight_layout()
         plt.show()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate a multi-task model on the full test splits.")
+    parser.add_argument("--state-dict", default=DEFAULT_STATE_DICT_PATH)
+    parser.add_argument("--class-weights", default=DEFAULT_CLASS_WEIGHTS_PATH)
+    parser.add_argument("--model-name", default="distilroberta-base")
+    parser.add_argument("--test-file", action="append", default=[], metavar="TASK=PATH",
+                        help="Override the test split of a task. Can be repeated.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[64],
+                        help="Quality metrics use the first batch size. Speed is reported for each one.")
+    parser.add_argument("--max-speed-batches", type=int, default=None,
+                        help="Cap on batches per task for the extra batch sizes.")
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--output", help="Write the report as JSON to this path.")
+    parser.add_argument("--plots", action="store_true", help="Show confusion matrices and ROC curves.")
+    args = parser.parse_args(argv)
+
+    test_files = dict(DEFAULT_TEST_FILES)
+    for override in args.test_file:
+        task, path = override.split("=", 1)
+        test_files[task] = path
+
+    model = load_model(args.state_dict, args.class_weights, args.model_name, args.device)
+
+    primary_batch_size = args.batch_sizes[0]
+    results = evaluate(model, test_files, primary_batch_size, args.device, collect_outputs=args.plots)
+    speed = {primary_batch_size: {task: result["speed"] for task, result in results.items()}}
+    speed.update(benchmark_batch_sizes(model, args.batch_sizes[1:], test_files, args.device, args.max_speed_batches))
+
+    for task, result in results.items():
+        metrics = result["metrics"]
+        print(f"Metrics for {task}:")
+        print(f"  Precision: {metrics['precision']:.4f}, Recall: {metrics['recall']:.4f}, F1-Score: {metrics['f1']:.4f}")
+
+    for batch_size, per_task in speed.items():
+        print(f"Speed at batch size {batch_size}:")
+        for task, stats in per_task.items():
+            if not stats["batches"]:
+                continue
+            print(f"  {task}: {stats['samples_per_sec']:.1f} samples/s, "
+                  f"p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms per batch")
+
+    if args.output:
+        report = {
+            "state_dict": args.state_dict,
+            "quality_batch_size": primary_batch_size,
+            "metrics": {task: result["metrics"] for task, result in results.items()},
+            "speed": speed,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.plots:
+        plot_results(results)
+
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import json
+import os
+import re
+import torch
+from transformers import AutoConfig, AutoTokenizer
+from nlp.models.bundle import STORAGE_DTYPES, set_current_version, write_bundle
+
+DEFAULT_BUNDLE_ROOT = "nlp/outputs/bundles"
+DEFAULT_LABEL_MAPS_PATH = "nlp/outputs/label_maps.json"
+LIGHTNING_PREFIX = "model."
+
+def load_training_state_dict(checkpoint_path):
+    """
+    Reads weights from either a Lightning checkpoint (.ckpt) or a raw LightningMultiTaskModel state dict (.pt)
+    and returns them with MultiTaskModel key names.
+    """
+    checkpoint = torch.load(checkpoint_path, map_location="cpu", weights_only=False)
+    state_dict = checkpoint.get("state_dict", checkpoint)
+    return {
+        key[len(LIGHTNING_PREFIX):] if key.startswith(LIGHTNING_PREFIX) else key: value
+        for key, value in state_dict.items()
+    }
+
+def select_inference_weights(state_dict, tasks):
+    """
+    Keeps the shared encoder and the heads of the selected tasks, and infers each head's number of classes
+    from the shape of its final linear layer.
+    :return: Tuple of (filtered state dict, {task: num_classes}).
+    """
+    selected = {key: value for key, value in state_dict.items() if key.startswith("shared_encoder.")}
+    task_classes = {}
+    for task in tasks:
+        head_keys = {key: value for key, value in state_dict.items() if key.startswith(f"heads.{task}.")}
+        if not head_keys:
+            raise ValueError(f"Checkpoint has no head for task '{task}'")
+        selected.update(head_keys)
+
+        linear_weights = [
+            (int(match.group(1)), value)
+            for key, value in head_keys.items()
+            if (match := re.match(rf"heads\.{re.escape(task)}\.(\d+)\.weight$", key)) and value.dim() == 2
+        ]
+        task_classes[task] = int(max(linear_weights, key=lambda item: item[0])[1].shape[0])
+    return selected, task_classes
+
+def export_bundle(checkpoint_path, tasks, output_root=DEFAULT_BUNDLE_ROOT, model_name="distilroberta-base",
+                  label_maps_path=DEFAULT_LABEL_MAPS_PATH, storage_dtype="fp32", activate=False):
+    """
+    Exports a training checkpoint as a versioned inference bundle.
+    :param checkpoint_path: Lightning checkpoint or raw state dict saved during training.
+    :param tasks: Task heads to include.
+    :param output_root: Directory holding all bundle versions.
+    :param model_name: Pretrained encoder the model was trained from (config and tokenizer are vendored from it).
+    :param label_maps_path: Path to label_maps.json written by data preprocessing.
+    :param storage_dtype: One of 'fp32', 'fp16' or 'bf16'.
+    :param activate: Point output_root/CURRENT at the new bundle.
+    :return: Path of the bundle directory.
+    """
+    state_dict, task_classes = select_inference_weights(load_training_state_dict(checkpoint_path), tasks)
+
+    with open(label_maps_path, "r") as f:
+        raw_label_maps = json.load(f)
+
+    bundle_dir = write_bundle(
+        output_root,
+        model_name=model_name,
+        encoder_config=AutoConfig.from_pretrained(model_name),
+        tokenizer=AutoTokenizer.from_pretrained(model_name),
+        state_dict=state_dict,
+        tasks=task_classes,
+        label_maps=raw_label_maps,
+        storage_dtype=storage_dtype,
+        source=str(checkpoint_path),
+    )
+
+    if activate:
+        set_current_version(output_root, os.path.basename(bundle_dir))
+    return bundle_dir
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a training checkpoint as an inference bundle.")
+    parser.add_argument("checkpoint", help="Lightning .ckpt file or raw state dict .pt file")
+    parser.add_argument("--tasks", nargs="+", default=["fake_news_detection", "sentiment_analysis", "topic_classification"])
+    parser.add_argument("--output-root", default=DEFAULT_BUNDLE_ROOT)
+    parser.add_argument("--model-name", default="distilroberta-base")
+    parser.add_argument("--label-maps", default=DEFAULT_LABEL_MAPS_PATH)
+    parser.add_argument("--dtype", choices=sorted(STORAGE_DTYPES), default="fp32", help="Storage precision of the weights")
+    parser.add_argument("--activate", action="store_true", help="Make this bundle the one served by default")
+    args = parser.parse_args(argv)
+
+    bundle_dir = export_bundle(args.checkpoint, args.tasks, args.output_root, args.model_name,
+                               args.label_maps, args.dtype, args.activate)
+    print(f"Exported inference bundle to {bundle_dir}")
+
+if __name__ == "__main__":
+    main()
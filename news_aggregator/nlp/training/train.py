@@ -6,10 +6,11 @@ import torch
 from nlp.data.datasets import MultiTaskDataset
 from nlp.models.data_module import MultiTaskDataModule
 from nlp.models.lightning_model import LightningMultiTaskModel
+from nlp.training.callbacks import ThroughputProfilerCallback
 
 torch.set_num_threads(4)
 
-def train_multitask_model():
+def train_multitask_model(profile_steps=0):
     train_files = {
         "sentiment_analysis": "nlp/outputs/sentiment_analysis_train.csv",
         "topic_classification": "nlp/outputs/topic_classification_train.csv",
@@ -53,6 +54,8 @@ def train_multitask_model():
         save_top_k=1,
         filename="best-checkpoint"
     )
+    # Per-epoch timing summaries (and optional torch profiler traces) next to the checkpoints
+    throughput_callback = ThroughputProfilerCallback(profile_steps=profile_steps)
     accelerator = "gpu" if torch.cuda.is_available() else "cpu"
 
     trainer = pl.Trainer(
@@ -63,7 +66,7 @@ def train_multitask_model():
         accumulate_grad_batches=4,
         precision='16-mixed',
         gradient_clip_val=1.0,
-        callbacks=[early_stopping_callback, checkpoint_callback]
+        callbacks=[early_stopping_callback, checkpoint_callback, throughput_callback]
     )
     
     trainer.fit(model, datamodule)